@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 生成应用的持久化浏览器存储与预缓存
+"""
+
+import hashlib
+from urllib.parse import urljoin
+
+# 生成应用的浏览器存储目录名（位于 LOCALAPPDATA 或 ~/.local/share 下）
+STORAGE_DIR_NAME = "WebPackagerData"
+
+
+def app_storage_id(params):
+    """应用的存储标识（同一来源和标题的应用在重新打包后仍使用同一存储目录）"""
+    mode = params.get('original_mode', params['mode'])
+    source = params.get('original_source', params['source'])
+    app_key = f"{mode}|{source}|{params['window_title']}"
+    return hashlib.sha256(app_key.encode('utf-8')).hexdigest()[:16]
+
+
+def load_precache_urls(manifest_path, base_url=''):
+    """读取预缓存清单：每行一个地址，#开头为注释，相对地址按base_url解析"""
+    urls = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            url = urljoin(base_url, line) if base_url else line
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def storage_code(indent="    "):
+    """生成应用中计算持久化存储目录的代码（需要已定义变量 app_id）"""
+    return f"""
+{indent}# 持久化的浏览器存储目录（Cookie、本地存储和HTTP缓存），重复启动时复用
+{indent}storage_base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+{indent}storage_path = os.path.join(storage_base, {STORAGE_DIR_NAME!r}, app_id)
+{indent}os.makedirs(storage_path, exist_ok=True)
+"""
+
+
+def precache_code():
+    """生成应用中预热浏览器缓存的函数（模块级），由 webview.start 在后台线程调用"""
+    return """
+def warm_cache(window, storage_path, urls):
+    # 首次启动（或预缓存列表变化）时在页面中请求列表中的地址，写入浏览器的HTTP缓存
+    import hashlib
+    if not urls:
+        return
+    digest = hashlib.sha256('\\n'.join(urls).encode('utf-8')).hexdigest()[:12]
+    marker = os.path.join(storage_path, 'precache-' + digest)
+    if os.path.exists(marker):
+        return
+    script = ('Promise.all(' + json.dumps(urls) + '.map(function (u) {'
+              ' return fetch(u, {cache: "reload", mode: "no-cors", credentials: "include"})'
+              '.then(function () { return 1; }, function () { return 0; }); }))'
+              '.then(function (r) { return r.reduce(function (a, b) { return a + b; }, 0); })')
+    try:
+        # evaluate_js 会等待页面加载完成后再执行
+        window.evaluate_js(script)
+        with open(marker, 'w') as f:
+            f.write('ok')
+    except Exception:
+        pass
+"""
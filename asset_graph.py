@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 资源引用分析（按入口页面可达性精简打包内容）
+"""
+
+import os
+import re
+import posixpath
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+from packignore import PackIgnore
+
+# 需要解析引用的文本文件类型
+HTML_EXTENSIONS = ('.html', '.htm', '.xhtml', '.svg')
+CSS_EXTENSIONS = ('.css',)
+JS_EXTENSIONS = ('.js', '.mjs', '.cjs')
+
+# 引用资源的HTML属性
+URL_ATTRIBUTES = {'src', 'href', 'poster', 'data', 'xlink:href', 'background', 'manifest'}
+
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""", re.IGNORECASE)
+CSS_IMPORT_RE = re.compile(r"""@import\s+(['"])([^'"]+)\1""", re.IGNORECASE)
+JS_IMPORT_RES = [
+    re.compile(r"""\bimport\s*(?:[\w*{}\s,$]+\s*from\s*)?(['"])([^'"]+)\1"""),
+    re.compile(r"""\bexport\s*[\w*{}\s,$]*\s*from\s*(['"])([^'"]+)\1"""),
+    re.compile(r"""\bimport\(\s*(['"])([^'"]+)\1\s*\)"""),
+    re.compile(r"""\brequire\(\s*(['"])([^'"]+)\1\s*\)"""),
+    re.compile(r"""\bnew\s+(?:Shared)?Worker\(\s*(['"])([^'"]+)\1"""),
+    re.compile(r"""\bnew\s+URL\(\s*(['"])([^'"]+)\1"""),
+    re.compile(r"""\bfetch\(\s*(['"])([^'"]+)\1"""),
+    re.compile(r"""\bimportScripts\(\s*(['"])([^'"]+)\1"""),
+]
+
+
+class _ReferenceParser(HTMLParser):
+    """收集HTML中的资源引用（属性、srcset、内联样式和内联脚本）"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.references = []
+        self._in_style = False
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if not value:
+                continue
+            if name in URL_ATTRIBUTES:
+                self.references.append(value)
+            elif name in ('srcset', 'imagesrcset'):
+                for candidate in value.split(','):
+                    candidate = candidate.strip().split(' ')[0]
+                    if candidate:
+                        self.references.append(candidate)
+            elif name == 'style':
+                self.references.extend(css_references(value))
+        self._in_style = tag == 'style'
+        self._in_script = tag == 'script'
+
+    def handle_endtag(self, tag):
+        self._in_style = False
+        self._in_script = False
+
+    def handle_data(self, data):
+        if self._in_style:
+            self.references.extend(css_references(data))
+        elif self._in_script:
+            self.references.extend(js_references(data))
+
+
+def css_references(text):
+    """提取CSS中的url()和@import引用"""
+    refs = [m.group(2).strip() for m in CSS_URL_RE.finditer(text)]
+    refs.extend(m.group(2).strip() for m in CSS_IMPORT_RE.finditer(text))
+    return refs
+
+
+def js_references(text):
+    """提取JS中的import/require/Worker/fetch等字符串字面量引用"""
+    refs = []
+    for regex in JS_IMPORT_RES:
+        refs.extend(m.group(2) for m in regex.finditer(text))
+    return refs
+
+
+def file_references(path):
+    """按文件类型提取引用"""
+    lower = path.lower()
+    if not lower.endswith(HTML_EXTENSIONS + CSS_EXTENSIONS + JS_EXTENSIONS):
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except OSError:
+        return []
+
+    if lower.endswith(HTML_EXTENSIONS):
+        parser = _ReferenceParser()
+        try:
+            parser.feed(text)
+            parser.close()
+        except Exception:
+            pass
+        return parser.references
+    if lower.endswith(CSS_EXTENSIONS):
+        return css_references(text)
+    return js_references(text)
+
+
+def resolve_reference(ref, from_rel, files):
+    """将引用解析为文件夹内的相对路径，无法解析（外部链接等）时返回None"""
+    ref = ref.strip()
+    if not ref or ref.startswith(('#', '//', 'data:', 'blob:', 'javascript:', 'mailto:', 'tel:', 'about:')):
+        return None
+    if re.match(r'^[a-zA-Z][a-zA-Z0-9+.-]*:', ref):
+        # http:、https:、file: 等带协议的地址
+        return None
+
+    # 去除查询参数和锚点
+    ref = unquote(ref.split('#')[0].split('?')[0])
+    if not ref:
+        return None
+
+    if ref.startswith('/'):
+        candidate = posixpath.normpath(ref.lstrip('/'))
+    else:
+        candidate = posixpath.normpath(posixpath.join(posixpath.dirname(from_rel), ref))
+    if candidate.startswith('..'):
+        return None
+
+    # 依次尝试：原路径、目录下的index.html、省略扩展名的JS模块
+    if candidate == '.':
+        return 'index.html' if 'index.html' in files else None
+    for option in (candidate, posixpath.join(candidate, 'index.html'),
+                   candidate + '.js', candidate + '.mjs'):
+        if option in files:
+            return option
+    return candidate
+
+
+class FolderFiles:
+    """按需检查的文件夹内文件集合（不遍历整个文件夹），用于只从入口页面出发查找引用的文件
+
+    只包含真实路径位于文件夹内、未被排除规则排除的普通文件。
+    """
+
+    def __init__(self, folder, ignore=None):
+        self.root = os.path.realpath(folder)
+        self.ignore = ignore
+        self._known = {}
+
+    def __contains__(self, rel_path):
+        known = self._known.get(rel_path)
+        if known is None:
+            known = self._check(rel_path)
+            self._known[rel_path] = known
+        return known
+
+    def _check(self, rel_path):
+        if not rel_path or rel_path.startswith('..') or '\\' in rel_path or ':' in rel_path:
+            return False
+        if self.ignore is not None and self.ignore.is_ignored(rel_path):
+            return False
+        real = os.path.realpath(os.path.join(self.root, rel_path))
+        return os.path.commonpath([real, self.root]) == self.root and os.path.isfile(real)
+
+
+def find_reachable(folder, entry, files, allow_patterns=None):
+    """从入口页面出发遍历引用图，返回可达性分析结果
+
+    files 为候选文件相对路径列表（已应用排除规则），或 FolderFiles（只检查被引用的文件，
+    此时不统计未被引用的文件，也不使用allow_patterns）。allow_patterns 为始终包含的gitignore风格规则。
+    返回字典：files（保留的文件）、dirs（保留的目录）、dropped（未被引用的文件）、
+    dropped_bytes（未被引用的字节数）、missing（引用了但不存在的路径）
+    """
+    on_demand = isinstance(files, FolderFiles)
+    file_set = files if on_demand else set(files)
+    reachable = set()
+    missing = set()
+    queue = [entry] if entry in file_set else []
+
+    allow = PackIgnore(allow_patterns or [])
+    if allow.rules and not on_demand:
+        queue.extend(f for f in files if allow.is_ignored(f))
+
+    while queue:
+        rel_path = queue.pop()
+        if rel_path in reachable:
+            continue
+        reachable.add(rel_path)
+        for ref in file_references(os.path.join(folder, rel_path)):
+            target = resolve_reference(ref, rel_path, file_set)
+            if target is None:
+                continue
+            if target in file_set:
+                if target not in reachable:
+                    queue.append(target)
+            else:
+                missing.add(target)
+
+    kept = sorted(reachable)
+    dirs = set()
+    for rel_path in kept:
+        parent = posixpath.dirname(rel_path)
+        while parent:
+            dirs.add(parent)
+            parent = posixpath.dirname(parent)
+
+    dropped = [] if on_demand else [f for f in files if f not in reachable]
+    dropped_bytes = 0
+    for rel_path in dropped:
+        try:
+            dropped_bytes += os.path.getsize(os.path.join(folder, rel_path))
+        except OSError:
+            pass
+
+    return {
+        'files': kept,
+        'dirs': sorted(dirs),
+        'dropped': dropped,
+        'dropped_bytes': dropped_bytes,
+        'missing': sorted(missing),
+    }
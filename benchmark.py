@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 基准测试脚本
+
+用法:
+    python benchmark.py compression --mode url --source https://www.baidu.com
+    python benchmark.py compression --mode folder --source ./site --profiles zlib,upx --runs 5
+    python benchmark.py startup --budget 150 --window
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compression import COMPRESSION_PROFILES
+from module_profile import measure_startup
+
+
+def create_engine():
+    """创建日志输出到控制台的打包引擎（不记录最近使用）"""
+    from engine import PackagingEngine
+
+    engine = PackagingEngine()
+    engine.subscribe(lambda event: print(event['message']) if event['type'] == 'log' else None)
+    return engine
+
+
+def print_table(headers, rows):
+    """以对齐的文本表格输出结果"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) if rows else len(str(h))
+              for i, h in enumerate(headers)]
+    line = "  ".join(str(h).ljust(w) for h, w in zip(headers, widths))
+    print(line)
+    print("-" * len(line))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+def benchmark_compression(args):
+    """在各压缩配置下构建同一应用，对比exe体积、构建耗时和启动耗时"""
+    profiles = [p.strip() for p in args.profiles.split(',') if p.strip()]
+    for profile in profiles:
+        if profile not in COMPRESSION_PROFILES:
+            print(f"未知的压缩配置: {profile}，可选: {', '.join(COMPRESSION_PROFILES)}")
+            return 1
+
+    output_dir = args.output or tempfile.mkdtemp(prefix="webpackager_bench_")
+    engine = create_engine()
+    rows = []
+
+    for profile in profiles:
+        print(f"\n=== 压缩配置: {profile} ===")
+        params = {
+            'mode': args.mode,
+            'source': args.source,
+            'window_title': f"bench_{profile}",
+            'window_width': 1024,
+            'window_height': 768,
+            'output_dir': output_dir,
+            'icon_path': '',
+            'copy_workers': 0,
+            'ignore_patterns': None,
+            'module_profile': args.module_profile,
+            'compression': profile
+        }
+        try:
+            result = engine.package(params)
+        except Exception as e:
+            print(f"构建失败: {e}")
+            rows.append([profile, "失败", "-", "-", "-"])
+            continue
+
+        # 多次启动取中位数（首次启动包含冷缓存的解压）
+        samples = [measure_startup(result['exe_path']) for _ in range(args.runs)]
+        samples = [s for s in samples if s]
+        actual = result['metrics']['compression'] if result['metrics'] else profile
+        name = profile if actual == profile else f"{profile}->{actual}"
+        size_mb = os.path.getsize(result['exe_path']) / (1024 * 1024)
+        if samples:
+            startup = statistics.median(s['total_ms'] for s in samples)
+            imports = statistics.median(s['import_ms'] for s in samples)
+            rows.append([name, f"{size_mb:.2f}", f"{result['build_seconds']:.1f}",
+                         f"{startup:.0f}", f"{imports:.0f}"])
+        else:
+            rows.append([name, f"{size_mb:.2f}", f"{result['build_seconds']:.1f}", "-", "-"])
+
+    print(f"\n构建输出目录: {output_dir}\n")
+    print_table(["压缩配置", "exe体积(MB)", "构建耗时(s)", "启动耗时(ms)", "导入耗时(ms)"], rows)
+    return 0
+
+
+# 打包工具冷启动导入耗时的默认预算（毫秒）
+DEFAULT_STARTUP_BUDGET_MS = 150
+
+# 测量从导入到主窗口首次绘制完成的耗时
+_WINDOW_PROBE = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "from main import WebPackager\n"
+    "app = WebPackager()\n"
+    "app.root.update()\n"
+    "print((time.perf_counter() - start) * 1000)\n"
+    "app.root.destroy()\n"
+)
+
+
+def parse_importtime(stderr):
+    """解析 -X importtime 输出，返回 [(模块名, 自身耗时us, 累计耗时us)]"""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        # 模块名前的缩进表示嵌套层级，顶层导入只有一个前导空格
+        records.append((parts[2][1:].rstrip(), int(parts[0]), int(parts[1])))
+    return records
+
+
+def benchmark_startup(args):
+    """使用 -X importtime 测量打包工具的冷启动导入耗时，超出预算时返回非零"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    totals = []
+    records = []
+    for _ in range(args.runs):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                                cwd=here, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"导入失败: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode}")
+            return 1
+        records = parse_importtime(result.stderr)
+        totals.append(sum(r[1] for r in records) / 1000)
+
+    total_ms = statistics.median(totals)
+
+    # 列出累计耗时最高的顶层导入及main的直接导入（每层缩进两个空格）
+    top_level = [r for r in records if len(r[0]) - len(r[0].lstrip()) <= 2]
+    top_level.sort(key=lambda r: r[2], reverse=True)
+    print_table(["模块", "累计耗时(ms)"], [[r[0].strip(), f"{r[2] / 1000:.1f}"] for r in top_level[:args.top]])
+
+    print(f"\n导入耗时（{args.runs} 次中位数）: {total_ms:.1f} ms, 预算: {args.budget} ms")
+
+    if args.window:
+        result = subprocess.run([sys.executable, "-c", _WINDOW_PROBE], cwd=here, capture_output=True, text=True)
+        if result.returncode == 0 and result.stdout.strip():
+            print(f"主窗口首次绘制耗时: {float(result.stdout.strip().splitlines()[-1]):.1f} ms")
+        else:
+            print("无法测量主窗口显示耗时（可能没有图形界面环境）")
+
+    if total_ms > args.budget:
+        print("超出启动预算！")
+        return 1
+    return 0
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="网页打包工具 - 基准测试")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compression_parser = subparsers.add_parser("compression", help="对比各压缩配置的体积、构建耗时和启动耗时")
+    compression_parser.add_argument("--mode", choices=["url", "file", "folder"], default="url")
+    compression_parser.add_argument("--source", required=True, help="网页URL、HTML文件或文件夹")
+    compression_parser.add_argument("--profiles", default=",".join(COMPRESSION_PROFILES), help="逗号分隔的压缩配置")
+    compression_parser.add_argument("--runs", type=int, default=3, help="每个配置的启动测量次数")
+    compression_parser.add_argument("--module-profile", choices=["default", "lean"], default="default")
+    compression_parser.add_argument("--output", help="构建输出目录（默认使用临时目录）")
+    compression_parser.set_defaults(func=benchmark_compression)
+
+    startup_parser = subparsers.add_parser("startup", help="测量打包工具的冷启动导入耗时并检查预算")
+    startup_parser.add_argument("--budget", type=float, default=DEFAULT_STARTUP_BUDGET_MS, help="导入耗时预算（毫秒）")
+    startup_parser.add_argument("--runs", type=int, default=5, help="测量次数")
+    startup_parser.add_argument("--top", type=int, default=10, help="列出耗时最高的模块数量")
+    startup_parser.add_argument("--window", action="store_true", help="同时测量主窗口首次绘制耗时")
+    startup_parser.set_defaults(func=benchmark_startup)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
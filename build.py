@@ -10,11 +10,18 @@ import sys
 import subprocess
 import tempfile
 import shutil
+from compression import COMPRESSION_PROFILES, DEFAULT_COMPRESSION, resolve_profile, spec_exe_options, pyinstaller_args, build_env
 
-def build_exe():
+def build_exe(compression_name=DEFAULT_COMPRESSION):
     """将工具打包成exe"""
     print("正在打包网页打包工具...")
     
+    # 解析压缩配置
+    compression, warning = resolve_profile(compression_name)
+    if warning:
+        print(warning)
+    print(f"压缩方式: {compression['name']} - {compression['label']}")
+    
     # 创建临时目录
     temp_dir = tempfile.mkdtemp()
     
@@ -23,6 +30,24 @@ def build_exe():
         files_to_copy = [
             'main.py',
             'run.py', 
+            'fastcopy.py',
+            'packignore.py',
+            'module_profile.py',
+            'compression.py',
+            'launcher.py',
+            'asset_graph.py',
+            'inliner.py',
+            'preview_server.py',
+            'app_cache.py',
+            'url_preflight.py',
+            'governor.py',
+            'delta.py',
+            'splash.py',
+            'engine.py',
+            'ui_tasks.py',
+            'path_index.py',
+            'planner.py',
+            'multisite.py',
             'config.json',
             'requirements.txt'
         ]
@@ -31,8 +56,14 @@ def build_exe():
             if os.path.exists(file):
                 shutil.copy2(file, os.path.join(temp_dir, file))
         
-        # 创建spec文件
-        spec_content = """# -*- mode: python ; coding: utf-8 -*-
+        # 如果有图标文件，添加图标
+        icon_line = ""
+        if os.path.exists('icon.ico'):
+            shutil.copy2('icon.ico', os.path.join(temp_dir, 'icon.ico'))
+            icon_line = "    icon='icon.ico',\n"
+        
+        # 创建spec文件（窗口模式、单文件、数据文件和压缩参数均由spec文件描述）
+        spec_content = f"""# -*- mode: python ; coding: utf-8 -*-
 
 block_cipher = None
 
@@ -41,10 +72,10 @@ a = Analysis(
     ['run.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=['tkinter', 'webview', 'PIL'],
+    datas=[('delta.py', '.')],
+    hiddenimports=['tkinter', 'PIL'],
     hookspath=[],
-    hooksconfig={},
+    hooksconfig={{}},
     runtime_hooks=[],
     excludes=[],
     win_no_prefer_redirects=False,
@@ -65,18 +96,14 @@ exe = EXE(
     name='网页打包工具',
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+{spec_exe_options(compression)}    runtime_tmpdir=None,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
     target_arch=None,
     codesign_identity=None,
     entitlements_file=None,
-    icon='icon.ico' if os.path.exists('icon.ico') else None,
-)
+{icon_line})
 """
         
         spec_file = os.path.join(temp_dir, "webpackager.spec")
@@ -89,20 +116,13 @@ exe = EXE(
         cmd = [
             'pyinstaller',
             '--noconfirm',
-            '--onefile',
-            '--windowed',
-            '--name', '网页打包工具',
-            '--distpath', 'dist',
+            '--distpath', os.path.abspath('dist'),
             '--workpath', os.path.join(temp_dir, 'build'),
-            '--specpath', temp_dir,
-            os.path.join(temp_dir, 'run.py')
         ]
+        cmd.extend(pyinstaller_args(compression))
+        cmd.append(spec_file)
         
-        # 如果有图标文件，添加图标
-        if os.path.exists('icon.ico'):
-            cmd.extend(['--icon', 'icon.ico'])
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True, text=True, cwd=temp_dir, env=build_env(compression))
         
         if result.returncode == 0:
             print("打包成功完成！")
@@ -134,8 +154,19 @@ def main():
         input("按任意键退出...")
         return
     
+    # 解析压缩方式参数：python build.py --compression none|zlib|upx|max
+    compression_name = DEFAULT_COMPRESSION
+    if '--compression' in sys.argv:
+        index = sys.argv.index('--compression')
+        if index + 1 < len(sys.argv):
+            compression_name = sys.argv[index + 1]
+    if compression_name not in COMPRESSION_PROFILES:
+        print(f"未知的压缩方式: {compression_name}，可选: {', '.join(COMPRESSION_PROFILES)}")
+        input("按任意键退出...")
+        return
+    
     # 执行打包
-    if build_exe():
+    if build_exe(compression_name):
         print("\n打包完成！")
     else:
         print("\n打包失败！")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 压缩配置
+"""
+
+import os
+import sys
+import shutil
+
+# UPX压缩后容易损坏或被杀毒软件误报的文件
+UPX_EXCLUDES = [
+    'vcruntime140.dll',
+    'vcruntime140_1.dll',
+    'msvcp140.dll',
+    'python3.dll',
+    'python38.dll',
+    'python39.dll',
+    'python310.dll',
+    'python311.dll',
+    'python312.dll',
+    'python313.dll',
+    'ucrtbase.dll',
+    'WebView2Loader.dll',
+    'Python.Runtime.dll',
+    'qwindows.dll',
+]
+
+# 压缩配置：upx 是否使用UPX，compress_archive 是否对单文件归档中的条目使用zlib压缩
+COMPRESSION_PROFILES = {
+    'none': {
+        'label': '不压缩（启动最快，体积最大）',
+        'upx': False,
+        'compress_archive': False,
+        'upx_exclude': [],
+        'upx_args': '',
+        'strip': False,
+    },
+    'zlib': {
+        'label': '仅PyInstaller zlib压缩（默认）',
+        'upx': False,
+        'compress_archive': True,
+        'upx_exclude': [],
+        'upx_args': '',
+        'strip': False,
+    },
+    'upx': {
+        'label': 'UPX压缩（排除易损坏的DLL）',
+        'upx': True,
+        'compress_archive': True,
+        'upx_exclude': UPX_EXCLUDES,
+        'upx_args': '',
+        'strip': False,
+    },
+    'max': {
+        'label': '最大压缩（UPX --best --lzma，体积最小，启动最慢）',
+        'upx': True,
+        'compress_archive': True,
+        'upx_exclude': ['vcruntime140.dll', 'vcruntime140_1.dll', 'qwindows.dll'],
+        'upx_args': '--best --lzma',
+        # Windows下strip无效，其余平台去除符号表
+        'strip': not sys.platform.startswith('win'),
+    },
+}
+
+DEFAULT_COMPRESSION = 'zlib'
+
+# 不压缩时单文件归档中各类条目的压缩设置
+_UNCOMPRESSED_CDICT = {
+    'BINARY': False,
+    'DATA': False,
+    'EXTENSION': False,
+    'EXECUTABLE': False,
+    'PYSOURCE': False,
+    'PYMODULE': False,
+    'DEPENDENCY': False,
+}
+
+
+def find_upx(upx_dir=None):
+    """查找UPX所在目录，未安装时返回None"""
+    candidates = []
+    if upx_dir:
+        candidates.append(upx_dir)
+    if os.environ.get('UPX_DIR'):
+        candidates.append(os.environ['UPX_DIR'])
+    for directory in candidates:
+        for name in ('upx.exe', 'upx'):
+            if os.path.isfile(os.path.join(directory, name)):
+                return directory
+    path = shutil.which('upx')
+    return os.path.dirname(path) if path else None
+
+
+def resolve_profile(name, upx_dir=None):
+    """解析压缩配置，UPX不可用时回退为zlib配置
+
+    返回 (配置字典, 警告信息或None)，配置字典中的 upx_dir 为UPX所在目录
+    """
+    if name not in COMPRESSION_PROFILES:
+        return resolve_profile(DEFAULT_COMPRESSION, upx_dir)[0], f"未知的压缩配置: {name}，已使用默认配置"
+
+    profile = dict(COMPRESSION_PROFILES[name])
+    profile['name'] = name
+    profile['upx_dir'] = None
+    warning = None
+    if profile['upx']:
+        profile['upx_dir'] = find_upx(upx_dir)
+        if not profile['upx_dir']:
+            profile = dict(COMPRESSION_PROFILES[DEFAULT_COMPRESSION], name=DEFAULT_COMPRESSION, upx_dir=None)
+            warning = f"未找到UPX，压缩配置 {name} 已回退为 {DEFAULT_COMPRESSION}"
+    return profile, warning
+
+
+def spec_exe_options(profile):
+    """生成spec文件中EXE的压缩相关参数"""
+    options = (f"    strip={profile['strip']!r},\n"
+               f"    upx={profile['upx']!r},\n"
+               f"    upx_exclude={profile['upx_exclude']!r},\n")
+    if not profile['compress_archive']:
+        options += f"    cdict={_UNCOMPRESSED_CDICT!r},\n"
+    return options
+
+
+def pyinstaller_args(profile):
+    """PyInstaller命令行中的压缩相关参数（是否使用UPX由spec文件中的upx参数决定）"""
+    if profile['upx'] and profile['upx_dir']:
+        return ['--upx-dir', profile['upx_dir']]
+    return []
+
+
+def build_env(profile):
+    """PyInstaller子进程的环境变量（UPX通过UPX环境变量读取默认参数）"""
+    env = dict(os.environ)
+    if profile['upx'] and profile['upx_args']:
+        env['UPX'] = profile['upx_args']
+    return env
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 测试公用夹具
+"""
+
+import pytest
+
+
+@pytest.fixture
+def make_site(tmp_path):
+    """按 {相对路径: 内容} 创建测试网站文件夹，返回文件夹路径"""
+
+    def make(files, name="site"):
+        root = tmp_path / name
+        for rel_path, content in files.items():
+            path = root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content, encoding='utf-8')
+        root.mkdir(exist_ok=True)
+        return str(root)
+
+    return make
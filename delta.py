@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 二进制差异更新（生成/应用同一应用相邻两次构建之间的差异包）
+
+本文件只依赖Python标准库，会被复制到构建输出目录中作为差异包应用工具:
+    python webpack_delta.py apply <旧版本exe> <差异包> <输出的新版本exe>
+"""
+
+import os
+import sys
+import time
+import zlib
+import struct
+import hashlib
+import argparse
+
+DELTA_MAGIC = b'WPKDELT1'
+# 文件头：魔数、旧文件大小、新文件大小、旧文件SHA256、新文件SHA256
+HEADER_FORMAT = '<8sQQ32s32s'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# 比较和匹配的块大小
+BLOCK_SIZE = 64 * 1024
+# 重新同步时在旧文件中查找的探针长度
+PROBE_SIZE = 32
+# 重新同步时在预期位置前后查找的范围
+SEARCH_WINDOW = 4 * 1024 * 1024
+# 最短的复制片段（更短的匹配按新数据写入）
+MIN_MATCH = 64
+
+OP_COPY = b'C'
+OP_DATA = b'D'
+
+# 复制到构建输出目录中的应用工具文件名
+APPLIER_NAME = "webpack_delta.py"
+
+
+def _common_prefix(a, a_pos, b, b_pos, limit):
+    """a[a_pos:]与b[b_pos:]的最长公共前缀长度（不超过limit），按块比较后二分查找"""
+    length = 0
+    while length < limit:
+        step = min(BLOCK_SIZE, limit - length)
+        if a[a_pos + length:a_pos + length + step] == b[b_pos + length:b_pos + length + step]:
+            length += step
+            continue
+        low, high = 0, step
+        while low < high:
+            mid = (low + high + 1) // 2
+            if a[a_pos + length:a_pos + length + mid] == b[b_pos + length:b_pos + length + mid]:
+                low = mid
+            else:
+                high = mid - 1
+        return length + low
+    return length
+
+
+def _common_suffix(a, a_end, b, b_end, limit):
+    """a[:a_end]与b[:b_end]的最长公共后缀长度（不超过limit）"""
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[a_end - mid:a_end] == b[b_end - mid:b_end]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _find_match(old, new, pos, shift, index):
+    """为new[pos:]查找旧文件中的候选位置：沿用当前偏移、块索引、探针查找"""
+    chunk = new[pos:pos + BLOCK_SIZE]
+    expected = pos - shift
+    candidates = [expected]
+    indexed = index.get(hash(chunk))
+    if indexed is not None:
+        candidates.append(indexed)
+    if len(chunk) >= PROBE_SIZE:
+        probe = chunk[:PROBE_SIZE]
+        low = max(0, expected - SEARCH_WINDOW)
+        found = old.find(probe, low, max(low, expected + SEARCH_WINDOW + PROBE_SIZE))
+        if found >= 0:
+            candidates.append(found)
+
+    best_offset, best_length = -1, 0
+    for offset in candidates:
+        if 0 <= offset < len(old):
+            length = _common_prefix(new, pos, old, offset, min(len(new) - pos, len(old) - offset))
+            if length > best_length:
+                best_offset, best_length = offset, length
+    return best_offset, best_length
+
+
+def make_delta(old, new):
+    """生成从old到new的差异包（bytes）"""
+    # 旧文件按块建立索引（块内容的哈希 -> 偏移）
+    index = {}
+    for offset in range(0, len(old) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        index.setdefault(hash(old[offset:offset + BLOCK_SIZE]), offset)
+
+    ops = []
+    pos = 0
+    shift = 0
+    literal_start = 0
+    while pos < len(new):
+        offset, length = _find_match(old, new, pos, shift, index)
+        if length < MIN_MATCH:
+            pos = min(pos + BLOCK_SIZE, len(new))
+            continue
+
+        # 向前扩展匹配，缩短前面的新数据片段
+        back = _common_suffix(new, pos, old, offset, min(pos - literal_start, offset))
+        if pos - back > literal_start:
+            ops.append((OP_DATA, new[literal_start:pos - back]))
+        ops.append((OP_COPY, offset - back, length + back))
+        pos += length
+        shift = pos - (offset + length)
+        literal_start = pos
+
+    if literal_start < len(new):
+        ops.append((OP_DATA, new[literal_start:]))
+
+    body = []
+    for op in ops:
+        if op[0] == OP_COPY:
+            body.append(OP_COPY + struct.pack('<QQ', op[1], op[2]))
+        else:
+            body.append(OP_DATA + struct.pack('<Q', len(op[1])))
+            body.append(op[1])
+
+    header = struct.pack(HEADER_FORMAT, DELTA_MAGIC, len(old), len(new),
+                         hashlib.sha256(old).digest(), hashlib.sha256(new).digest())
+    return header + zlib.compress(b''.join(body), 6)
+
+
+def apply_delta(old, delta):
+    """将差异包应用到old，返回新文件内容（校验输入和输出的SHA256）"""
+    magic, old_size, new_size, old_hash, new_hash = struct.unpack(HEADER_FORMAT, delta[:HEADER_SIZE])
+    if magic != DELTA_MAGIC:
+        raise ValueError("不是有效的差异包")
+    if len(old) != old_size or hashlib.sha256(old).digest() != old_hash:
+        raise ValueError("旧版本文件与差异包不匹配")
+
+    body = zlib.decompress(delta[HEADER_SIZE:])
+    parts = []
+    pos = 0
+    while pos < len(body):
+        op = body[pos:pos + 1]
+        if op == OP_COPY:
+            offset, length = struct.unpack('<QQ', body[pos + 1:pos + 17])
+            parts.append(old[offset:offset + length])
+            pos += 17
+        elif op == OP_DATA:
+            (length,) = struct.unpack('<Q', body[pos + 1:pos + 9])
+            parts.append(body[pos + 9:pos + 9 + length])
+            pos += 9 + length
+        else:
+            raise ValueError("差异包已损坏")
+
+    new = b''.join(parts)
+    if len(new) != new_size or hashlib.sha256(new).digest() != new_hash:
+        raise ValueError("生成的文件校验失败")
+    return new
+
+
+def create_delta_file(old_path, new_path, delta_path):
+    """生成差异包文件，返回统计信息：{'delta_bytes', 'new_bytes', 'seconds'}"""
+    start = time.perf_counter()
+    with open(old_path, 'rb') as f:
+        old = f.read()
+    with open(new_path, 'rb') as f:
+        new = f.read()
+    delta = make_delta(old, new)
+    with open(delta_path, 'wb') as f:
+        f.write(delta)
+    return {
+        'delta_bytes': len(delta),
+        'new_bytes': len(new),
+        'seconds': time.perf_counter() - start
+    }
+
+
+def apply_delta_file(old_path, delta_path, output_path):
+    """应用差异包文件生成新版本"""
+    with open(old_path, 'rb') as f:
+        old = f.read()
+    with open(delta_path, 'rb') as f:
+        delta = f.read()
+    new = apply_delta(old, delta)
+    with open(output_path, 'wb') as f:
+        f.write(new)
+    if not sys.platform.startswith('win'):
+        os.chmod(output_path, os.stat(old_path).st_mode)
+    return len(new)
+
+
+def copy_applier(target_dir):
+    """将本文件复制到目标目录作为差异包应用工具，返回复制后的路径（找不到源文件时返回None）"""
+    source = os.path.abspath(__file__)
+    if not os.path.exists(source) and hasattr(sys, '_MEIPASS'):
+        # 打包工具自身被打包时，本文件作为数据文件随附
+        source = os.path.join(sys._MEIPASS, 'delta.py')
+    if not os.path.exists(source):
+        return None
+    target = os.path.join(target_dir, APPLIER_NAME)
+    with open(source, 'rb') as fsrc, open(target, 'wb') as fdst:
+        fdst.write(fsrc.read())
+    return target
+
+
+def format_delta_stats(stats):
+    """格式化差异包统计信息"""
+    ratio = stats['delta_bytes'] / max(stats['new_bytes'], 1) * 100
+    if stats['delta_bytes'] < 1024 * 1024:
+        size = f"{stats['delta_bytes'] / 1024:.1f} KB"
+    else:
+        size = f"{stats['delta_bytes'] / (1024 * 1024):.2f} MB"
+    return f"差异包 {size}（完整exe的 {ratio:.1f}%），生成用时 {stats['seconds']:.2f} 秒"
+
+
+def main():
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="网页打包工具 - 二进制差异更新")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="生成差异包")
+    create_parser.add_argument("old", help="旧版本exe")
+    create_parser.add_argument("new", help="新版本exe")
+    create_parser.add_argument("delta", help="输出的差异包")
+
+    apply_parser = subparsers.add_parser("apply", help="应用差异包")
+    apply_parser.add_argument("old", help="旧版本exe")
+    apply_parser.add_argument("delta", help="差异包")
+    apply_parser.add_argument("output", help="输出的新版本exe")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "create":
+            print(format_delta_stats(create_delta_file(args.old, args.new, args.delta)))
+        else:
+            size = apply_delta_file(args.old, args.delta, args.output)
+            print(f"已生成新版本: {args.output} ({size / (1024 * 1024):.2f} MB)")
+    except (OSError, ValueError) as e:
+        print(f"失败: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
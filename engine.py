@@ -0,0 +1,1605 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 打包引擎（与界面无关的打包流程，提供阻塞和asyncio两种接口）
+
+用法:
+    engine = PackagingEngine()
+    engine.subscribe(lambda event: print(event['message']) if event['type'] == 'log' else None)
+    result = engine.package({'mode': 'url', 'source': 'https://example.com', 'output_dir': './Pack'})
+
+    # 在事件循环中并发编排多个构建
+    results = await engine.package_many_async(params_list, max_concurrent=2)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import logging
+import itertools
+import threading
+# asyncio只在使用异步接口时导入，避免拖慢打包工具启动
+from fastcopy import copy_selected, default_workers, format_copy_stats
+from packignore import PackIgnore, DEFAULT_IGNORE_PATTERNS, scan_folder, format_scan_stats
+from module_profile import compute_lean_profile, measure_startup, probe_code
+from asset_graph import FolderFiles, find_reachable
+from inliner import DEFAULT_INLINE_THRESHOLD_KB, inline_to_file, format_inline_report
+from app_cache import app_storage_id, load_precache_urls, storage_code, precache_code
+from url_preflight import shared_preflight, format_preflight
+from governor import BuildGovernor, DEFAULT_RESOURCE_LIMITS
+from delta import APPLIER_NAME, create_delta_file, copy_applier, format_delta_stats
+from splash import SPLASH_EXTENSIONS, prepare_splash, spec_splash_block, splash_close_code, measure_window_times, format_window_times
+from compression import DEFAULT_COMPRESSION, resolve_profile, spec_exe_options, pyinstaller_args, build_env
+from planner import estimate_build, sort_by_cost
+from multisite import (DEFAULT_HOST_TITLE, HOST_MANIFEST, BLOB_DIR, dedup_assets, format_dedup_stats, host_server_code,
+                       measure_launch, format_launch, format_launch_comparison)
+
+logger = logging.getLogger(__name__)
+
+# 每个编号文件夹中记录构建信息的文件（用于查找同一应用的上一次构建）
+BUILD_INFO_FILE = "build_info.json"
+
+# 保留的构建历史条数
+BUILD_HISTORY_LIMIT = 50
+
+# 打包参数的默认值（调用方未提供的参数使用默认值）
+DEFAULT_PARAMS = {
+    'mode': 'url',
+    'source': '',
+    'window_title': '我的网页应用',
+    'window_width': 1024,
+    'window_height': 768,
+    'output_dir': '',
+    'icon_path': '',
+    'copy_workers': 0,
+    'ignore_patterns': list(DEFAULT_IGNORE_PATTERNS),
+    'module_profile': 'default',
+    'measure_startup': False,
+    'compression': DEFAULT_COMPRESSION,
+    'build_mode': 'pyinstaller',
+    'entry_file': '',
+    'tree_shaking': False,
+    'allow_patterns': [],
+    'inline_single_file': False,
+    'inline_threshold_kb': DEFAULT_INLINE_THRESHOLD_KB,
+    'persistent_storage': False,
+    'precache_manifest': '',
+    'splash_image': '',
+    'resource_limits': dict(DEFAULT_RESOURCE_LIMITS)
+}
+
+# 试运行时spec文件和构建命令中临时工作目录的占位路径
+PLAN_TEMP_DIR = os.path.join(tempfile.gettempdir(), "<临时目录>")
+
+# 没有可参考的构建历史时估算的exe体积（检查临时空间用）
+ESTIMATED_EXE_BYTES = 100 * 1024 * 1024
+
+# 窗口的最小尺寸
+MIN_WINDOW_WIDTH = 400
+MIN_WINDOW_HEIGHT = 300
+
+
+def validate_params(params):
+    """校验打包参数并补全默认值，返回新的参数字典，参数无效时抛出ValueError"""
+    merged = {key: (list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value)
+              for key, value in DEFAULT_PARAMS.items()}
+    merged.update({key: value for key, value in params.items() if value is not None})
+    
+    if merged['mode'] not in ('url', 'file', 'folder'):
+        raise ValueError(f"未知的打包模式: {merged['mode']}")
+    if not merged['source']:
+        raise ValueError("请选择或输入源文件/URL")
+    if merged['mode'] == 'file' and not os.path.isfile(merged['source']):
+        raise ValueError(f"文件不存在: {merged['source']}")
+    if merged['mode'] == 'folder' and not os.path.isdir(merged['source']):
+        raise ValueError(f"文件夹不存在: {merged['source']}")
+    if not merged['output_dir']:
+        raise ValueError("请选择输出目录")
+    
+    try:
+        for key in ('window_width', 'window_height', 'copy_workers', 'inline_threshold_kb'):
+            merged[key] = int(merged[key])
+    except (TypeError, ValueError):
+        raise ValueError("窗口尺寸、复制线程数和内联阈值必须为数字")
+    if merged['window_width'] < MIN_WINDOW_WIDTH or merged['window_height'] < MIN_WINDOW_HEIGHT:
+        raise ValueError(f"窗口尺寸不能小于{MIN_WINDOW_WIDTH}x{MIN_WINDOW_HEIGHT}")
+    if merged['copy_workers'] < 0:
+        raise ValueError("复制线程数不能小于0")
+    if merged['inline_threshold_kb'] < 0:
+        raise ValueError("内联阈值不能小于0")
+    return merged
+
+
+class PackagingEngine:
+    """打包引擎：校验、生成应用代码、暂存网页内容、生成spec、调用PyInstaller并复制输出
+
+    引擎不依赖界面，进度通过事件回调通知。事件为字典，type 取值:
+        log       日志（message）
+        progress  进度（progress 为 0-100，message 为当前阶段）
+        built     一个应用构建完成（source、mode 为用户选择的原始来源，exe_path）
+        complete  整个构建完成（result）
+        error     构建失败（message）
+    每个事件都带有 build_id，用于区分并发进行的构建。回调在构建线程中调用，
+    asyncio 接口的 on_event 回调在事件循环线程中调用。
+
+    history 为构建历史列表（最新的在前，就地更新），用于与之前的构建对比。
+    """
+
+    def __init__(self, history=None):
+        self.history = history if history is not None else []
+        self._listeners = []
+        self._local = threading.local()
+        self._history_lock = threading.Lock()
+        self._build_ids = itertools.count(1)
+
+    def subscribe(self, callback):
+        """订阅所有构建的事件，返回callback（便于之后取消订阅）"""
+        self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """取消订阅"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def emit(self, event_type, **fields):
+        """向订阅者和当前构建的回调发送事件
+
+        回调中的异常不影响构建和其他回调，记录到logging（不再作为事件发送，避免出错的回调反复触发）。
+        """
+        event = {'type': event_type, 'build_id': getattr(self._local, 'build_id', None)}
+        event.update(fields)
+        callbacks = list(self._listeners)
+        on_event = getattr(self._local, 'on_event', None)
+        if on_event is not None:
+            callbacks.append(on_event)
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("事件回调失败（%s 事件）", event_type)
+
+    def log(self, message):
+        """发送日志事件"""
+        self.emit('log', message=message)
+
+    def progress(self, value, message=''):
+        """发送进度事件"""
+        self.emit('progress', progress=value, message=message)
+
+    def _run_build(self, func, on_event):
+        """在当前线程中执行一次构建，期间的事件带有同一个build_id并发送给on_event"""
+        self._local.build_id = next(self._build_ids)
+        self._local.on_event = on_event
+        try:
+            self.progress(10, "开始打包")
+            result = func()
+            self.progress(100, "打包完成")
+            self.emit('complete', result=result)
+            return result
+        except Exception as e:
+            self.emit('error', message=str(e))
+            raise
+        finally:
+            self._local.build_id = None
+            self._local.on_event = None
+
+    def package(self, params, on_event=None):
+        """阻塞地构建一个应用，返回构建结果（exe_path、output_dir、build_seconds、metrics）"""
+        params = validate_params(params)
+        return self._run_build(lambda: self.create_application(params), on_event)
+
+    def package_batch(self, params_list, on_event=None):
+        """阻塞地进行多变体构建（共用一次依赖分析），返回构建结果"""
+        if not params_list:
+            raise ValueError("配置中没有应用")
+        params_list = [validate_params(params) for params in params_list]
+        return self._run_build(lambda: self.create_batch(params_list), on_event)
+
+    def package_host(self, params_list, title=DEFAULT_HOST_TITLE, on_event=None):
+        """阻塞地构建多站点宿主应用（所有站点在一个进程中以多个窗口运行），返回构建结果"""
+        if not params_list:
+            raise ValueError("配置中没有应用")
+        params_list = [validate_params(params) for params in params_list]
+        return self._run_build(lambda: self.create_host(params_list, title or DEFAULT_HOST_TITLE), on_event)
+
+    async def package_async(self, params, on_event=None):
+        """在线程池中构建一个应用，不阻塞事件循环"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.package, params, self._threadsafe(loop, on_event))
+
+    async def package_batch_async(self, params_list, on_event=None):
+        """在线程池中进行多变体构建，不阻塞事件循环"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.package_batch, params_list, self._threadsafe(loop, on_event))
+
+    async def package_host_async(self, params_list, title=DEFAULT_HOST_TITLE, on_event=None):
+        """在线程池中构建多站点宿主应用，不阻塞事件循环"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.package_host, params_list, title, self._threadsafe(loop, on_event))
+
+    async def package_many_async(self, params_list, max_concurrent=2, on_event=None, longest_first=False):
+        """并发构建多个应用（最多max_concurrent个同时进行），按顺序返回结果，失败的构建返回异常对象
+
+        longest_first 为True时先试运行估算每个构建的耗时，预计耗时最长的先开始，缩短总耗时。
+        同一台机器上的总并发构建数还受资源限制 max_concurrent_builds 约束。
+        """
+        import asyncio
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        async def build(params):
+            async with semaphore:
+                return await self.package_async(params, on_event)
+
+        order = list(range(len(params_list)))
+        if longest_first:
+            plans = await asyncio.get_running_loop().run_in_executor(None, self.plan_many, params_list)
+            index = {id(plan): i for i, plan in enumerate(plans)}
+            order = [index[id(plan)] for plan in sort_by_cost(plans)]
+        results = await asyncio.gather(*(build(params_list[i]) for i in order), return_exceptions=True)
+        ordered = [None] * len(params_list)
+        for i, result in zip(order, results):
+            ordered[i] = result
+        return ordered
+
+    def plan(self, params):
+        """试运行：计算打包计划和预计的耗时、体积，不调用PyInstaller，也不复制文件或创建输出目录
+
+        返回 {files, file_count, content_bytes, spec, command, output_dir, exe_path, estimate, seconds, notes}，
+        estimate 的含义见 planner.estimate_build。
+        """
+        start = time.perf_counter()
+        params = validate_params(params)
+        notes = []
+        
+        if params['mode'] == 'url':
+            notes.append("试运行不预检网页URL")
+        if params.get('inline_single_file') and params['mode'] in ('file', 'folder'):
+            notes.append("单文件内联在打包时进行，计划中的文件为内联前的原始文件")
+        
+        scan = None
+        files = []
+        if params['mode'] == 'folder':
+            scan = self.scan_source_folder(params)
+            params['entry_file'] = scan['entry']
+            files = scan['files']
+        elif params['mode'] == 'file':
+            files = [os.path.basename(params['source'])]
+        params['content_bytes'] = self.content_bytes(params, scan)
+        self.prepare_precache(params)
+        
+        # 图标和启动画面只检查是否存在，spec中引用临时目录中的副本
+        params['icon_file'] = os.path.join(PLAN_TEMP_DIR, "icon.ico") if params['icon_path'] and os.path.exists(params['icon_path']) else None
+        params['splash_file'] = None
+        if params.get('splash_image') and os.path.exists(params['splash_image']):
+            ext = os.path.splitext(params['splash_image'])[1].lower()
+            if ext not in SPLASH_EXTENSIONS:
+                raise Exception(f"不支持的启动画面格式: {ext}（支持 {', '.join(SPLASH_EXTENSIONS)}）")
+            params['splash_file'] = os.path.join(PLAN_TEMP_DIR, "splash" + ext)
+        
+        params['excludes'] = []
+        if params.get('module_profile') == 'lean':
+            notes.append("精简模块的排除列表在打包时分析生成的应用代码后确定")
+        compression, warning = resolve_profile(params.get('compression', DEFAULT_COMPRESSION))
+        params['compression_options'] = compression
+        if warning:
+            notes.append(warning)
+        
+        output_dir = os.path.join(params['output_dir'], str(self.next_folder_number(params['output_dir'])))
+        output_name = params['window_title'].replace(' ', '_')
+        exe_path = os.path.join(output_dir, output_name + ('.exe' if sys.platform.startswith('win') else ''))
+        
+        spec = None
+        command = None
+        if params.get('build_mode') == 'template':
+            notes.append("模板启动器模式不调用PyInstaller（启动器不存在时会先构建一次启动器）")
+        else:
+            spec = self.generate_spec_file(params, PLAN_TEMP_DIR, scan)
+            command = ['pyinstaller', '--noconfirm', '--distpath', output_dir,
+                       '--workpath', os.path.join(PLAN_TEMP_DIR, 'build')]
+            command.extend(pyinstaller_args(compression))
+            command.append(os.path.join(PLAN_TEMP_DIR, "app.spec"))
+        
+        estimate = self.estimate(params)
+        
+        return {
+            'files': files,
+            'file_count': len(files),
+            'content_bytes': params['content_bytes'],
+            'spec': spec,
+            'command': command,
+            'output_dir': output_dir,
+            'exe_path': exe_path,
+            'estimate': estimate,
+            'seconds': time.perf_counter() - start,
+            'notes': notes
+        }
+
+    def estimate(self, params):
+        """根据构建历史估算构建耗时和exe体积（见 planner.estimate_build）"""
+        return estimate_build(list(self.history), {
+            'mode': params.get('original_mode', params['mode']),
+            'source': params.get('original_source', params['source']),
+            'build_mode': params.get('build_mode', 'pyinstaller'),
+            'compression': params.get('compression_options', {}).get('name', params.get('compression', DEFAULT_COMPRESSION)),
+            'module_profile': params.get('module_profile', 'default'),
+            'content_bytes': params.get('content_bytes', 0)
+        })
+
+    def estimated_exe_bytes(self, params):
+        """预计的exe体积（没有可参考的构建时使用 ESTIMATED_EXE_BYTES）"""
+        return self.estimate(params)['exe_size'] or ESTIMATED_EXE_BYTES
+
+    def plan_many(self, params_list):
+        """试运行多个应用，返回计划列表（参数无效的应用对应异常对象）"""
+        plans = []
+        for params in params_list:
+            try:
+                plans.append(self.plan(params))
+            except Exception as e:
+                plans.append(e)
+        return plans
+
+    @staticmethod
+    def _threadsafe(loop, on_event):
+        """将回调转到事件循环线程中调用"""
+        if on_event is None:
+            return None
+        return lambda event: loop.call_soon_threadsafe(on_event, event)
+
+    def record_history(self, entry):
+        """记录一次构建（最新的在前，最多保留BUILD_HISTORY_LIMIT条）"""
+        with self._history_lock:
+            self.history.insert(0, entry)
+            del self.history[BUILD_HISTORY_LIMIT:]
+
+    def preflight_batch(self, params_list):
+        """并发预检所有网页URL，任一地址不可用时在构建前失败"""
+        urls = [p['source'] for p in params_list if p['mode'] == 'url']
+        if not urls:
+            return
+        results = shared_preflight().check_many(urls)
+        failed = [r for r in results.values() if not r['ok']]
+        self.log(f"URL预检: {len(results)} 个地址, {len(failed)} 个不可用")
+        if failed:
+            raise Exception("\n".join(format_preflight(r) for r in failed))
+
+    def create_application(self, params):
+        """创建应用程序（占用构建槽位，在资源限制下构建）"""
+        self.log("正在创建应用配置...")
+        
+        # 网页URL模式：先检查地址是否可用，避免在完整打包后才发现错误
+        self.preflight_url(params)
+        
+        governor = BuildGovernor(params.get('resource_limits'), self.log)
+        self.log(f"资源限制: {governor.describe()}")
+        with governor.slot():
+            return self.build_application(params, governor)
+    
+    def build_application(self, params, governor):
+        """创建应用程序"""
+        # 检查临时空间后创建临时工作目录
+        temp_dir = governor.mkdtemp()
+        
+        try:
+            # 为每个软件创建独立的编号文件夹
+            numbered_folder = self.create_numbered_folder(params['output_dir'])
+            
+            # 单文件内联：之后按内联生成的页面打包
+            self.progress(20, "准备网页内容")
+            self.inline_source(params, temp_dir)
+            
+            # 持久化存储和预缓存列表（网页URL模式）
+            self.prepare_precache(params)
+            
+            # 模板启动器模式：复制预构建的启动器并追加应用数据
+            if params.get('build_mode') == 'template':
+                return self.create_from_template(params, numbered_folder, temp_dir, governor)
+            
+            # 文件夹模式：扫描文件夹并确定入口页面（生成应用代码时需要）
+            scan = None
+            if params['mode'] == 'folder':
+                scan = self.scan_source_folder(params)
+                params['entry_file'] = scan['entry']
+            
+            # 创建主应用文件
+            app_content = self.generate_app_code(params)
+            app_file = os.path.join(temp_dir, "app.py")
+            with open(app_file, 'w', encoding='utf-8') as f:
+                f.write(app_content)
+            
+            self.log("应用代码生成完成")
+            
+            # 计算模块精简配置
+            params['excludes'] = []
+            if params.get('module_profile') == 'lean':
+                profile = compute_lean_profile(app_file)
+                params['excludes'] = profile['excludes']
+                self.log(f"精简模块: 需要 {len(profile['required'])} 个顶层模块, 排除 {len(profile['excludes'])} 个模块")
+            
+            # 复制图标文件（如果有）
+            params['icon_file'] = self.prepare_icon(params, temp_dir)
+            
+            # 复制启动画面图片（如果有）
+            params['splash_file'] = prepare_splash(params.get('splash_image'), temp_dir)
+            if params['splash_file']:
+                self.log("启动画面: 解压期间显示，页面加载完成后关闭")
+            
+            # 检查临时空间：暂存的网页内容和PyInstaller的构建输出
+            params['content_bytes'] = self.content_bytes(params, scan)
+            governor.check_temp_space(temp_dir, params['content_bytes'] + self.estimated_exe_bytes(params))
+            
+            # 复制HTML文件到临时目录（对于文件和文件夹模式）
+            content_dir = os.path.join(temp_dir, "web_content")
+            if params['mode'] == 'file':
+                # 复制单个HTML文件
+                html_file_name = os.path.basename(params['source'])
+                shutil.copy2(params['source'], os.path.join(temp_dir, html_file_name))
+                self.log(f"复制HTML文件: {html_file_name}")
+            elif params['mode'] == 'folder':
+                # 并行复制保留的文件到独立的暂存目录
+                workers = params.get('copy_workers') or default_workers()
+                stats = copy_selected(params['source'], content_dir, scan['files'], workers, scan['dirs'])
+                self.log(f"复制文件夹内容: {params['source']} ({format_copy_stats(stats)}, {workers} 线程)")
+            
+            # 解析压缩配置
+            compression, warning = resolve_profile(params.get('compression', DEFAULT_COMPRESSION))
+            params['compression_options'] = compression
+            if warning:
+                self.log(warning)
+            self.log(f"压缩方式: {compression['name']} - {compression['label']}")
+            
+            # 创建spec文件用于PyInstaller
+            self.progress(40, "生成配置文件")
+            spec_content = self.generate_spec_file(params, temp_dir, scan)
+            spec_file = os.path.join(temp_dir, "app.spec")
+            with open(spec_file, 'w', encoding='utf-8') as f:
+                f.write(spec_content)
+            
+            self.log("配置文件生成完成")
+            
+            # 使用PyInstaller打包
+            self.progress(50, "PyInstaller打包")
+            self.log("正在使用PyInstaller打包...")
+            output_name = params['window_title'].replace(' ', '_')
+            
+            # 构建PyInstaller命令（窗口模式、单文件、数据文件和排除模块均由spec文件描述）
+            cmd = [
+                'pyinstaller',
+                '--noconfirm',
+                '--distpath', numbered_folder,  # 输出到编号文件夹
+                '--workpath', os.path.join(temp_dir, 'build'),
+            ]
+            cmd.extend(pyinstaller_args(compression))
+            cmd.append(spec_file)
+            
+            build_start = time.perf_counter()
+            result = governor.run(cmd, capture_output=True, text=True, cwd=temp_dir, env=build_env(compression))
+            build_seconds = time.perf_counter() - build_start
+            
+            if result.returncode == 0:
+                self.log("打包成功完成！")
+                exe_path = os.path.join(numbered_folder, f"{output_name}.exe")
+                if not os.path.exists(exe_path) and os.path.exists(os.path.join(numbered_folder, output_name)):
+                    # 非Windows平台生成的可执行文件没有扩展名
+                    exe_path = os.path.join(numbered_folder, output_name)
+                self.log(f"生成的可执行文件: {exe_path}")
+                
+                # 测量exe体积和启动耗时，并与同一应用的默认构建对比
+                self.progress(90, "测量构建结果")
+                metrics = self.report_build_metrics(params, exe_path, build_seconds)
+                
+                # 生成相对同一应用上一次构建的差异包
+                self.write_build_delta(params, numbered_folder, exe_path, metrics)
+                
+                # 复制HTML文件到编号文件夹（便于用户查看）
+                self.mirror_content(params, numbered_folder, scan)
+                
+                # 通知调用方（界面据此记录最近使用的来源）
+                self.emit_built(params, exe_path)
+                
+                self.log(f"软件已保存到: {numbered_folder}")
+                
+                return {
+                    "exe_path": exe_path,
+                    "output_dir": numbered_folder,
+                    "build_seconds": build_seconds,
+                    "metrics": metrics
+                }
+            else:
+                raise Exception(f"PyInstaller打包失败: {result.stderr}")
+                
+        finally:
+            # 清理临时文件
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def scan_source_folder(self, params):
+        """扫描源文件夹：应用排除规则、确定入口页面，并按需只保留入口页面可达的资源"""
+        ignore = PackIgnore.from_folder(params['source'], params.get('ignore_patterns'))
+        scan = scan_folder(params['source'], ignore)
+        self.log(f"扫描文件夹: {format_scan_stats(scan)}")
+        
+        # 入口页面：用户选择的文件，否则为根目录下的第一个HTML文件
+        entry = (params.get('entry_file') or '').replace(os.sep, '/')
+        if entry not in scan['files']:
+            root_html = [f for f in scan['files'] if '/' not in f and f.lower().endswith(('.html', '.htm'))]
+            if not root_html:
+                raise Exception(f"文件夹根目录中没有找到HTML文件: {params['source']}")
+            entry = root_html[0]
+        scan['entry'] = entry
+        self.log(f"入口页面: {entry}")
+        
+        if params.get('tree_shaking'):
+            reach = find_reachable(params['source'], entry, scan['files'], params.get('allow_patterns'))
+            self.log(f"引用分析: 保留 {len(reach['files'])} 个文件, 未被引用 {len(reach['dropped'])} 个文件 "
+                     f"({reach['dropped_bytes'] / (1024 * 1024):.2f} MB) 不打包")
+            for rel_path in reach['dropped'][:20]:
+                self.log(f"  未引用: {rel_path}")
+            if len(reach['dropped']) > 20:
+                self.log(f"  ... 另有 {len(reach['dropped']) - 20} 个文件")
+            if reach['missing']:
+                self.log(f"引用了但不存在的文件: {', '.join(reach['missing'][:10])}")
+            scan['files'] = reach['files']
+            scan['dirs'] = reach['dirs']
+            scan['bytes'] -= reach['dropped_bytes']
+        
+        return scan
+    
+    def preflight_url(self, params):
+        """预检网页URL：补全协议、检查可访问性、TLS和内容类型，只经过永久重定向时使用最终地址
+
+        用户输入的地址保存在original_source中，应用的存储目录和构建记录仍按它识别。
+        """
+        if params['mode'] != 'url':
+            return
+        params.setdefault('original_source', params['source'])
+        result = shared_preflight().check(params['source'])
+        self.log(format_preflight(result))
+        if not result['ok']:
+            raise Exception(format_preflight(result))
+        if result['permanent'] and result['final_url'] != result['url']:
+            self.log(f"地址已永久重定向，使用最终地址: {result['final_url']}")
+            params['source'] = result['final_url']
+        else:
+            params['source'] = result['url']
+    
+    def inline_source(self, params, temp_dir):
+        """将入口页面及其资源内联为单个HTML文件，并改为按内联结果打包
+
+        超过阈值或无法内联的资源（以及页面链接的其他页面）仍需保留为独立文件，
+        此时改用文件夹模式打包内联页面和这些文件。原始来源保存在original_source/original_mode中。
+        """
+        if not params.get('inline_single_file') or params['mode'] not in ('file', 'folder'):
+            return params
+        if not os.path.exists(params['source']):
+            return params
+        
+        if params['mode'] == 'folder':
+            scan = self.scan_source_folder(params)
+            folder, entry, files = params['source'], scan['entry'], scan['files']
+        else:
+            # 从页面出发只查找引用到的文件（不遍历页面所在的整个目录），并应用排除规则
+            folder, entry = os.path.split(os.path.abspath(params['source']))
+            ignore = PackIgnore.from_folder(folder, params.get('ignore_patterns'))
+            files = find_reachable(folder, entry, FolderFiles(folder, ignore))['files']
+        
+        inline_dir = os.path.join(temp_dir, "inlined")
+        output_path = os.path.join(inline_dir, entry)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        threshold_kb = params.get('inline_threshold_kb', DEFAULT_INLINE_THRESHOLD_KB)
+        report = inline_to_file(folder, entry, output_path, threshold_kb, files)
+        self.log(f"单文件内联: {format_inline_report(report)}")
+        for rel_path, reason in sorted(report['skipped'].items()):
+            self.log(f"  未内联: {rel_path} ({reason})")
+        
+        # 入口页面仍然引用的本地文件，以及从这些文件（如链接的其他页面）出发可达的文件。
+        # 已内联的文件只有在没有其他保留的文件引用时才可以去掉
+        inlined = set(report['inlined'])
+        needed = set()
+        for rel_path in find_reachable(folder, entry, files)['files']:
+            if rel_path == entry or rel_path in inlined or rel_path in needed:
+                continue
+            needed.update(find_reachable(folder, rel_path, files)['files'])
+        needed.discard(entry)
+        remaining = sorted(needed)
+
+        params['original_source'] = params['source']
+        params['original_mode'] = params['mode']
+        if remaining:
+            copy_selected(folder, inline_dir, remaining, params.get('copy_workers') or default_workers())
+            self.log(f"{len(remaining)} 个文件无法内联，与内联页面一起按文件夹打包")
+            params['mode'] = 'folder'
+            params['source'] = inline_dir
+            params['entry_file'] = entry
+            params['tree_shaking'] = False
+            params['ignore_patterns'] = []
+        else:
+            params['mode'] = 'file'
+            params['source'] = output_path
+        return params
+    
+    def prepare_precache(self, params):
+        """读取预缓存清单（网页URL模式），预缓存需要持久化存储"""
+        if params['mode'] != 'url':
+            return
+        manifest = params.get('precache_manifest')
+        if manifest and not params.get('precache_urls'):
+            if not os.path.exists(manifest):
+                raise Exception(f"预缓存清单不存在: {manifest}")
+            params['precache_urls'] = load_precache_urls(manifest, params['source'])
+        if params.get('precache_urls') and not params.get('persistent_storage'):
+            self.log("预缓存需要持久化存储，已自动启用")
+            params['persistent_storage'] = True
+        if params.get('persistent_storage'):
+            self.log(f"持久化存储: 应用标识 {app_storage_id(params)}, "
+                     f"预缓存 {len(params.get('precache_urls', []))} 个地址（首次启动时预热）")
+    
+    def next_folder_number(self, pack_dir):
+        """输出目录中下一个编号文件夹的编号"""
+        if not os.path.isdir(pack_dir):
+            return 1
+        existing_folders = [d for d in os.listdir(pack_dir) if d.isdigit() and os.path.isdir(os.path.join(pack_dir, d))]
+        if existing_folders:
+            return max(int(folder) for folder in existing_folders) + 1
+        return 1
+    
+    def create_numbered_folder(self, pack_dir):
+        """在输出目录中创建下一个编号文件夹"""
+        os.makedirs(pack_dir, exist_ok=True)
+        
+        # 查找已存在的编号文件夹，确定下一个编号
+        next_number = self.next_folder_number(pack_dir)
+        
+        # 创建编号文件夹（并发构建时编号可能已被占用，顺延到下一个）
+        while True:
+            numbered_folder = os.path.join(pack_dir, str(next_number))
+            try:
+                os.makedirs(numbered_folder)
+                break
+            except FileExistsError:
+                next_number += 1
+        
+        self.log(f"创建软件文件夹: {numbered_folder}")
+        return numbered_folder
+    
+    def content_bytes(self, params, scan):
+        """打包的网页内容大小（记录到构建历史，用于试运行估算）"""
+        if params['mode'] == 'folder':
+            return scan['bytes']
+        if params['mode'] == 'file':
+            return os.path.getsize(params['source'])
+        return 0
+    
+    def prepare_icon(self, params, temp_dir):
+        """复制或转换应用图标到临时目录，返回ICO路径（没有图标时返回None）"""
+        if not params['icon_path'] or not os.path.exists(params['icon_path']):
+            return None
+        
+        icon_file = os.path.join(temp_dir, "icon.ico")
+        icon_ext = os.path.splitext(params['icon_path'])[1].lower()
+        if icon_ext == '.ico':
+            shutil.copy2(params['icon_path'], icon_file)
+        else:
+            # 转换其他格式为ICO
+            self.convert_to_ico(params['icon_path'], icon_file)
+        return icon_file if os.path.exists(icon_file) else None
+    
+    def content_folder(self, numbered_folder, name):
+        """多个应用共用编号文件夹时，创建应用网页内容的子目录（不与exe或其他应用的目录同名）"""
+        folder = os.path.join(numbered_folder, f"{name}_content")
+        number = 2
+        while os.path.exists(folder):
+            folder = os.path.join(numbered_folder, f"{name}_content_{number}")
+            number += 1
+        os.makedirs(folder)
+        return folder
+    
+    def mirror_content(self, params, numbered_folder, scan):
+        """复制网页内容到编号文件夹（便于用户查看）"""
+        if params['mode'] == 'file':
+            html_file_name = os.path.basename(params['source'])
+            shutil.copy2(params['source'], os.path.join(numbered_folder, html_file_name))
+        elif params['mode'] == 'folder':
+            workers = params.get('copy_workers') or default_workers()
+            stats = copy_selected(params['source'], os.path.join(numbered_folder, "web_content"),
+                                  scan['files'], workers, scan['dirs'])
+            self.log(f"复制网页内容到输出目录: {format_copy_stats(stats)}")
+    
+    def create_from_template(self, params, numbered_folder, temp_dir, governor=None):
+        """使用模板启动器生成应用：复制启动器并追加配置、图标和资源包"""
+        from launcher import ensure_launcher, build_assets_archive, create_from_launcher
+        
+        self.log("模板启动器模式：精简模块、压缩方式和启动画面在启动器构建时确定，本次不生效")
+        launcher_path = ensure_launcher(self.log, governor)
+        self.progress(40, "生成应用")
+        
+        config = {
+            'app_id': app_storage_id(params),
+            'mode': params['mode'],
+            'title': params['window_title'],
+            'width': params['window_width'],
+            'height': params['window_height']
+        }
+        
+        # 准备网页资源
+        scan = None
+        assets = b''
+        if params['mode'] == 'url':
+            config['url'] = params['source']
+            if params.get('persistent_storage'):
+                config['persistent_storage'] = True
+                config['precache_urls'] = params.get('precache_urls', [])
+        elif params['mode'] == 'file':
+            html_file_name = os.path.basename(params['source'])
+            assets = build_assets_archive(os.path.dirname(params['source']), [html_file_name])
+            config['entry'] = html_file_name
+        else:
+            scan = self.scan_source_folder(params)
+            assets = build_assets_archive(params['source'], scan['files'])
+            config['entry'] = scan['entry']
+        params['content_bytes'] = self.content_bytes(params, scan)
+        
+        # 准备图标
+        icon = b''
+        icon_file = self.prepare_icon(params, temp_dir)
+        if icon_file:
+            with open(icon_file, 'rb') as f:
+                icon = f.read()
+        
+        output_name = params['window_title'].replace(' ', '_')
+        exe_path = os.path.join(numbered_folder, output_name + os.path.splitext(launcher_path)[1])
+        build_seconds = create_from_launcher(launcher_path, exe_path, config, icon, assets)
+        self.log(f"模板模式生成完成，用时 {build_seconds * 1000:.0f} ms, "
+                 f"附加数据 {(len(icon) + len(assets)) / 1024:.1f} KB")
+        self.log(f"生成的可执行文件: {exe_path}")
+        
+        self.progress(90, "测量构建结果")
+        metrics = self.report_build_metrics(params, exe_path, build_seconds)
+        self.write_build_delta(params, numbered_folder, exe_path, metrics)
+        self.mirror_content(params, numbered_folder, scan)
+        self.emit_built(params, exe_path)
+        self.log(f"软件已保存到: {numbered_folder}")
+        
+        return {
+            "exe_path": exe_path,
+            "output_dir": numbered_folder,
+            "build_seconds": build_seconds,
+            "metrics": metrics
+        }
+    
+    def create_batch(self, params_list):
+        """多变体构建：一个spec中共用Analysis/PYZ，为每个应用生成独立的EXE
+
+        变体间只有窗口参数、网页内容和图标不同，代码路径相同，
+        因此依赖分析和PYZ压缩只需进行一次。整个批次占用一个构建槽位。
+        """
+        self.log(f"开始批量打包 {len(params_list)} 个应用...")
+        self.preflight_batch(params_list)
+        
+        governor = BuildGovernor(params_list[0].get('resource_limits'), self.log)
+        self.log(f"资源限制: {governor.describe()}")
+        with governor.slot():
+            return self.build_batch(params_list, governor)
+    
+    def build_batch(self, params_list, governor):
+        """在资源限制下执行多变体构建"""
+        common = params_list[0]
+        temp_dir = governor.mkdtemp()
+        
+        try:
+            numbered_folder = self.create_numbered_folder(common['output_dir'])
+            
+            # 所有变体共用的应用代码
+            app_file = os.path.join(temp_dir, "app.py")
+            with open(app_file, 'w', encoding='utf-8') as f:
+                f.write(self.generate_variant_app_code())
+            
+            common = dict(common)
+            common['excludes'] = []
+            if common.get('module_profile') == 'lean':
+                profile = compute_lean_profile(app_file)
+                common['excludes'] = profile['excludes']
+                self.log(f"精简模块: 排除 {len(profile['excludes'])} 个模块")
+            
+            compression, warning = resolve_profile(common.get('compression', DEFAULT_COMPRESSION))
+            common['compression_options'] = compression
+            if warning:
+                self.log(warning)
+            
+            # 暂存每个变体的配置、网页内容和图标
+            self.progress(20, "准备网页内容")
+            variants = []
+            used_names = set()
+            for index, params in enumerate(params_list):
+                variant_dir = os.path.join(temp_dir, "variants", str(index))
+                os.makedirs(variant_dir, exist_ok=True)
+                self.preflight_url(params)
+                self.inline_source(params, variant_dir)
+                self.prepare_precache(params)
+                
+                output_name = params['window_title'].replace(' ', '_')
+                if output_name in used_names:
+                    output_name = f"{output_name}_{index + 1}"
+                used_names.add(output_name)
+                
+                variant_config = {
+                    'mode': params['mode'],
+                    'source': params['source'],
+                    'window_title': params['window_title'],
+                    'window_width': int(params['window_width']),
+                    'window_height': int(params['window_height'])
+                }
+                if params['mode'] == 'url' and params.get('persistent_storage'):
+                    variant_config['persistent_storage'] = True
+                    variant_config['app_id'] = app_storage_id(params)
+                    variant_config['precache_urls'] = params.get('precache_urls', [])
+                datas = []
+                scan = None
+                if params['mode'] == 'file':
+                    if not os.path.exists(params['source']):
+                        raise Exception(f"文件不存在: {params['source']}")
+                    variant_config['entry'] = os.path.basename(params['source'])
+                    datas.append((variant_config['entry'], params['source']))
+                elif params['mode'] == 'folder':
+                    if not os.path.exists(params['source']):
+                        raise Exception(f"文件夹不存在: {params['source']}")
+                    scan = self.scan_source_folder(params)
+                    variant_config['entry'] = scan['entry']
+                    governor.check_temp_space(temp_dir, scan['bytes'])
+                    content_dir = os.path.join(variant_dir, "web_content")
+                    workers = params.get('copy_workers') or default_workers()
+                    copy_selected(params['source'], content_dir, scan['files'], workers, scan['dirs'])
+                    datas.extend((rel_path, os.path.join(content_dir, rel_path)) for rel_path in scan['files'])
+                
+                config_file = os.path.join(variant_dir, "variant.json")
+                with open(config_file, 'w', encoding='utf-8') as f:
+                    json.dump(variant_config, f, ensure_ascii=False)
+                datas.insert(0, ("variant.json", config_file))
+                
+                variants.append({
+                    'params': params,
+                    'scan': scan,
+                    'output_name': output_name,
+                    'datas': datas,
+                    'icon': self.prepare_icon(params, variant_dir),
+                    'splash': prepare_splash(params.get('splash_image'), variant_dir)
+                })
+                self.log(f"变体 {index + 1}: {output_name} ({params['mode']}, {len(datas) - 1} 个数据文件)")
+            
+            # 检查临时空间：PyInstaller的构建输出
+            governor.check_temp_space(temp_dir, sum(self.estimated_exe_bytes(variant['params']) for variant in variants))
+            
+            spec_file = os.path.join(temp_dir, "app.spec")
+            with open(spec_file, 'w', encoding='utf-8') as f:
+                f.write(self.generate_multi_spec_file(common, variants))
+            
+            self.progress(50, "PyInstaller打包")
+            self.log(f"正在使用PyInstaller构建 {len(variants)} 个应用（共用一次依赖分析）...")
+            cmd = [
+                'pyinstaller',
+                '--noconfirm',
+                '--distpath', numbered_folder,
+                '--workpath', os.path.join(temp_dir, 'build'),
+            ]
+            cmd.extend(pyinstaller_args(compression))
+            cmd.append(spec_file)
+            
+            build_start = time.perf_counter()
+            result = governor.run(cmd, capture_output=True, text=True, cwd=temp_dir, env=build_env(compression))
+            build_seconds = time.perf_counter() - build_start
+            if result.returncode != 0:
+                raise Exception(f"PyInstaller打包失败: {result.stderr}")
+            
+            self.progress(90, "复制输出")
+            self.log(f"批量打包完成，总耗时 {build_seconds:.1f} 秒，平均每个应用 {build_seconds / len(variants):.1f} 秒")
+            
+            results = []
+            for variant in variants:
+                params = variant['params']
+                exe_path = os.path.join(numbered_folder, variant['output_name'] + ".exe")
+                if not os.path.exists(exe_path):
+                    exe_path = os.path.join(numbered_folder, variant['output_name'])
+                if os.path.exists(exe_path):
+                    self.log(f"生成的可执行文件: {exe_path} ({os.path.getsize(exe_path) / (1024 * 1024):.2f} MB)")
+                    self.write_build_delta(params, numbered_folder, exe_path, None)
+                
+                # 每个变体的网页内容放在 <应用名>_content 子目录中（非Windows平台的exe没有扩展名，不能与exe同名）
+                if params['mode'] in ('file', 'folder'):
+                    self.mirror_content(params, self.content_folder(numbered_folder, variant['output_name']),
+                                        variant['scan'])
+                
+                self.emit_built(params, exe_path)
+                results.append({"exe_path": exe_path, "output_dir": numbered_folder})
+            
+            self.log(f"软件已保存到: {numbered_folder}")
+            return {"results": results, "output_dir": numbered_folder, "build_seconds": build_seconds}
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def create_host(self, params_list, title):
+        """多站点宿主应用：一个exe中包含所有站点，启动后每个站点一个窗口
+
+        所有窗口共用一个Python运行时和一个webview进程，本地站点的文件按内容去重后只打包一份，
+        运行时由宿主应用内的本地服务器提供。图标、启动画面、压缩方式和模块精简配置使用第一个站点的设置。
+        """
+        self.log(f"开始构建多站点宿主应用: {title}（{len(params_list)} 个站点）")
+        self.preflight_batch(params_list)
+        
+        governor = BuildGovernor(params_list[0].get('resource_limits'), self.log)
+        self.log(f"资源限制: {governor.describe()}")
+        with governor.slot():
+            return self.build_host(params_list, title, governor)
+    
+    def build_host(self, params_list, title, governor):
+        """在资源限制下构建多站点宿主应用"""
+        host = dict(params_list[0])
+        host['window_title'] = title
+        # 宿主应用的标识由所有站点决定（用于构建历史和差异更新）
+        host['original_mode'] = 'host'
+        host['original_source'] = "|".join(app_storage_id(params) for params in params_list)
+        temp_dir = governor.mkdtemp()
+        
+        try:
+            numbered_folder = self.create_numbered_folder(host['output_dir'])
+            if host.get('build_mode') == 'template':
+                self.log("多站点宿主应用不支持模板启动器模式，使用PyInstaller打包")
+                host['build_mode'] = 'pyinstaller'
+            
+            app_file = os.path.join(temp_dir, "app.py")
+            with open(app_file, 'w', encoding='utf-8') as f:
+                f.write(self.generate_host_app_code())
+            
+            host['excludes'] = []
+            if host.get('module_profile') == 'lean':
+                profile = compute_lean_profile(app_file)
+                host['excludes'] = profile['excludes']
+                self.log(f"精简模块: 排除 {len(profile['excludes'])} 个模块")
+            
+            compression, warning = resolve_profile(host.get('compression', DEFAULT_COMPRESSION))
+            host['compression_options'] = compression
+            if warning:
+                self.log(warning)
+            
+            # 收集每个站点的配置和网页内容
+            self.progress(20, "准备网页内容")
+            sites = []
+            site_files = []
+            scans = []
+            for index, params in enumerate(params_list):
+                site_dir = os.path.join(temp_dir, "sites", str(index))
+                os.makedirs(site_dir, exist_ok=True)
+                self.preflight_url(params)
+                self.inline_source(params, site_dir)
+                self.prepare_precache(params)
+                
+                site = {
+                    'mode': params['mode'],
+                    'source': params['source'],
+                    'window_title': params['window_title'],
+                    'window_width': int(params['window_width']),
+                    'window_height': int(params['window_height'])
+                }
+                files = []
+                scan = None
+                if params['mode'] == 'url':
+                    if params.get('persistent_storage'):
+                        site['precache_urls'] = params.get('precache_urls', [])
+                        host['persistent_storage'] = True
+                elif params['mode'] == 'file':
+                    if not os.path.exists(params['source']):
+                        raise Exception(f"文件不存在: {params['source']}")
+                    site['entry'] = os.path.basename(params['source'])
+                    files.append((site['entry'], params['source']))
+                else:
+                    if not os.path.exists(params['source']):
+                        raise Exception(f"文件夹不存在: {params['source']}")
+                    scan = self.scan_source_folder(params)
+                    site['entry'] = scan['entry']
+                    files.extend((rel_path, os.path.join(params['source'], rel_path)) for rel_path in scan['files'])
+                sites.append(site)
+                site_files.append(files)
+                scans.append(scan)
+                self.log(f"站点 {index + 1}: {params['window_title']} ({params['mode']}, {len(files)} 个文件)")
+            
+            # 所有站点的文件按内容去重，每份内容只打包一次
+            dedup = dedup_assets(site_files)
+            self.log(format_dedup_stats(dedup))
+            for site, mapping in zip(sites, dedup['sites']):
+                if site['mode'] != 'url':
+                    site['files'] = mapping
+            host['content_bytes'] = dedup['unique_bytes']
+            
+            manifest = {'sites': sites}
+            if host.get('persistent_storage'):
+                manifest['persistent_storage'] = True
+                manifest['app_id'] = app_storage_id(host)
+                self.log(f"持久化存储: 所有站点共用宿主应用的存储目录（应用标识 {manifest['app_id']}）")
+            manifest_file = os.path.join(temp_dir, HOST_MANIFEST)
+            with open(manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            datas = [(HOST_MANIFEST, manifest_file)]
+            datas.extend((f"{BLOB_DIR}/{blob}", src) for blob, src in dedup['blobs'])
+            
+            host['icon_file'] = self.prepare_icon(host, temp_dir)
+            host['splash_file'] = prepare_splash(host.get('splash_image'), temp_dir)
+            
+            # 检查临时空间：PyInstaller的构建输出（网页内容不暂存）
+            governor.check_temp_space(temp_dir, self.estimated_exe_bytes(host))
+            
+            spec_file = os.path.join(temp_dir, "app.spec")
+            with open(spec_file, 'w', encoding='utf-8') as f:
+                f.write(self.generate_host_spec_file(host, datas))
+            
+            self.progress(50, "PyInstaller打包")
+            self.log("正在使用PyInstaller打包...")
+            cmd = [
+                'pyinstaller',
+                '--noconfirm',
+                '--distpath', numbered_folder,
+                '--workpath', os.path.join(temp_dir, 'build'),
+            ]
+            cmd.extend(pyinstaller_args(compression))
+            cmd.append(spec_file)
+            
+            build_start = time.perf_counter()
+            result = governor.run(cmd, capture_output=True, text=True, cwd=temp_dir, env=build_env(compression))
+            build_seconds = time.perf_counter() - build_start
+            if result.returncode != 0:
+                raise Exception(f"PyInstaller打包失败: {result.stderr}")
+            
+            output_name = title.replace(' ', '_')
+            exe_path = os.path.join(numbered_folder, f"{output_name}.exe")
+            if not os.path.exists(exe_path) and os.path.exists(os.path.join(numbered_folder, output_name)):
+                exe_path = os.path.join(numbered_folder, output_name)
+            self.log(f"生成的可执行文件: {exe_path}")
+            
+            # 启动画面和应用窗口的出现耗时由多窗口测量代替
+            self.progress(90, "测量构建结果")
+            metrics = self.report_build_metrics(dict(host, splash_file=None), exe_path, build_seconds)
+            self.write_build_delta(host, numbered_folder, exe_path, metrics)
+            self.compare_host_launch(params_list, numbered_folder, exe_path, metrics)
+            
+            # 每个本地站点的网页内容放在 <站点名>_content 子目录中（不与宿主应用的exe同名）
+            for params, scan in zip(params_list, scans):
+                if params['mode'] != 'url':
+                    self.mirror_content(params, self.content_folder(numbered_folder, params['window_title'].replace(' ', '_')),
+                                        scan)
+                self.emit_built(params, exe_path)
+            
+            self.log(f"软件已保存到: {numbered_folder}")
+            return {"exe_path": exe_path, "output_dir": numbered_folder, "build_seconds": build_seconds, "metrics": metrics}
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def compare_host_launch(self, params_list, numbered_folder, exe_path, metrics):
+        """测量宿主应用打开所有窗口的耗时和内存占用，并与同时运行各站点单独构建的exe对比"""
+        titles = [params['window_title'] for params in params_list]
+        host_launch = measure_launch([exe_path], titles)
+        if host_launch is None:
+            self.log("多窗口启动耗时和内存占用的测量仅支持Windows")
+            return None
+        self.log(f"宿主应用: {format_launch(host_launch)}")
+        
+        # 各站点最近一次单独构建（单独打包或批量打包）的exe
+        separate_exes = []
+        for params in params_list:
+            _, previous_exe = self.find_previous_build(os.path.dirname(numbered_folder), numbered_folder,
+                                                       app_storage_id(params))
+            if previous_exe:
+                separate_exes.append(previous_exe)
+        
+        comparison = {'host': host_launch, 'separate': None}
+        if len(separate_exes) < len(params_list):
+            self.log(f"有 {len(params_list) - len(separate_exes)} 个站点没有单独构建的exe，无法与单独运行对比")
+        else:
+            separate_launch = measure_launch(separate_exes, titles)
+            self.log(f"单独运行: {format_launch(separate_launch)}")
+            self.log(format_launch_comparison(host_launch, separate_launch))
+            comparison['separate'] = separate_launch
+        
+        if metrics is not None:
+            metrics["host_launch"] = comparison
+        return comparison
+    
+    def emit_built(self, params, exe_path):
+        """发送应用构建完成事件（来源为用户选择的原始来源）"""
+        self.emit('built',
+                  source=params.get('original_source', params['source']),
+                  mode=params.get('original_mode', params['mode']),
+                  exe_path=exe_path)
+    
+    def find_previous_build(self, pack_dir, numbered_folder, app_id):
+        """在输出目录中查找同一应用最近一次构建（编号小于当前文件夹），返回 (文件夹, exe路径)"""
+        current = int(os.path.basename(numbered_folder))
+        folders = [int(d) for d in os.listdir(pack_dir)
+                   if d.isdigit() and int(d) < current and os.path.isdir(os.path.join(pack_dir, d))]
+        for number in sorted(folders, reverse=True):
+            folder = os.path.join(pack_dir, str(number))
+            try:
+                with open(os.path.join(folder, BUILD_INFO_FILE), 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for app in info.get("apps", []):
+                exe_path = os.path.join(folder, app.get("exe", ""))
+                if app.get("app_id") == app_id and os.path.isfile(exe_path):
+                    return folder, exe_path
+        return None, None
+    
+    def write_build_delta(self, params, numbered_folder, exe_path, metrics):
+        """记录构建信息（build_info.json），并生成相对同一应用上一次构建的差异包和应用工具"""
+        app_id = app_storage_id(params)
+        app = {
+            "app_id": app_id,
+            "title": params['window_title'],
+            "exe": os.path.basename(exe_path),
+            "exe_size": os.path.getsize(exe_path),
+            "timestamp": time.time()
+        }
+        
+        previous_folder, previous_exe = self.find_previous_build(os.path.dirname(numbered_folder), numbered_folder, app_id)
+        if previous_exe:
+            delta_name = f"{app['exe']}.from-{os.path.basename(previous_folder)}.delta"
+            stats = create_delta_file(previous_exe, exe_path, os.path.join(numbered_folder, delta_name))
+            applier = copy_applier(numbered_folder)
+            self.log(f"相对第 {os.path.basename(previous_folder)} 次构建: {format_delta_stats(stats)}")
+            if applier:
+                self.log(f"  应用差异包: python {APPLIER_NAME} apply <旧版本exe> {delta_name} <新版本exe>")
+            else:
+                self.log(f"  未找到差异包应用工具 delta.py，未复制 {APPLIER_NAME} 到输出目录")
+            app["delta"] = {
+                "from": os.path.basename(previous_folder),
+                "file": delta_name,
+                "bytes": stats['delta_bytes'],
+                "seconds": round(stats['seconds'], 2)
+            }
+            if metrics is not None:
+                metrics["delta_bytes"] = stats['delta_bytes']
+                metrics["delta_seconds"] = round(stats['seconds'], 2)
+        
+        # 批量打包时多个应用共用一个编号文件夹
+        info_file = os.path.join(numbered_folder, BUILD_INFO_FILE)
+        info = {"apps": []}
+        if os.path.exists(info_file):
+            with open(info_file, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        info["apps"].append(app)
+        with open(info_file, 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=2, ensure_ascii=False)
+        return app
+    
+    def report_build_metrics(self, params, exe_path, build_seconds):
+        """记录并报告exe体积、构建耗时和启动耗时（启用measure_startup时运行生成的exe测量）"""
+        if not os.path.exists(exe_path):
+            return None
+        
+        entry = {
+            "title": params['window_title'],
+            "mode": params.get('original_mode', params['mode']),
+            "source": params.get('original_source', params['source']),
+            "inline_single_file": bool(params.get('inline_single_file')),
+            "module_profile": params.get('module_profile', 'default'),
+            "compression": params.get('compression_options', {}).get('name', params.get('compression', DEFAULT_COMPRESSION)),
+            "build_mode": params.get('build_mode', 'pyinstaller'),
+            "content_bytes": params.get('content_bytes', 0),
+            "exe_size": os.path.getsize(exe_path),
+            "build_seconds": round(build_seconds, 2),
+            "timestamp": time.time()
+        }
+        
+        startup = measure_startup(exe_path) if params.get('measure_startup') else None
+        if startup:
+            entry["import_ms"] = round(startup['import_ms'], 1)
+            entry["startup_ms"] = round(startup['total_ms'], 1)
+        
+        message = f"exe体积: {entry['exe_size'] / (1024 * 1024):.2f} MB, 构建耗时: {build_seconds:.1f} 秒"
+        if startup:
+            message += f", 导入耗时: {entry['import_ms']:.0f} ms, 启动耗时: {entry['startup_ms']:.0f} ms"
+        self.log(message)
+        
+        # 启动画面：测量启动画面和应用窗口出现的耗时
+        if params.get('splash_file'):
+            times = measure_window_times(exe_path, params['window_title'])
+            if times:
+                for key in ('splash_ms', 'window_ms'):
+                    entry[key] = round(times[key], 1) if times[key] is not None else None
+                self.log(format_window_times(times))
+            else:
+                self.log("启动画面和窗口出现耗时的测量仅支持Windows")
+        
+        # 与同一来源最近一次默认配置构建对比
+        if entry["module_profile"] != "default":
+            for previous in list(self.history):
+                if (previous.get("source") == entry["source"] and previous.get("mode") == entry["mode"]
+                        and previous.get("module_profile", "default") == "default"
+                        and previous.get("compression", DEFAULT_COMPRESSION) == entry["compression"]
+                        and previous.get("build_mode", "pyinstaller") == entry["build_mode"]):
+                    size_delta = entry["exe_size"] - previous["exe_size"]
+                    compare = f"相比默认构建: 体积 {size_delta / (1024 * 1024):+.2f} MB"
+                    if "import_ms" in entry and "import_ms" in previous:
+                        compare += f", 导入耗时 {entry['import_ms'] - previous['import_ms']:+.0f} ms"
+                    self.log(compare)
+                    break
+            else:
+                self.log("没有找到该应用的默认构建记录，无法对比")
+        
+        self.record_history(entry)
+        return entry
+    
+    def generate_app_code(self, params):
+        """生成应用代码"""
+        # 使用启动画面时，页面加载完成后关闭
+        splash_code = splash_close_code() if params.get('splash_image') else ""
+        
+        if params['mode'] == 'url' and params.get('persistent_storage'):
+            # 持久化存储：重复启动时复用Cookie、本地存储和HTTP缓存，首次启动时预热预缓存列表
+            content = f"""#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+_start_time = time.perf_counter()
+import webview
+{precache_code()}
+
+if __name__ == "__main__":
+{probe_code()}
+    app_id = {app_storage_id(params)!r}
+    precache_urls = {params.get('precache_urls', [])!r}
+{storage_code()}
+    window = webview.create_window(
+        '{params['window_title']}',
+        '{params['source']}',
+        width={params['window_width']},
+        height={params['window_height']},
+        text_select=True,
+        confirm_close=False
+    )
+{splash_code}
+    webview.start(warm_cache, (window, storage_path, precache_urls), private_mode=False, storage_path=storage_path)
+"""
+        elif params['mode'] == 'url':
+            content = f"""#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+_start_time = time.perf_counter()
+import webview
+
+if __name__ == "__main__":
+{probe_code()}
+    window = webview.create_window(
+        '{params['window_title']}',
+        '{params['source']}',
+        width={params['window_width']},
+        height={params['window_height']},
+        text_select=True,
+        confirm_close=False
+    )
+{splash_code}
+    webview.start()
+"""
+        else:
+            # 对于文件和文件夹模式，需要先复制文件到临时目录
+            content = f"""#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+_start_time = time.perf_counter()
+import webview
+
+if __name__ == "__main__":
+{probe_code()}
+    # 获取资源路径
+    if getattr(sys, 'frozen', False):
+        # 打包后的可执行文件
+        resource_path = sys._MEIPASS
+    else:
+        # 开发环境
+        resource_path = os.path.dirname(os.path.abspath(__file__))
+    
+    # 根据模式确定要加载的文件
+    """
+            
+            if params['mode'] == 'file':
+                content += f"""
+    # 文件模式 - 直接加载HTML文件
+    html_file = os.path.join(resource_path, '{os.path.basename(params['source'])}')
+    """
+            elif params.get('entry_file'):
+                content += f"""
+    # 文件夹模式 - 加载入口页面
+    html_file = os.path.join(resource_path, {params['entry_file']!r})
+    """
+            else:  # folder模式
+                content += f"""
+    # 文件夹模式 - 查找HTML文件
+    html_files = [f for f in os.listdir(resource_path) if f.lower().endswith(('.html', '.htm'))]
+    if html_files:
+        html_file = os.path.join(resource_path, html_files[0])
+    else:
+        print("未找到HTML文件")
+        sys.exit(1)
+    """
+            
+            content += f"""
+    
+    # 创建窗口 - 使用文件协议加载本地HTML文件
+    window = webview.create_window(
+        '{params['window_title']}',
+        f"file://{{html_file}}",
+        width={params['window_width']},
+        height={params['window_height']},
+        text_select=True,
+        confirm_close=False
+    )
+{splash_code}
+    webview.start()
+"""
+        
+        return content
+    
+    def generate_analysis_block(self, params, script='app.py'):
+        """生成spec文件中的Analysis和PYZ部分"""
+        return f"""# -*- mode: python ; coding: utf-8 -*-
+
+block_cipher = None
+
+
+a = Analysis(
+    [{script!r}],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={{}},
+    runtime_hooks=[],
+    excludes={params.get('excludes', [])!r},
+    win_no_prefer_redirects=False,
+    win_private_assemblies=False,
+    cipher=block_cipher,
+    noarchive=False,
+)
+
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+"""
+    
+    def generate_exe_block(self, exe_var, datas_expr, name, icon, compression, splash_var=None):
+        """生成spec文件中的EXE部分（splash_var为Splash目标的变量名）"""
+        icon_line = f"    icon={icon!r},\n" if icon else ""
+        splash_lines = f"    {splash_var},\n    {splash_var}.binaries,\n" if splash_var else ""
+        return f"""
+{exe_var} = EXE(
+    pyz,
+{splash_lines}    a.scripts,
+    a.binaries,
+    a.zipfiles,
+    {datas_expr},
+    [],
+    name={name!r},
+    debug=False,
+    bootloader_ignore_signals=False,
+{spec_exe_options(compression)}    runtime_tmpdir=None,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+{icon_line})
+"""
+    
+    def generate_spec_file(self, params, temp_dir, scan=None):
+        """生成PyInstaller spec文件"""
+        compression = params.get('compression_options') or resolve_profile(params.get('compression', DEFAULT_COMPRESSION))[0]
+        
+        spec_content = self.generate_analysis_block(params)
+        
+        # 添加数据文件
+        if params['mode'] == 'file':
+            spec_content += f"""
+a.datas += [({os.path.basename(params['source'])!r}, {params['source']!r}, 'DATA')]
+"""
+        elif params['mode'] == 'folder':
+            # 添加文件夹中未被排除的内容
+            if scan is None:
+                scan = scan_folder(params['source'], PackIgnore.from_folder(params['source'], params.get('ignore_patterns')))
+            for rel_path in scan['files']:
+                # 引用暂存目录中的文件
+                full_path = os.path.join(temp_dir, "web_content", rel_path)
+                spec_content += f"a.datas += [({rel_path!r}, {full_path!r}, 'DATA')]\n"
+        
+        # 添加图标（图标转换失败时不引用）
+        icon = 'icon.ico' if params.get('icon_file') else None
+        
+        # 添加启动画面
+        splash_var = None
+        if params.get('splash_file'):
+            splash_var = 'splash'
+            spec_content += spec_splash_block(splash_var, params['splash_file'])
+        
+        spec_content += self.generate_exe_block('exe', 'a.datas', params['window_title'].replace(' ', '_'), icon,
+                                                compression, splash_var)
+        
+        return spec_content
+    
+    def generate_variant_app_code(self):
+        """生成多变体构建共用的应用代码（窗口参数从打包的variant.json读取）"""
+        return f"""#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+_start_time = time.perf_counter()
+import webview
+{precache_code()}
+
+if __name__ == "__main__":
+{probe_code()}
+    # 获取资源路径
+    if getattr(sys, 'frozen', False):
+        resource_path = sys._MEIPASS
+    else:
+        resource_path = os.path.dirname(os.path.abspath(__file__))
+    
+    # 读取本变体的配置
+    with open(os.path.join(resource_path, 'variant.json'), 'r', encoding='utf-8') as f:
+        variant = json.load(f)
+    
+    if variant['mode'] == 'url':
+        url = variant['source']
+    else:
+        url = "file://" + os.path.join(resource_path, variant['entry'])
+    
+    window = webview.create_window(
+        variant['window_title'],
+        url,
+        width=variant['window_width'],
+        height=variant['window_height'],
+        text_select=True,
+        confirm_close=False
+    )
+{splash_close_code()}
+    if variant.get('persistent_storage'):
+        app_id = variant['app_id']
+{storage_code('        ')}
+        webview.start(warm_cache, (window, storage_path, variant.get('precache_urls', [])),
+                      private_mode=False, storage_path=storage_path)
+    else:
+        webview.start()
+"""
+    
+    def generate_multi_spec_file(self, params, variants):
+        """生成多变体spec文件：共用一个Analysis/PYZ，每个变体一个EXE"""
+        compression = params.get('compression_options') or resolve_profile(params.get('compression', DEFAULT_COMPRESSION))[0]
+        
+        spec_content = self.generate_analysis_block(params)
+        for index, variant in enumerate(variants):
+            datas = ",\n    ".join(f"({dest!r}, {src!r}, 'DATA')" for dest, src in variant['datas'])
+            spec_content += f"""
+variant_{index}_datas = [
+    {datas},
+]
+"""
+            splash_var = None
+            if variant.get('splash'):
+                splash_var = f"splash_{index}"
+                spec_content += spec_splash_block(splash_var, variant['splash'], f"a.datas + variant_{index}_datas")
+            spec_content += self.generate_exe_block(f"exe_{index}", f"a.datas + variant_{index}_datas",
+                                                    variant['output_name'], variant['icon'], compression, splash_var)
+        
+        return spec_content
+    
+    def generate_host_app_code(self):
+        """生成多站点宿主应用的代码（站点配置从打包的host.json读取，每个站点一个窗口，共用一次webview.start）"""
+        return f"""#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import sys
+import json
+import time
+_start_time = time.perf_counter()
+import webview
+from urllib.parse import quote
+{precache_code()}
+{host_server_code()}
+
+if __name__ == "__main__":
+{probe_code()}
+    # 获取资源路径
+    if getattr(sys, 'frozen', False):
+        resource_path = sys._MEIPASS
+    else:
+        resource_path = os.path.dirname(os.path.abspath(__file__))
+    
+    with open(os.path.join(resource_path, {HOST_MANIFEST!r}), 'r', encoding='utf-8') as f:
+        host = json.load(f)
+    
+    # 先创建所有窗口，再启动一次事件循环
+    servers = []
+    windows = []
+    for site in host['sites']:
+        if site['mode'] == 'url':
+            url = site['source']
+        else:
+            server = serve_site(resource_path, site['files'])
+            servers.append(server)
+            url = f"http://127.0.0.1:{{server.server_address[1]}}/" + quote(site['entry'])
+        windows.append(webview.create_window(
+            site['window_title'],
+            url,
+            width=site['window_width'],
+            height=site['window_height'],
+            text_select=True,
+            confirm_close=False
+        ))
+    
+    window = windows[0]
+{splash_close_code()}
+    if host.get('persistent_storage'):
+        app_id = host['app_id']
+{storage_code('        ')}
+        webview.start(warm_all, (windows, storage_path, host['sites']), private_mode=False, storage_path=storage_path)
+    else:
+        webview.start()
+"""
+    
+    def generate_host_spec_file(self, params, datas):
+        """生成多站点宿主应用的spec文件（站点配置和去重后的资源作为数据文件）"""
+        compression = params.get('compression_options') or resolve_profile(params.get('compression', DEFAULT_COMPRESSION))[0]
+        
+        spec_content = self.generate_analysis_block(params)
+        entries = ",\n    ".join(f"({dest!r}, {src!r}, 'DATA')" for dest, src in datas)
+        spec_content += f"""
+host_datas = [
+    {entries},
+]
+"""
+        splash_var = None
+        if params.get('splash_file'):
+            splash_var = 'splash'
+            spec_content += spec_splash_block(splash_var, params['splash_file'], "a.datas + host_datas")
+        spec_content += self.generate_exe_block('exe', "a.datas + host_datas", params['window_title'].replace(' ', '_'),
+                                                params.get('icon_file'), compression, splash_var)
+        
+        return spec_content
+    
+    def convert_to_ico(self, input_path, output_path):
+        """将图片转换为ICO格式"""
+        try:
+            from PIL import Image
+            
+            with Image.open(input_path) as img:
+                # 转换为RGBA模式（如果需要）
+                if img.mode != 'RGBA':
+                    img = img.convert('RGBA')
+                
+                # 调整尺寸为ICO标准尺寸
+                sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
+                
+                # 创建不同尺寸的图标
+                ico_images = []
+                for size in sizes:
+                    resized_img = img.resize(size, Image.Resampling.LANCZOS)
+                    ico_images.append(resized_img)
+                
+                # 保存为ICO
+                ico_images[0].save(output_path, format='ICO', sizes=[(img.width, img.height) for img in ico_images])
+                
+            self.log(f"图标转换完成: {input_path} -> {output_path}")
+        except Exception as e:
+            self.log(f"图标转换失败: {str(e)}")
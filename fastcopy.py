@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 并行文件复制
+"""
+
+import os
+import sys
+import shutil
+import time
+
+# 单次复制的缓冲区大小（8MB）
+COPY_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def default_workers():
+    """默认的复制线程数（复制以I/O等待为主，线程数可以大于CPU核数）"""
+    return min(32, (os.cpu_count() or 4) * 4)
+
+
+def fast_copy_file(src, dst, buffer_size=COPY_BUFFER_SIZE):
+    """复制单个文件，优先使用内核级零拷贝接口，返回复制的字节数"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = 0
+
+        # Linux: copy_file_range 可在内核中直接完成复制（部分文件系统支持reflink）
+        if hasattr(os, 'copy_file_range') and size > 0:
+            try:
+                while copied < size:
+                    sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), min(buffer_size, size - copied))
+                    if sent == 0:
+                        break
+                    copied += sent
+            except OSError:
+                # 跨文件系统等情况不支持，回退到普通复制
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                copied = 0
+
+        # Linux: sendfile 支持普通文件作为输出
+        if copied == 0 and size > 0 and sys.platform.startswith('linux') and hasattr(os, 'sendfile'):
+            try:
+                while copied < size:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), copied, min(buffer_size, size - copied))
+                    if sent == 0:
+                        break
+                    copied += sent
+                fsrc.seek(copied)
+            except OSError:
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                copied = 0
+
+        # 其余平台（含Windows）：使用大缓冲区的普通读写
+        if copied < size or size == 0:
+            fsrc.seek(copied)
+            fdst.seek(copied)
+            shutil.copyfileobj(fsrc, fdst, buffer_size)
+            copied = size
+
+    shutil.copystat(src, dst)
+    return copied
+
+
+def copy_files(pairs, workers=None, buffer_size=COPY_BUFFER_SIZE, extra_dirs=()):
+    """并行复制文件列表
+
+    pairs 为 (源路径, 目标路径) 列表，extra_dirs 为需要额外创建的目录（如空目录）。
+    返回复制统计信息：{'files', 'bytes', 'seconds'}
+    """
+    pairs = list(pairs)
+    workers = workers or default_workers()
+    start = time.perf_counter()
+
+    # 预先统一创建目标目录，避免各线程重复调用makedirs
+    target_dirs = {os.path.dirname(dst) for _, dst in pairs}
+    target_dirs.update(extra_dirs)
+    for directory in sorted(d for d in target_dirs if d):
+        os.makedirs(directory, exist_ok=True)
+
+    total_bytes = 0
+    if len(pairs) <= 1 or workers <= 1:
+        for src, dst in pairs:
+            total_bytes += fast_copy_file(src, dst, buffer_size)
+    else:
+        # 延迟导入，避免拖慢打包工具启动
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(pairs))) as executor:
+            futures = [executor.submit(fast_copy_file, src, dst, buffer_size) for src, dst in pairs]
+            for future in futures:
+                # 任意文件复制失败时抛出首个异常
+                total_bytes += future.result()
+
+    return {
+        'files': len(pairs),
+        'bytes': total_bytes,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def copy_tree(src_dir, dst_dir, workers=None, buffer_size=COPY_BUFFER_SIZE):
+    """并行复制整个目录（目标目录已存在时合并覆盖），返回复制统计信息"""
+    pairs = []
+    dirs = [dst_dir]
+    for root, dirnames, files in os.walk(src_dir):
+        rel_root = os.path.relpath(root, src_dir)
+        target_root = dst_dir if rel_root == '.' else os.path.join(dst_dir, rel_root)
+        for dirname in dirnames:
+            dirs.append(os.path.join(target_root, dirname))
+        for file in files:
+            pairs.append((os.path.join(root, file), os.path.join(target_root, file)))
+
+    return copy_files(pairs, workers, buffer_size, extra_dirs=dirs)
+
+
+def copy_selected(src_dir, dst_dir, rel_files, workers=None, rel_dirs=(), buffer_size=COPY_BUFFER_SIZE):
+    """按相对路径列表并行复制文件（用于应用排除规则后的文件集合）"""
+    pairs = [(os.path.join(src_dir, rel), os.path.join(dst_dir, rel)) for rel in rel_files]
+    dirs = [dst_dir] + [os.path.join(dst_dir, rel) for rel in rel_dirs]
+    return copy_files(pairs, workers, buffer_size, extra_dirs=dirs)
+
+
+def format_copy_stats(stats):
+    """格式化复制统计信息"""
+    seconds = max(stats['seconds'], 1e-6)
+    mb = stats['bytes'] / (1024 * 1024)
+    return (f"{stats['files']} 个文件, {mb:.2f} MB, 用时 {stats['seconds']:.2f} 秒, "
+            f"{mb / seconds:.1f} MB/s, {stats['files'] / seconds:.0f} 文件/秒")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 构建资源控制（并发构建数、进程优先级、内存和时间限制、临时空间检查）
+"""
+
+import os
+import sys
+import time
+import shutil
+import signal
+import tempfile
+import subprocess
+from contextlib import contextmanager
+
+# 默认资源限制（0表示不限制）
+DEFAULT_RESOURCE_LIMITS = {
+    "max_concurrent_builds": 0,
+    "nice": 0,
+    "ionice_class": 0,
+    "ionice_level": 4,
+    "memory_limit_mb": 0,
+    "build_timeout": 0,
+    "min_free_temp_mb": 0
+}
+
+# 构建槽位锁文件目录（跨进程共享，同一台机器上的多个打包工具进程共用并发限制）
+SLOT_DIR = os.path.join(os.path.expanduser("~"), ".webpackager", "slots")
+
+# 等待构建槽位时的轮询间隔（秒）
+SLOT_POLL_INTERVAL = 0.5
+
+
+class ResourceLimitError(Exception):
+    """构建因资源限制失败（reason为触发的限制）"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def _try_lock(f):
+    """非阻塞地锁定文件，成功返回True"""
+    try:
+        if sys.platform.startswith('win'):
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class BuildGovernor:
+    """限制PyInstaller构建占用的资源
+
+    limits 为资源限制字典（键见 DEFAULT_RESOURCE_LIMITS），未提供的键使用默认值。
+    """
+
+    def __init__(self, limits=None, log=print):
+        self.limits = dict(DEFAULT_RESOURCE_LIMITS)
+        self.limits.update(limits or {})
+        self.log = log
+
+    @contextmanager
+    def slot(self):
+        """占用一个构建槽位，超过最大并发构建数时等待（跨进程生效）"""
+        max_builds = int(self.limits["max_concurrent_builds"] or 0)
+        if max_builds <= 0:
+            yield None
+            return
+
+        os.makedirs(SLOT_DIR, exist_ok=True)
+        waited = False
+        start = time.perf_counter()
+        while True:
+            for index in range(max_builds):
+                f = open(os.path.join(SLOT_DIR, f"slot-{index}.lock"), 'a+')
+                if _try_lock(f):
+                    break
+                f.close()
+            else:
+                if not waited:
+                    self.log(f"已有 {max_builds} 个构建在运行，等待空闲的构建槽位...")
+                    waited = True
+                time.sleep(SLOT_POLL_INTERVAL)
+                continue
+            break
+
+        if waited:
+            self.log(f"获得构建槽位，等待 {time.perf_counter() - start:.1f} 秒")
+        try:
+            yield index
+        finally:
+            # 关闭文件即释放锁
+            f.close()
+
+    def check_temp_space(self, path=None, required_bytes=0):
+        """检查临时目录所在磁盘的可用空间，不足时抛出ResourceLimitError"""
+        path = path or tempfile.gettempdir()
+        free = shutil.disk_usage(path).free
+        needed = int(self.limits["min_free_temp_mb"] or 0) * 1024 * 1024 + required_bytes
+        if free < needed:
+            raise ResourceLimitError(
+                "disk",
+                f"临时目录空间不足: {path} 可用 {free / (1024 * 1024):.0f} MB, 需要 {needed / (1024 * 1024):.0f} MB"
+            )
+        return free
+
+    def mkdtemp(self, required_bytes=0):
+        """检查可用空间后创建临时工作目录（内容大小确定后再用check_temp_space检查所需空间）"""
+        self.check_temp_space(required_bytes=required_bytes)
+        return tempfile.mkdtemp()
+
+    def _wrap_command(self, cmd):
+        """Linux上使用ionice降低子进程的I/O优先级"""
+        ionice_class = int(self.limits["ionice_class"] or 0)
+        if ionice_class and sys.platform.startswith('linux') and shutil.which('ionice'):
+            cmd = ['ionice', '-c', str(ionice_class)] + (
+                ['-n', str(self.limits["ionice_level"])] if ionice_class == 2 else []) + list(cmd)
+        return cmd
+
+    def _preexec(self):
+        """在子进程中（exec之前）设置优先级和内存限制"""
+        nice = int(self.limits["nice"] or 0)
+        memory_mb = int(self.limits["memory_limit_mb"] or 0)
+
+        def apply_limits():
+            if nice > 0:
+                os.nice(nice)
+            if memory_mb > 0:
+                import resource
+                limit = memory_mb * 1024 * 1024
+                resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+        return apply_limits if nice > 0 or memory_mb > 0 else None
+
+    def run(self, cmd, **kwargs):
+        """在资源限制下运行构建命令（参数同subprocess.run），触发限制时抛出ResourceLimitError"""
+        timeout = float(self.limits["build_timeout"] or 0) or None
+        memory_mb = int(self.limits["memory_limit_mb"] or 0)
+
+        if sys.platform.startswith('win'):
+            if int(self.limits["nice"] or 0) > 0:
+                kwargs['creationflags'] = kwargs.get('creationflags', 0) | subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        else:
+            kwargs['preexec_fn'] = self._preexec()
+
+        try:
+            result = subprocess.run(self._wrap_command(cmd), timeout=timeout, **kwargs)
+        except subprocess.TimeoutExpired:
+            raise ResourceLimitError("timeout", f"构建超过时间限制（{timeout:.0f} 秒），已终止")
+
+        if result.returncode != 0 and memory_mb > 0 and not sys.platform.startswith('win'):
+            output = (result.stderr or '') if isinstance(result.stderr, str) else ''
+            killed = result.returncode in (-signal.SIGKILL, -signal.SIGSEGV)
+            if killed or 'MemoryError' in output or 'Cannot allocate memory' in output:
+                raise ResourceLimitError("memory", f"构建超过内存限制（{memory_mb} MB），已终止")
+        return result
+
+    def describe(self):
+        """当前生效的限制"""
+        limits = self.limits
+        parts = []
+        if limits["max_concurrent_builds"]:
+            parts.append(f"最大并发构建 {limits['max_concurrent_builds']}")
+        if limits["nice"]:
+            parts.append(f"nice {limits['nice']}")
+        if limits["ionice_class"]:
+            parts.append(f"ionice 类别 {limits['ionice_class']}")
+        if limits["memory_limit_mb"]:
+            if sys.platform.startswith('win'):
+                parts.append(f"内存 {limits['memory_limit_mb']} MB（Windows上不生效）")
+            else:
+                parts.append(f"内存 {limits['memory_limit_mb']} MB")
+        if limits["build_timeout"]:
+            parts.append(f"超时 {limits['build_timeout']} 秒")
+        if limits["min_free_temp_mb"]:
+            parts.append(f"临时空间额外保留 {limits['min_free_temp_mb']} MB")
+        return ", ".join(parts) if parts else "不限制"
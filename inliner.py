@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 单文件内联（将CSS、JS、字体和图片内联到入口HTML中）
+"""
+
+import os
+import re
+import base64
+import posixpath
+import mimetypes
+
+from asset_graph import resolve_reference
+
+# 默认的二进制资源（图片、字体）内联阈值
+DEFAULT_INLINE_THRESHOLD_KB = 256
+
+# mimetypes 未必包含的类型
+EXTRA_MIME_TYPES = {
+    '.woff': 'font/woff',
+    '.woff2': 'font/woff2',
+    '.ttf': 'font/ttf',
+    '.otf': 'font/otf',
+    '.eot': 'application/vnd.ms-fontobject',
+    '.svg': 'image/svg+xml',
+    '.webp': 'image/webp',
+    '.avif': 'image/avif',
+    '.ico': 'image/x-icon',
+    '.json': 'application/json',
+}
+
+LINK_TAG_RE = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+SCRIPT_SRC_RE = re.compile(r'<script\b([^>]*?)(?<![-\w:])src\s*=\s*(["\'])(.*?)\2([^>]*)>\s*</script\s*>', re.IGNORECASE | re.DOTALL)
+SCRIPT_BLOCK_RE = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+STYLE_BLOCK_RE = re.compile(r'(<style\b[^>]*>)(.*?)(</style\s*>)', re.IGNORECASE | re.DOTALL)
+MEDIA_TAG_RE = re.compile(r'<(?:img|source|video|audio|input|image|use|track|embed)\b[^>]*>', re.IGNORECASE)
+# 属性名前不能是 - 或 :（避免把 data-src、xlink:href 等当作 src、href）
+STYLE_ATTR_RE = re.compile(r'((?<![-\w:])style\s*=\s*)(["\'])(.*?)\2', re.IGNORECASE | re.DOTALL)
+ATTR_RE_TEMPLATE = r'((?<![-\w:]){name}\s*=\s*)(["\'])(.*?)\2'
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""", re.IGNORECASE)
+CSS_IMPORT_RE = re.compile(r"""@import\s+(?:url\(\s*)?(['"])([^'"]+)\1\s*\)?\s*([^;]*);""", re.IGNORECASE)
+DEFER_ASYNC_RE = re.compile(r'(?:^|\s)(?:defer|async)(?=[\s=/]|$)', re.IGNORECASE)
+JS_MODULE_IMPORT_RE = re.compile(r"""\bimport\b\s*(?:[\w*{}\s,$]+\s*from\s*)?['"(]|\bexport\s*[\w*{}\s,$]*\s*from\s*['"]""")
+
+
+def _attr(tag, name):
+    """读取标签中的属性值"""
+    match = re.search(ATTR_RE_TEMPLATE.format(name=re.escape(name)), tag, re.IGNORECASE | re.DOTALL)
+    return match.group(3) if match else None
+
+
+def mime_type(path):
+    """根据扩展名推断MIME类型"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in EXTRA_MIME_TYPES:
+        return EXTRA_MIME_TYPES[ext]
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+class Inliner:
+    """把入口HTML及其引用的本地资源合并为单个HTML文件"""
+
+    def __init__(self, folder, entry, threshold_kb=DEFAULT_INLINE_THRESHOLD_KB, files=None):
+        self.folder = folder
+        self.entry = entry.replace(os.sep, '/')
+        self.threshold = threshold_kb * 1024
+        if files is None:
+            files = []
+            for root, _, names in os.walk(folder):
+                for name in names:
+                    rel = os.path.relpath(os.path.join(root, name), folder).replace(os.sep, '/')
+                    files.append(rel)
+        self.files = set(files)
+        self.inlined = set()
+        self.skipped = {}
+
+    def _resolve(self, ref, from_rel):
+        target = resolve_reference(ref, from_rel, self.files)
+        if target is None:
+            return None
+        if target not in self.files:
+            self.skipped[target] = "文件不存在"
+            return None
+        return target
+
+    def _read_text(self, rel_path):
+        with open(os.path.join(self.folder, rel_path), 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    def _data_uri(self, ref, from_rel):
+        """将二进制资源转换为data URI，超过阈值时返回None（保持原引用）"""
+        target = self._resolve(ref, from_rel)
+        if target is None:
+            return None
+        path = os.path.join(self.folder, target)
+        if os.path.getsize(path) > self.threshold:
+            self.skipped[target] = "超过内联阈值"
+            return None
+        with open(path, 'rb') as f:
+            data = base64.b64encode(f.read()).decode('ascii')
+        self.inlined.add(target)
+        return f"data:{mime_type(target)};base64,{data}"
+
+    def _rebase(self, ref, from_rel):
+        """未内联的引用改为相对于入口页面（CSS被合并到入口页面后，原来相对于CSS文件的路径不再成立）"""
+        if posixpath.dirname(from_rel) == posixpath.dirname(self.entry) or ref.strip().startswith('/'):
+            return ref
+        target = resolve_reference(ref, from_rel, self.files)
+        if target is None:
+            return ref
+        suffix = ref.strip()[len(ref.strip().split('#')[0].split('?')[0]):]
+        return posixpath.relpath(target, posixpath.dirname(self.entry) or '.') + suffix
+
+    def inline_css(self, css, from_rel, depth=0):
+        """内联CSS中的@import和url()资源，url()相对于各自所在的CSS文件解析"""
+        imports = []
+
+        def replace_import(match):
+            target = self._resolve(match.group(2), from_rel)
+            if target is None or depth > 10:
+                # 保留@import，路径改为相对于入口页面
+                start, end = match.start(2) - match.start(), match.end(2) - match.start()
+                text = match.group(0)
+                imports.append(text[:start] + self._rebase(match.group(2), from_rel) + text[end:])
+            else:
+                self.inlined.add(target)
+                imported = self.inline_css(self._read_text(target), target, depth + 1)
+                media = match.group(3).strip()
+                imports.append(f"@media {media} {{\n{imported}\n}}" if media else imported)
+            # 先用占位符替换，避免被导入的内容再次按当前文件的路径解析url()
+            return f"\0IMPORT{len(imports) - 1}\0"
+
+        def replace_url(match):
+            uri = self._data_uri(match.group(2), from_rel)
+            if uri:
+                return f'url("{uri}")'
+            ref = self._rebase(match.group(2), from_rel)
+            return match.group(0) if ref == match.group(2) else f'url("{ref}")'
+
+        css = CSS_IMPORT_RE.sub(replace_import, css)
+        css = CSS_URL_RE.sub(replace_url, css)
+        for index, imported in enumerate(imports):
+            css = css.replace(f"\0IMPORT{index}\0", imported)
+        return css
+
+    def _replace_attr(self, tag, name, from_rel):
+        pattern = re.compile(ATTR_RE_TEMPLATE.format(name=re.escape(name)), re.IGNORECASE | re.DOTALL)
+
+        def replace(match):
+            if name in ('srcset', 'imagesrcset'):
+                candidates = []
+                for candidate in match.group(3).split(','):
+                    parts = candidate.strip().split(None, 1)
+                    if not parts:
+                        continue
+                    uri = self._data_uri(parts[0], from_rel)
+                    if uri:
+                        parts[0] = uri
+                    candidates.append(' '.join(parts))
+                return f'{match.group(1)}{match.group(2)}{", ".join(candidates)}{match.group(2)}'
+            uri = self._data_uri(match.group(3), from_rel)
+            if not uri:
+                return match.group(0)
+            return f'{match.group(1)}{match.group(2)}{uri}{match.group(2)}'
+
+        return pattern.sub(replace, tag)
+
+    def inline_html(self):
+        """生成内联后的HTML文本"""
+        html = self._read_text(self.entry)
+        entry = self.entry
+
+        def replace_link(match):
+            tag = match.group(0)
+            rel = (_attr(tag, 'rel') or '').lower()
+            href = _attr(tag, 'href')
+            if not href:
+                return tag
+            if 'stylesheet' in rel:
+                target = self._resolve(href, entry)
+                if target is None:
+                    return tag
+                self.inlined.add(target)
+                css = self.inline_css(self._read_text(target), target)
+                media = _attr(tag, 'media')
+                media_attr = f' media="{media}"' if media else ''
+                return f"<style{media_attr}>\n{css}\n</style>"
+            if 'icon' in rel or 'preload' in rel or 'apple-touch-icon' in rel:
+                return self._replace_attr(tag, 'href', entry)
+            return tag
+
+        def replace_script(match):
+            target = self._resolve(match.group(3), entry)
+            if target is None:
+                return match.group(0)
+            attrs = (match.group(1) + match.group(4)).rstrip()
+            if 'module' not in attrs.lower() and DEFER_ASYNC_RE.search(attrs):
+                # 内联的普通脚本忽略defer/async，会在页面解析完成前执行
+                self.skipped[target] = "defer/async脚本"
+                return match.group(0)
+            js = self._read_text(target)
+            if 'module' in attrs.lower() and JS_MODULE_IMPORT_RE.search(js):
+                # 含有import的ES模块依赖其他文件的相对路径，无法直接内联
+                self.skipped[target] = "ES模块包含import"
+                return match.group(0)
+            self.inlined.add(target)
+            js = re.sub(r'</script', r'<\\/script', js, flags=re.IGNORECASE)
+            return f"<script{attrs}>\n{js}\n</script>"
+
+        def replace_style_block(match):
+            return match.group(1) + self.inline_css(match.group(2), entry) + match.group(3)
+
+        def replace_media(match):
+            tag = match.group(0)
+            for name in ('src', 'poster', 'srcset', 'href', 'xlink:href'):
+                tag = self._replace_attr(tag, name, entry)
+            return tag
+
+        def replace_style_attr(match):
+            css = self.inline_css(match.group(3), entry)
+            quote = match.group(2)
+            if quote == '"':
+                css = css.replace('"', "'")
+            return f"{match.group(1)}{quote}{css}{quote}"
+
+        def replace_outside_scripts(text):
+            # 先处理原有的<style>，内联的样式表不再重复处理
+            text = STYLE_BLOCK_RE.sub(replace_style_block, text)
+            text = LINK_TAG_RE.sub(replace_link, text)
+            text = MEDIA_TAG_RE.sub(replace_media, text)
+            return STYLE_ATTR_RE.sub(replace_style_attr, text)
+
+        # 脚本内容（包括内联的脚本）中的字符串不按HTML标签处理
+        parts = []
+        position = 0
+        for match in SCRIPT_BLOCK_RE.finditer(html):
+            parts.append(replace_outside_scripts(html[position:match.start()]))
+            parts.append(SCRIPT_SRC_RE.sub(replace_script, match.group(0)))
+            position = match.end()
+        parts.append(replace_outside_scripts(html[position:]))
+        return ''.join(parts)
+
+
+def inline_to_file(folder, entry, output_path, threshold_kb=DEFAULT_INLINE_THRESHOLD_KB, files=None):
+    """内联入口页面并写入output_path，返回报告
+
+    报告字典：inlined（已内联的文件）、skipped（未内联的文件及原因）、
+    original_bytes（入口页面及已内联文件的原始大小）、output_bytes（生成文件大小）
+    """
+    inliner = Inliner(folder, entry, threshold_kb, files)
+    html = inliner.inline_html()
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    original_bytes = os.path.getsize(os.path.join(folder, inliner.entry))
+    for rel_path in inliner.inlined:
+        original_bytes += os.path.getsize(os.path.join(folder, rel_path))
+
+    return {
+        'inlined': sorted(inliner.inlined),
+        'skipped': inliner.skipped,
+        'original_bytes': original_bytes,
+        'output_bytes': os.path.getsize(output_path),
+    }
+
+
+def format_inline_report(report):
+    """格式化内联报告"""
+    return (f"内联 {len(report['inlined'])} 个资源（减少 {len(report['inlined'])} 次文件加载）, "
+            f"原始 {report['original_bytes'] / 1024:.1f} KB -> 单文件 {report['output_bytes'] / 1024:.1f} KB, "
+            f"未内联 {len(report['skipped'])} 个")
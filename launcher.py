@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 模板启动器
+
+每个运行环境只用PyInstaller构建一次通用启动器，之后每个应用只需复制启动器，
+并在文件末尾追加配置（以及可选的图标和网页资源压缩包）即可生成，无需再次运行PyInstaller。
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import struct
+import zipfile
+import shutil
+import hashlib
+import tempfile
+import subprocess
+
+from fastcopy import fast_copy_file
+from module_profile import probe_code
+from app_cache import storage_code, precache_code
+
+# 附加数据尾部结构：魔数、配置长度、图标长度、资源包长度
+PAYLOAD_MAGIC = b'WPKPAYL1'
+TRAILER_FORMAT = '<8sQQQ'
+TRAILER_SIZE = struct.calcsize(TRAILER_FORMAT)
+
+LAUNCHER_NAME = "launcher"
+
+# 通用启动器代码：读取自身末尾的附加数据，按配置加载网页
+LAUNCHER_CODE = f"""#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import sys
+import io
+import json
+import time
+import struct
+import zipfile
+_start_time = time.perf_counter()
+import webview
+{precache_code()}
+
+PAYLOAD_MAGIC = {PAYLOAD_MAGIC!r}
+TRAILER_FORMAT = {TRAILER_FORMAT!r}
+TRAILER_SIZE = struct.calcsize(TRAILER_FORMAT)
+
+
+def read_payload(path):
+    # 从可执行文件末尾读取配置，返回 (配置, 图标位置, 资源包位置)，位置为 (偏移, 长度)
+    with open(path, 'rb') as f:
+        f.seek(0, 2)
+        file_size = f.tell()
+        f.seek(file_size - TRAILER_SIZE)
+        magic, config_len, icon_len, assets_len = struct.unpack(TRAILER_FORMAT, f.read(TRAILER_SIZE))
+        if magic != PAYLOAD_MAGIC:
+            return None, (0, 0), (0, 0)
+        start = file_size - TRAILER_SIZE - config_len - icon_len - assets_len
+        f.seek(start)
+        config = json.loads(f.read(config_len).decode('utf-8'))
+    return config, (start + config_len, icon_len), (start + config_len + icon_len, assets_len)
+
+
+def read_range(path, position):
+    with open(path, 'rb') as f:
+        f.seek(position[0])
+        return f.read(position[1])
+
+
+def cache_dir(config):
+    # 资源解压到按内容哈希区分的持久目录，再次启动时无需重新解压
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'WebPackagerApps', config['app_id'], config.get('assets_hash', 'none'))
+
+
+if __name__ == "__main__":
+{probe_code()}
+    exe_path = sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__)
+    config, icon, assets = read_payload(exe_path)
+    if config is None:
+        print("启动器中没有应用配置")
+        sys.exit(1)
+
+    # 仅在首次启动（或内容变化）时读取并解压资源
+    target_dir = cache_dir(config)
+    if (assets[1] or icon[1]) and not os.path.exists(os.path.join(target_dir, '.complete')):
+        os.makedirs(target_dir, exist_ok=True)
+        if assets[1]:
+            with zipfile.ZipFile(io.BytesIO(read_range(exe_path, assets))) as archive:
+                archive.extractall(target_dir)
+        if icon[1]:
+            with open(os.path.join(target_dir, 'icon.ico'), 'wb') as f:
+                f.write(read_range(exe_path, icon))
+        with open(os.path.join(target_dir, '.complete'), 'w') as f:
+            f.write('ok')
+
+    if config['mode'] == 'url':
+        url = config['url']
+    else:
+        url = 'file://' + os.path.join(target_dir, config['entry'])
+
+    window = webview.create_window(
+        config['title'],
+        url,
+        width=config['width'],
+        height=config['height'],
+        text_select=True,
+        confirm_close=False
+    )
+
+    start_args = ()
+    start_options = {{}}
+    if config.get('persistent_storage'):
+        app_id = config['app_id']
+{storage_code('        ')}
+        start_args = (warm_cache, (window, storage_path, config.get('precache_urls', [])))
+        start_options = {{'private_mode': False, 'storage_path': storage_path}}
+
+    icon_path = os.path.join(target_dir, 'icon.ico')
+    if icon[1] and os.path.exists(icon_path):
+        try:
+            webview.start(*start_args, icon=icon_path, **start_options)
+        except TypeError:
+            webview.start(*start_args, **start_options)
+    else:
+        webview.start(*start_args, **start_options)
+"""
+
+
+def runtime_key():
+    """启动器的运行环境标识（Python、pywebview、PyInstaller版本及启动器代码）"""
+    from importlib.metadata import version, PackageNotFoundError
+
+    parts = [sys.version.split()[0], sys.platform]
+    for package in ('pywebview', 'pyinstaller'):
+        try:
+            parts.append(f"{package}-{version(package)}")
+        except PackageNotFoundError:
+            parts.append(f"{package}-none")
+    parts.append(hashlib.sha256(LAUNCHER_CODE.encode('utf-8')).hexdigest()[:12])
+    return "_".join(parts)
+
+
+def launcher_cache_dir():
+    """通用启动器的缓存目录"""
+    return os.path.join(os.path.expanduser("~"), ".webpackager", "launchers")
+
+
+def launcher_exe_name():
+    """当前平台的启动器文件名"""
+    return LAUNCHER_NAME + (".exe" if sys.platform.startswith("win") else "")
+
+
+def ensure_launcher(log=print, governor=None):
+    """返回当前运行环境的通用启动器路径，不存在时使用PyInstaller构建一次
+
+    提供governor（BuildGovernor）时，构建在其资源限制下运行。
+    """
+    target_dir = os.path.join(launcher_cache_dir(), runtime_key())
+    launcher_path = os.path.join(target_dir, launcher_exe_name())
+    if os.path.exists(launcher_path):
+        log(f"使用已缓存的模板启动器: {launcher_path}")
+        return launcher_path
+
+    log("当前运行环境没有模板启动器，正在使用PyInstaller构建（仅需一次）...")
+    work_dir = governor.mkdtemp() if governor else tempfile.mkdtemp()
+    try:
+        script = os.path.join(work_dir, LAUNCHER_NAME + ".py")
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(LAUNCHER_CODE)
+
+        cmd = [
+            'pyinstaller',
+            '--noconfirm',
+            '--onefile',
+            '--windowed',
+            '--name', LAUNCHER_NAME,
+            '--distpath', target_dir,
+            '--workpath', os.path.join(work_dir, 'build'),
+            '--specpath', work_dir,
+            script
+        ]
+        run = governor.run if governor else subprocess.run
+        result = run(cmd, capture_output=True, text=True, cwd=work_dir)
+        if result.returncode != 0:
+            raise Exception(f"模板启动器构建失败: {result.stderr}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    log(f"模板启动器构建完成: {launcher_path}")
+    return launcher_path
+
+
+def build_assets_archive(source_dir, rel_files):
+    """将网页资源打包为zip（内存中），返回字节串"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for rel_path in rel_files:
+            archive.write(os.path.join(source_dir, rel_path), rel_path)
+    return buffer.getvalue()
+
+
+def build_payload(config, icon=b'', assets=b''):
+    """组装追加到启动器末尾的数据"""
+    config = dict(config)
+    config['assets_hash'] = hashlib.sha256(icon + assets).hexdigest()[:16]
+    config_bytes = json.dumps(config, ensure_ascii=False).encode('utf-8')
+    trailer = struct.pack(TRAILER_FORMAT, PAYLOAD_MAGIC, len(config_bytes), len(icon), len(assets))
+    return config_bytes + icon + assets + trailer
+
+
+def create_from_launcher(launcher_path, output_path, config, icon=b'', assets=b''):
+    """复制启动器并追加应用数据，返回耗时（秒）"""
+    start = time.perf_counter()
+    fast_copy_file(launcher_path, output_path)
+    with open(output_path, 'ab') as f:
+        f.write(build_payload(config, icon, assets))
+    return time.perf_counter() - start
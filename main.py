@@ -8,16 +8,25 @@ import os
 import sys
 import json
 import tempfile
-import shutil
 import threading
 import time
-import webbrowser
-from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import webview
-import requests
-from PIL import Image, ImageTk
+# webbrowser、PIL等较重的模块在首次使用时再导入，以加快启动
+from packignore import PackIgnore, DEFAULT_IGNORE_PATTERNS, scan_folder, parse_patterns
+from inliner import DEFAULT_INLINE_THRESHOLD_KB
+from url_preflight import normalize_url
+from governor import DEFAULT_RESOURCE_LIMITS
+from splash import SPLASH_EXTENSIONS
+from compression import COMPRESSION_PROFILES, DEFAULT_COMPRESSION
+from engine import PackagingEngine, DEFAULT_PARAMS
+from ui_tasks import BackgroundIO, LoopWatchdog, DEFAULT_STALL_THRESHOLD_MS
+from path_index import PathIndex
+from planner import format_plan
+from multisite import DEFAULT_HOST_TITLE
+
+# 每次填充到文件夹结构中的条目数
+TREE_FILL_BATCH = 2000
 
 class WebPackager:
     def __init__(self):
@@ -32,25 +41,31 @@ class WebPackager:
         except:
             pass
         
-        # 加载配置文件
+        # 配置文件在主窗口显示之后再加载，先使用默认配置
         self.config_file = os.path.join(os.path.dirname(__file__), "config.json")
-        self.user_config = self.load_user_config()
+        self.user_config = self.default_user_config()
+        self.config_loaded = False
+        
+        # 打包引擎：界面只负责收集参数和显示事件
+        self.engine = PackagingEngine(self.user_config.setdefault("build_history", []))
+        self.engine.subscribe(self.on_engine_event)
+        
+        # 文件和目录操作在后台线程执行，避免阻塞界面；事件循环卡顿时记录到日志
+        self.io = BackgroundIO(self.root)
+        self.watchdog = LoopWatchdog(self.root, log=self.log)
+        self.tree_generation = 0
         
         self.setup_ui()
         
+        # 首次绘制完成后再加载配置和文件夹结构
+        self.root.after_idle(lambda: self.root.after(0, self.load_startup_config))
+        
         # 打包参数
-        self.pack_params = {
-            'mode': 'url',
-            'source': '',
-            'window_title': '我的网页应用',
-            'window_width': 1024,
-            'window_height': 768,
-            'output_dir': '',
-            'icon_path': ''
-        }
+        self.pack_params = dict(DEFAULT_PARAMS)
         
         # 状态变量
         self.is_packaging = False
+        self.preview_server = None
         
     def setup_ui(self):
         """设置用户界面"""
@@ -119,13 +134,53 @@ class WebPackager:
         self.tree_frame.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
         self.tree_frame.columnconfigure(0, weight=1)
         
+        # 按文件名、路径片段或通配符查找文件
+        search_frame = ttk.Frame(self.tree_frame)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        search_frame.columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="查找文件:").grid(row=0, column=0, sticky=tk.W)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.on_search_change())
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(5, 0))
+        search_entry.bind("<Return>", lambda e: self.select_search_result(0))
+        self.search_status_var = tk.StringVar()
+        ttk.Label(search_frame, textvariable=self.search_status_var).grid(row=0, column=2, sticky=tk.W, padx=(5, 0))
+        
         self.tree = ttk.Treeview(self.tree_frame, height=8, show="tree")
-        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         tree_scroll = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.tree.yview)
-        tree_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        tree_scroll.grid(row=1, column=1, sticky=(tk.N, tk.S))
         self.tree.configure(yscrollcommand=tree_scroll.set)
         
+        # 查找结果（有查找内容时显示），双击或回车选中
+        self.search_list = tk.Listbox(self.tree_frame, height=6)
+        self.search_list.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.search_list.bind("<Double-Button-1>", lambda e: self.select_search_result())
+        self.search_list.bind("<Return>", lambda e: self.select_search_result())
+        self.search_list.grid_remove()
+        
+        # 选择HTML文件作为入口页面
+        self.tree_paths = {}
+        self.tree_nodes = {}
+        self.path_index = None
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.entry_var = tk.StringVar()
+        entry_frame = ttk.Frame(self.tree_frame)
+        entry_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
+        entry_frame.columnconfigure(3, weight=1)
+        ttk.Label(entry_frame, text="入口文件:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(entry_frame, textvariable=self.entry_var).grid(row=0, column=1, columnspan=3, sticky=tk.W, padx=(5, 0))
+        
+        # 按入口页面的引用关系精简打包内容
+        self.shake_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(entry_frame, text="仅打包入口页面引用到的资源",
+                        variable=self.shake_var).grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        ttk.Label(entry_frame, text="始终包含:").grid(row=1, column=2, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        self.allow_var = tk.StringVar()
+        ttk.Entry(entry_frame, textvariable=self.allow_var).grid(row=1, column=3, sticky=(tk.W, tk.E), padx=(5, 0), pady=(5, 0))
+        
         self.tree_frame.grid_remove()  # 初始隐藏
         
         # 参数设置
@@ -160,6 +215,65 @@ class WebPackager:
         ttk.Entry(params_frame, textvariable=self.output_var).grid(row=3, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
         ttk.Button(params_frame, text="选择...", command=self.browse_output).grid(row=3, column=2, padx=(5, 0), pady=2)
         
+        # 复制线程数（0表示自动）
+        ttk.Label(params_frame, text="复制线程数:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        self.copy_workers_var = tk.StringVar(value="0")
+        ttk.Entry(params_frame, textvariable=self.copy_workers_var, width=10).grid(row=4, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        ttk.Label(params_frame, text="(0为自动)").grid(row=4, column=2, sticky=tk.W, padx=(5, 0), pady=2)
+        
+        # 排除规则（gitignore风格，逗号分隔，文件夹中的.packignore会追加到其后）
+        ttk.Label(params_frame, text="排除规则:").grid(row=5, column=0, sticky=tk.W, pady=2)
+        self.ignore_var = tk.StringVar(value=", ".join(DEFAULT_IGNORE_PATTERNS))
+        ttk.Entry(params_frame, textvariable=self.ignore_var).grid(row=5, column=1, columnspan=3, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
+        
+        # 模块精简和启动耗时测量（测量时会运行生成的exe）
+        profile_frame = ttk.Frame(params_frame)
+        profile_frame.grid(row=6, column=0, columnspan=4, sticky=tk.W, pady=2)
+        self.lean_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(profile_frame, text="精简模块（排除生成应用不需要的模块，减小exe体积、加快启动）",
+                        variable=self.lean_var).pack(side=tk.LEFT)
+        self.measure_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(profile_frame, text="构建后测量启动耗时",
+                        variable=self.measure_var).pack(side=tk.LEFT, padx=(20, 0))
+        
+        # 压缩方式
+        ttk.Label(params_frame, text="压缩方式:").grid(row=7, column=0, sticky=tk.W, pady=2)
+        self.compression_var = tk.StringVar(value=DEFAULT_COMPRESSION)
+        ttk.Combobox(params_frame, textvariable=self.compression_var, values=list(COMPRESSION_PROFILES.keys()),
+                     state="readonly", width=8).grid(row=7, column=1, sticky=tk.W, padx=(5, 0), pady=2)
+        self.compression_label = ttk.Label(params_frame, text=COMPRESSION_PROFILES[DEFAULT_COMPRESSION]['label'])
+        self.compression_label.grid(row=7, column=2, columnspan=2, sticky=tk.W, padx=(5, 0), pady=2)
+        self.compression_var.trace_add("write", lambda *args: self.compression_label.config(
+            text=COMPRESSION_PROFILES.get(self.compression_var.get(), {}).get('label', '')))
+        
+        # 模板启动器模式
+        self.template_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(params_frame, text="模板启动器模式（复用预构建的启动器，无需每次运行PyInstaller）",
+                        variable=self.template_var).grid(row=8, column=0, columnspan=4, sticky=tk.W, pady=2)
+        
+        # 单文件内联（CSS、JS、字体和图片内联到入口页面，超过阈值的资源保持为独立文件）
+        self.inline_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(params_frame, text="内联为单个HTML文件",
+                        variable=self.inline_var).grid(row=9, column=0, columnspan=2, sticky=tk.W, pady=2)
+        ttk.Label(params_frame, text="内联阈值(KB):").grid(row=9, column=2, sticky=tk.W, padx=(20, 0), pady=2)
+        self.inline_threshold_var = tk.StringVar(value=str(DEFAULT_INLINE_THRESHOLD_KB))
+        ttk.Entry(params_frame, textvariable=self.inline_threshold_var, width=10).grid(row=9, column=3, sticky=tk.W, padx=(5, 0), pady=2)
+        
+        # 持久化存储和预缓存（网页URL模式）
+        self.persistent_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(params_frame, text="持久化浏览器存储（网页URL模式，重复启动时复用Cookie、本地存储和缓存）",
+                        variable=self.persistent_var).grid(row=10, column=0, columnspan=4, sticky=tk.W, pady=2)
+        ttk.Label(params_frame, text="预缓存清单:").grid(row=11, column=0, sticky=tk.W, pady=2)
+        self.precache_var = tk.StringVar()
+        ttk.Entry(params_frame, textvariable=self.precache_var).grid(row=11, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
+        ttk.Button(params_frame, text="选择...", command=self.browse_precache).grid(row=11, column=2, padx=(5, 0), pady=2)
+        
+        # 启动画面（单文件应用解压期间显示）
+        ttk.Label(params_frame, text="启动画面:").grid(row=12, column=0, sticky=tk.W, pady=2)
+        self.splash_var = tk.StringVar()
+        ttk.Entry(params_frame, textvariable=self.splash_var).grid(row=12, column=1, sticky=(tk.W, tk.E), padx=(5, 0), pady=2)
+        ttk.Button(params_frame, text="选择...", command=self.browse_splash).grid(row=12, column=2, padx=(5, 0), pady=2)
+        
         params_frame.columnconfigure(1, weight=1)
         
         # 进度显示
@@ -191,6 +305,11 @@ class WebPackager:
         self.pack_btn = ttk.Button(button_frame, text="开始打包", command=self.start_packaging)
         self.pack_btn.pack(side=tk.LEFT, padx=(0, 10))
         
+        ttk.Button(button_frame, text="试运行", command=self.start_dry_run).pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.batch_btn = ttk.Button(button_frame, text="批量打包...", command=self.start_batch_packaging)
+        self.batch_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
         ttk.Button(button_frame, text="清除日志", command=self.clear_log).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="退出", command=self.root.quit).pack(side=tk.LEFT)
         
@@ -199,8 +318,20 @@ class WebPackager:
         
         self.log("网页打包工具已启动，请选择打包模式并配置参数。")
         
-        # 加载上次的用户配置
+    def load_startup_config(self):
+        """主窗口显示后在后台线程读取配置文件"""
+        self.io.submit(self.load_user_config, on_done=self.apply_startup_config)
+        
+    def apply_startup_config(self, config):
+        """配置文件读取完成后加载上次的用户配置和最近使用菜单，并开始监测界面卡顿"""
+        self.user_config = config
+        self.config_loaded = True
+        # 构建历史由打包引擎就地更新，随配置一起保存
+        self.engine.history = self.user_config.setdefault("build_history", [])
         self.load_last_config()
+        self.load_recent_sources()
+        self.watchdog.threshold_ms = self.user_config.get("ui_stall_threshold_ms", DEFAULT_STALL_THRESHOLD_MS)
+        self.watchdog.start()
         
     def load_last_config(self):
         """加载上次的用户配置"""
@@ -220,7 +351,7 @@ class WebPackager:
             self.source_var.set(last_source)
             
             # 如果是文件夹模式，加载文件夹结构
-            if last_source_mode == "folder" and os.path.exists(last_source):
+            if last_source_mode == "folder":
                 self.load_folder_structure(last_source)
                 
             self.log(f"加载最近使用记录: 模式={last_source_mode}, 源文件={last_source}")
@@ -231,6 +362,37 @@ class WebPackager:
         last_output_dir = self.user_config.get("last_output_dir", os.path.join(os.path.dirname(__file__), "Pack"))
         self.output_var.set(last_output_dir)
         
+        # 设置复制线程数
+        self.copy_workers_var.set(str(self.user_config.get("copy_workers", 0)))
+        
+        # 设置排除规则
+        self.ignore_var.set(", ".join(self.user_config.get("ignore_patterns", DEFAULT_IGNORE_PATTERNS)))
+        
+        # 设置模块精简
+        self.lean_var.set(self.user_config.get("module_profile", "default") == "lean")
+        self.measure_var.set(self.user_config.get("measure_startup", False))
+        
+        # 设置压缩方式
+        self.compression_var.set(self.user_config.get("compression", DEFAULT_COMPRESSION))
+        
+        # 设置打包方式
+        self.template_var.set(self.user_config.get("build_mode", "pyinstaller") == "template")
+        
+        # 设置引用分析
+        self.shake_var.set(self.user_config.get("tree_shaking", False))
+        self.allow_var.set(", ".join(self.user_config.get("allow_patterns", [])))
+        
+        # 设置单文件内联
+        self.inline_var.set(self.user_config.get("inline_single_file", False))
+        self.inline_threshold_var.set(str(self.user_config.get("inline_threshold_kb", DEFAULT_INLINE_THRESHOLD_KB)))
+        
+        # 设置持久化存储和预缓存清单
+        self.persistent_var.set(self.user_config.get("persistent_storage", False))
+        self.precache_var.set(self.user_config.get("precache_manifest", ""))
+        
+        # 设置启动画面
+        self.splash_var.set(self.user_config.get("splash_image", ""))
+        
         # 设置窗口尺寸
         window_settings = self.user_config.get("window_settings", {})
         if window_settings:
@@ -291,6 +453,24 @@ class WebPackager:
         if file_path:
             self.icon_var.set(file_path)
     
+    def browse_splash(self):
+        """选择启动画面图片"""
+        file_path = filedialog.askopenfilename(
+            title="选择启动画面图片",
+            filetypes=[("图片文件", " ".join("*" + ext for ext in SPLASH_EXTENSIONS)), ("所有文件", "*.*")]
+        )
+        if file_path:
+            self.splash_var.set(file_path)
+    
+    def browse_precache(self):
+        """选择预缓存清单（每行一个地址）"""
+        file_path = filedialog.askopenfilename(
+            title="选择预缓存清单",
+            filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")]
+        )
+        if file_path:
+            self.precache_var.set(file_path)
+    
     def browse_output(self):
         """选择输出目录"""
         folder_path = filedialog.askdirectory(title="选择输出目录")
@@ -298,26 +478,111 @@ class WebPackager:
             self.output_var.set(folder_path)
     
     def load_folder_structure(self, folder_path):
-        """加载文件夹结构"""
+        """加载文件夹结构（在后台线程扫描并建立路径索引，完成后在界面线程中填充）"""
         # 清空现有树结构
         for item in self.tree.get_children():
             self.tree.delete(item)
-        
-        def add_tree_items(parent, path):
-            try:
-                for item in sorted(os.listdir(path)):
-                    full_path = os.path.join(path, item)
-                    if os.path.isdir(full_path):
-                        node = self.tree.insert(parent, "end", text=item, values=["文件夹"])
-                        add_tree_items(node, full_path)
-                    else:
-                        self.tree.insert(parent, "end", text=item, values=["文件"])
-            except PermissionError:
-                pass
+        self.tree_paths = {}
+        self.tree_nodes = {}
+        self.path_index = None
+        self.entry_var.set("")
+        self.on_search_change()
+        
+        # 连续切换文件夹时只显示最后一次扫描的结果
+        self.tree_generation += 1
+        generation = self.tree_generation
+        self.io.submit(self.scan_folder_tree, folder_path, parse_patterns(self.ignore_var.get()),
+                       on_done=lambda result: self.fill_folder_tree(folder_path, result, generation),
+                       on_error=lambda e: self.log(f"读取文件夹结构失败: {e}"))
+    
+    def scan_folder_tree(self, folder_path, patterns):
+        """扫描文件夹（在后台线程中调用），返回 (按显示顺序排列的 [(相对路径, 是否为目录)], 文件路径索引)"""
+        if not os.path.isdir(folder_path):
+            raise Exception(f"文件夹不存在: {folder_path}")
+        scan = scan_folder(folder_path, PackIgnore.from_folder(folder_path, patterns))
+        entries = [(rel_path, True) for rel_path in scan['dirs']] + [(rel_path, False) for rel_path in scan['files']]
+        # 同一目录下的文件和子目录按名称排列
+        entries.sort(key=lambda entry: entry[0].split('/'))
+        return entries, PathIndex(rel_path for rel_path, is_dir in entries if not is_dir)
+    
+    def fill_folder_tree(self, folder_path, result, generation):
+        """将扫描结果分批填充到文件夹结构中（每批之间处理界面事件，大文件夹不会卡住界面）"""
+        if generation != self.tree_generation:
+            return
+        entries, self.path_index = result
+        self.on_search_change()
         
         root_node = self.tree.insert("", "end", text=folder_path, values=["根目录"])
-        add_tree_items(root_node, folder_path)
         self.tree.item(root_node, open=True)
+        self.tree_nodes = {"": root_node}
+        self.fill_tree_batch(entries, 0, generation)
+    
+    def fill_tree_batch(self, entries, start, generation):
+        """填充一批条目，未完成时安排下一批"""
+        if generation != self.tree_generation:
+            return
+        end = min(start + TREE_FILL_BATCH, len(entries))
+        for rel_path, is_dir in entries[start:end]:
+            parent, _, name = rel_path.rpartition('/')
+            node = self.tree.insert(self.tree_nodes[parent], "end", text=name, values=["文件夹" if is_dir else "文件"])
+            self.tree_nodes[rel_path] = node
+            if not is_dir:
+                self.tree_paths[node] = rel_path
+        if end < len(entries):
+            self.root.after(1, lambda: self.fill_tree_batch(entries, end, generation))
+    
+    def on_search_change(self):
+        """查找内容改变时更新查找结果"""
+        query = self.search_var.get().strip()
+        self.search_list.delete(0, tk.END)
+        if not query:
+            self.search_list.grid_remove()
+            self.search_status_var.set("")
+            return
+        
+        self.search_list.grid()
+        if self.path_index is None:
+            self.search_status_var.set("正在建立索引...")
+            return
+        start = time.perf_counter()
+        matches, total = self.path_index.search(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.search_list.insert(tk.END, *matches)
+        shown = f"，显示前 {len(matches)} 个" if total > len(matches) else ""
+        self.search_status_var.set(f"{total} 个匹配{shown}（{elapsed_ms:.0f} ms）")
+    
+    def select_search_result(self, index=None):
+        """在文件夹结构中定位查找结果，HTML文件同时设为入口页面"""
+        if index is None:
+            selection = self.search_list.curselection()
+            if not selection:
+                return
+            index = selection[0]
+        if index >= self.search_list.size():
+            return
+        rel_path = self.search_list.get(index)
+        
+        is_html = rel_path.lower().endswith(('.html', '.htm'))
+        node = self.tree_nodes.get(rel_path)
+        if node:
+            # 选中HTML文件时由on_tree_select设为入口页面
+            self.tree.see(node)
+            self.tree.selection_set(node)
+        elif is_html:
+            # 文件夹结构尚未填充完成
+            self.entry_var.set(rel_path)
+            self.log(f"已选择入口文件: {rel_path}")
+        if not is_html:
+            self.log(f"已定位文件: {rel_path}（入口文件需为HTML文件）")
+    
+    def on_tree_select(self, event=None):
+        """在文件夹结构中选择HTML文件作为入口页面"""
+        for item in self.tree.selection():
+            rel_path = self.tree_paths.get(item)
+            if rel_path and rel_path.lower().endswith(('.html', '.htm')):
+                self.entry_var.set(rel_path)
+                self.log(f"已选择入口文件: {rel_path}")
+                break
     
     def preview_source(self):
         """预览源文件/网页"""
@@ -328,61 +593,84 @@ class WebPackager:
             messagebox.showwarning("警告", "请先选择或输入源文件/URL")
             return
         
-        try:
-            if mode == "url":
-                if not source.startswith(('http://', 'https://')):
-                    source = 'http://' + source
-                webbrowser.open(source)
-                self.log(f"已在浏览器中打开: {source}")
-            elif mode == "file":
-                if os.path.exists(source):
-                    webbrowser.open('file://' + os.path.abspath(source))
-                    self.log(f"已预览文件: {source}")
-                else:
-                    messagebox.showerror("错误", "文件不存在")
-            else:  # folder模式
-                if os.path.exists(source):
-                    # 查找HTML文件
-                    html_files = list(Path(source).glob("*.html")) + list(Path(source).glob("*.htm"))
-                    if html_files:
-                        webbrowser.open('file://' + str(html_files[0].absolute()))
-                        self.log(f"已预览文件夹中的HTML文件: {html_files[0]}")
-                    else:
-                        messagebox.showinfo("信息", "文件夹中没有找到HTML文件")
-                else:
-                    messagebox.showerror("错误", "文件夹不存在")
-        except Exception as e:
-            messagebox.showerror("错误", f"预览失败: {str(e)}")
+        if mode == "url":
+            source = normalize_url(source)
+            self.io.submit(self.open_in_browser, source, on_error=self.on_preview_error,
+                           on_done=lambda url: self.log(f"已在浏览器中打开: {url}"))
+        else:
+            # 通过本地预览服务器提供与打包内容一致的文件，修改后自动刷新（扫描和启动在后台线程中进行）
+            self.stop_preview_server()
+            preview_params = {
+                'source': source,
+                'ignore_patterns': parse_patterns(self.ignore_var.get()),
+                'entry_file': self.entry_var.get(),
+                'tree_shaking': self.shake_var.get(),
+                'allow_patterns': parse_patterns(self.allow_var.get())
+            }
+            self.io.submit(self.start_preview_server, mode, preview_params,
+                           on_done=self.on_preview_started, on_error=self.on_preview_error)
+    
+    def open_in_browser(self, url):
+        """在浏览器中打开地址（在后台线程中调用）"""
+        import webbrowser
+        
+        webbrowser.open(url)
+        return url
+    
+    def start_preview_server(self, mode, preview_params):
+        """启动预览服务器并在浏览器中打开（在后台线程中调用），返回服务器"""
+        from preview_server import PreviewServer
+        from asset_graph import FolderFiles, find_reachable
+        
+        source = preview_params['source']
+        if not os.path.exists(source):
+            raise Exception("文件不存在" if mode == "file" else "文件夹不存在")
+        if mode == "file":
+            # 只提供从该页面出发引用到的文件（不遍历所在目录，如桌面、下载文件夹）
+            root_dir, entry = os.path.split(os.path.abspath(source))
+            ignore = PackIgnore.from_folder(root_dir, preview_params.get('ignore_patterns'))
+            files = find_reachable(root_dir, entry, FolderFiles(root_dir, ignore))['files']
+        else:
+            # 与打包时相同的排除规则、入口页面和引用分析
+            scan = self.engine.scan_source_folder(preview_params)
+            root_dir, entry, files = source, scan['entry'], scan['files']
+        
+        server = PreviewServer(root_dir, entry, files).start()
+        self.open_in_browser(server.url)
+        return server
+    
+    def on_preview_started(self, server):
+        """预览服务器启动完成（连续点击预览时只保留最后启动的服务器）"""
+        self.stop_preview_server()
+        self.preview_server = server
+        self.log(f"已启动预览服务器: {server.url}（文件修改后页面自动刷新）")
+    
+    def on_preview_error(self, error):
+        """预览失败"""
+        messagebox.showerror("错误", f"预览失败: {str(error)}")
+    
+    def stop_preview_server(self):
+        """停止预览服务器"""
+        if self.preview_server:
+            stats = self.preview_server.cache.stats()
+            self.preview_server.stop()
+            self.preview_server = None
+            self.log(f"预览服务器已停止（缓存命中 {stats['hits']} 次, 未命中 {stats['misses']} 次）")
     
     def validate_inputs(self):
         """验证输入参数"""
-        mode = self.mode_var.get()
         source = self.source_var.get()
         
         if not source:
             messagebox.showwarning("警告", "请选择或输入源文件/URL")
             return False
         
-        if mode == "file" and not os.path.exists(source):
-            messagebox.showerror("错误", "选择的文件不存在")
-            return False
-        
-        if mode == "folder" and not os.path.exists(source):
-            messagebox.showerror("错误", "选择的文件夹不存在")
-            return False
-        
+        # 源文件是否存在由打包引擎在打包线程中检查，输出目录也在打包线程中创建
         output_dir = self.output_var.get()
         if not output_dir:
             messagebox.showwarning("警告", "请选择输出目录")
             return False
         
-        # 自动创建输出目录（如果不存在）
-        try:
-            os.makedirs(output_dir, exist_ok=True)
-        except Exception as e:
-            messagebox.showerror("错误", f"无法创建输出目录: {str(e)}")
-            return False
-        
         try:
             width = int(self.width_var.get())
             height = int(self.height_var.get())
@@ -393,6 +681,22 @@ class WebPackager:
             messagebox.showerror("错误", "窗口尺寸必须为数字")
             return False
         
+        try:
+            if int(self.copy_workers_var.get()) < 0:
+                messagebox.showwarning("警告", "复制线程数不能小于0")
+                return False
+        except ValueError:
+            messagebox.showerror("错误", "复制线程数必须为数字")
+            return False
+        
+        try:
+            if int(self.inline_threshold_var.get()) < 0:
+                messagebox.showwarning("警告", "内联阈值不能小于0")
+                return False
+        except ValueError:
+            messagebox.showerror("错误", "内联阈值必须为数字")
+            return False
+        
         return True
     
     def start_packaging(self):
@@ -403,33 +707,25 @@ class WebPackager:
         if not self.validate_inputs():
             return
         
+        # 在界面线程中读取参数（Tk变量不能在后台线程中访问）
+        params = self.collect_params()
+        
         self.is_packaging = True
         self.pack_btn.config(state="disabled")
         self.progress['value'] = 10  # 开始打包，设置初始进度
         
         # 在新线程中执行打包
-        thread = threading.Thread(target=self.package_thread)
+        thread = threading.Thread(target=self.package_thread, args=(params,))
         thread.daemon = True
         thread.start()
     
-    def package_thread(self):
+    def package_thread(self, params):
         """打包线程"""
         try:
             self.log("开始打包过程...")
             
-            # 收集参数
-            params = {
-                'mode': self.mode_var.get(),
-                'source': self.source_var.get(),
-                'window_title': self.title_var.get(),
-                'window_width': int(self.width_var.get()),
-                'window_height': int(self.height_var.get()),
-                'output_dir': self.output_var.get(),
-                'icon_path': self.icon_var.get()
-            }
-            
-            # 创建应用文件
-            self.create_application(params)
+            # 由打包引擎完成构建，日志和进度通过事件回调更新界面
+            self.engine.package(params)
             
             # 打包完成
             self.root.after(0, self.packaging_complete)
@@ -438,320 +734,128 @@ class WebPackager:
             error_msg = str(e)
             self.root.after(0, lambda: self.packaging_error(error_msg))
     
-    def create_application(self, params):
-        """创建应用程序"""
-        self.log("正在创建应用配置...")
+    def start_dry_run(self):
+        """试运行：显示打包计划和预计的耗时、体积，不实际打包"""
+        if not self.validate_inputs():
+            return
         
-        # 创建临时工作目录
-        temp_dir = tempfile.mkdtemp()
+        # 扫描文件夹等在后台线程中进行
+        self.io.submit(self.engine.plan, self.collect_params(),
+                       on_done=lambda plan: self.log(format_plan(plan)),
+                       on_error=lambda e: messagebox.showerror("错误", f"试运行失败: {str(e)}"))
+    
+    def collect_params(self):
+        """从界面收集打包参数"""
+        return {
+                'mode': self.mode_var.get(),
+                'source': self.source_var.get(),
+                'window_title': self.title_var.get(),
+                'window_width': int(self.width_var.get()),
+                'window_height': int(self.height_var.get()),
+                'output_dir': self.output_var.get(),
+                'icon_path': self.icon_var.get(),
+                'copy_workers': int(self.copy_workers_var.get()),
+                'ignore_patterns': parse_patterns(self.ignore_var.get()),
+                'module_profile': 'lean' if self.lean_var.get() else 'default',
+                'measure_startup': self.measure_var.get(),
+                'compression': self.compression_var.get(),
+                'build_mode': 'template' if self.template_var.get() else 'pyinstaller',
+                'entry_file': self.entry_var.get(),
+                'tree_shaking': self.shake_var.get(),
+                'allow_patterns': parse_patterns(self.allow_var.get()),
+                'inline_single_file': self.inline_var.get(),
+                'inline_threshold_kb': int(self.inline_threshold_var.get()),
+                'persistent_storage': self.persistent_var.get(),
+                'precache_manifest': self.precache_var.get(),
+                'splash_image': self.splash_var.get(),
+                'resource_limits': dict(self.user_config.get('resource_limits', DEFAULT_RESOURCE_LIMITS))
+            }
+    
+    def start_batch_packaging(self):
+        """批量打包：从JSON文件读取多个应用，共用一次依赖分析"""
+        if self.is_packaging:
+            return
         
-        try:
-            # 为每个软件创建独立的编号文件夹
-            pack_dir = params['output_dir']
-            os.makedirs(pack_dir, exist_ok=True)
-            
-            # 查找已存在的编号文件夹，确定下一个编号
-            existing_folders = [d for d in os.listdir(pack_dir) if d.isdigit() and os.path.isdir(os.path.join(pack_dir, d))]
-            next_number = 1
-            if existing_folders:
-                next_number = max(int(folder) for folder in existing_folders) + 1
-            
-            # 创建编号文件夹
-            numbered_folder = os.path.join(pack_dir, str(next_number))
-            os.makedirs(numbered_folder, exist_ok=True)
-            
-            self.log(f"创建软件文件夹: {numbered_folder}")
-            
-            # 创建主应用文件
-            app_content = self.generate_app_code(params)
-            app_file = os.path.join(temp_dir, "app.py")
-            with open(app_file, 'w', encoding='utf-8') as f:
-                f.write(app_content)
-            
-            self.log("应用代码生成完成")
-            
-            # 复制图标文件（如果有）
-            if params['icon_path'] and os.path.exists(params['icon_path']):
-                icon_ext = os.path.splitext(params['icon_path'])[1].lower()
-                if icon_ext == '.ico':
-                    shutil.copy2(params['icon_path'], os.path.join(temp_dir, "icon.ico"))
-                else:
-                    # 转换其他格式为ICO
-                    self.convert_to_ico(params['icon_path'], os.path.join(temp_dir, "icon.ico"))
-            
-            # 复制HTML文件到临时目录（对于文件和文件夹模式）
-            if params['mode'] == 'file':
-                # 复制单个HTML文件
-                html_file_name = os.path.basename(params['source'])
-                shutil.copy2(params['source'], os.path.join(temp_dir, html_file_name))
-                self.log(f"复制HTML文件: {html_file_name}")
-            elif params['mode'] == 'folder':
-                # 复制整个文件夹
-                for root, dirs, files in os.walk(params['source']):
-                    for file in files:
-                        src_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(src_path, params['source'])
-                        dst_path = os.path.join(temp_dir, rel_path)
-                        os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-                        shutil.copy2(src_path, dst_path)
-                self.log(f"复制文件夹内容: {params['source']}")
-            
-            # 创建spec文件用于PyInstaller
-            spec_content = self.generate_spec_file(params, temp_dir)
-            spec_file = os.path.join(temp_dir, "app.spec")
-            with open(spec_file, 'w', encoding='utf-8') as f:
-                f.write(spec_content)
-            
-            self.log("配置文件生成完成")
-            
-            # 使用PyInstaller打包
-            self.log("正在使用PyInstaller打包...")
-            import subprocess
-            
-            output_name = params['window_title'].replace(' ', '_')
-            
-            # 构建PyInstaller命令
-            cmd = [
-                'pyinstaller',
-                '--noconfirm',
-                '--onefile',
-                '--windowed',
-                '--name', output_name,
-                '--distpath', numbered_folder,  # 输出到编号文件夹
-                '--workpath', os.path.join(temp_dir, 'build'),
-                '--specpath', temp_dir,
-            ]
-            
-            # 添加数据文件
-            if params['mode'] == 'file':
-                # 文件模式：添加单个HTML文件
-                cmd.extend(['--add-data', f"{params['source']};."])
-            elif params['mode'] == 'folder':
-                # 文件夹模式：添加整个文件夹
-                cmd.extend(['--add-data', f"{params['source']};."])
-            
-            cmd.append(app_file)
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=temp_dir)
-            
-            if result.returncode == 0:
-                self.log("打包成功完成！")
-                exe_path = os.path.join(numbered_folder, f"{output_name}.exe")
-                self.log(f"生成的可执行文件: {exe_path}")
-                
-                # 复制HTML文件到编号文件夹（便于用户查看）
-                if params['mode'] == 'file':
-                    html_file_name = os.path.basename(params['source'])
-                    shutil.copy2(params['source'], os.path.join(numbered_folder, html_file_name))
-                elif params['mode'] == 'folder':
-                    shutil.copytree(params['source'], os.path.join(numbered_folder, "web_content"), dirs_exist_ok=True)
-                
-                # 记录用户选择的HTML地址到配置文件
-                self.add_recent_source(params['source'], params['mode'])
-                
-                self.log(f"软件已保存到: {numbered_folder}")
-            else:
-                raise Exception(f"PyInstaller打包失败: {result.stderr}")
-                
-        finally:
-            # 清理临时文件
-            shutil.rmtree(temp_dir, ignore_errors=True)
-    
-    def generate_app_code(self, params):
-        """生成应用代码"""
-        if params['mode'] == 'url':
-            content = f"""#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-import webview
-
-if __name__ == "__main__":
-    webview.create_window(
-        '{params['window_title']}',
-        '{params['source']}',
-        width={params['window_width']},
-        height={params['window_height']},
-        text_select=True,
-        confirm_close=False
-    )
-    webview.start()
-"""
-        else:
-            # 对于文件和文件夹模式，需要先复制文件到临时目录
-            content = f"""#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-import os
-import sys
-import webview
-
-if __name__ == "__main__":
-    # 获取资源路径
-    if getattr(sys, 'frozen', False):
-        # 打包后的可执行文件
-        resource_path = sys._MEIPASS
-    else:
-        # 开发环境
-        resource_path = os.path.dirname(os.path.abspath(__file__))
-    
-    # 根据模式确定要加载的文件
-    """
-            
-            if params['mode'] == 'file':
-                content += f"""
-    # 文件模式 - 直接加载HTML文件
-    html_file = os.path.join(resource_path, '{os.path.basename(params['source'])}')
-    """
-            else:  # folder模式
-                content += f"""
-    # 文件夹模式 - 查找HTML文件
-    html_files = [f for f in os.listdir(resource_path) if f.lower().endswith(('.html', '.htm'))]
-    if html_files:
-        html_file = os.path.join(resource_path, html_files[0])
-    else:
-        print("未找到HTML文件")
-        sys.exit(1)
-    """
-            
-            content += f"""
-    
-    # 创建窗口 - 使用文件协议加载本地HTML文件
-    webview.create_window(
-        '{params['window_title']}',
-        f"file://{{html_file}}",
-        width={params['window_width']},
-        height={params['window_height']},
-        text_select=True,
-        confirm_close=False
-    )
-    webview.start()
-"""
+        batch_file = filedialog.askopenfilename(
+            title="选择批量打包配置",
+            filetypes=[("JSON文件", "*.json"), ("所有文件", "*.*")]
+        )
+        if not batch_file:
+            return
         
-        return content
+        self.io.submit(self.read_batch_file, batch_file, on_done=self.begin_batch_packaging,
+                       on_error=lambda e: messagebox.showerror("错误", f"无法读取批量打包配置: {str(e)}"))
     
-    def generate_spec_file(self, params, temp_dir):
-        """生成PyInstaller spec文件"""
-        spec_content = f"""# -*- mode: python ; coding: utf-8 -*-
-
-block_cipher = None
-
-
-a = Analysis(
-    ['app.py'],
-    pathex=[],
-    binaries=[],
-    datas=[],
-    hiddenimports=[],
-    hookspath=[],
-    hooksconfig={{}},
-    runtime_hooks=[],
-    excludes=[],
-    win_no_prefer_redirects=False,
-    win_private_assemblies=False,
-    cipher=block_cipher,
-    noarchive=False,
-)
-"""
+    def read_batch_file(self, batch_file):
+        """读取批量打包配置（在后台线程中调用），返回 {'apps': 应用列表, 'host': 是否构建宿主应用, 'title': 宿主应用名称}"""
+        with open(batch_file, 'r', encoding='utf-8') as f:
+            batch = json.load(f)
+        if not isinstance(batch, dict):
+            batch = {"apps": batch}
+        if not batch.get("apps"):
+            raise ValueError("配置中没有应用")
+        return {"apps": batch["apps"], "host": bool(batch.get("host")), "title": batch.get("title") or DEFAULT_HOST_TITLE}
+    
+    def begin_batch_packaging(self, batch):
+        """批量打包配置读取完成后开始打包"""
+        if self.is_packaging:
+            return
         
-        # 添加数据文件
-        if params['mode'] == 'file':
-            spec_content += f"""
-a.datas += [('{os.path.basename(params['source'])}', '{params['source']}', 'DATA')]
-"""
-        elif params['mode'] == 'folder':
-            # 添加整个文件夹的内容
-            for root, dirs, files in os.walk(params['source']):
-                for file in files:
-                    full_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(full_path, params['source'])
-                    temp_file_path = os.path.join(temp_dir, rel_path)
-                    spec_content += f"a.datas += [('{rel_path}', '{full_path}', 'DATA')]\n"
-        
-        # 添加图标
-        if params['icon_path'] and os.path.exists(params['icon_path']):
-            spec_content += f"""
-
-pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
-
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='{params['window_title'].replace(' ', '_')}',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon='icon.ico',
-)
-"""
-        else:
-            spec_content += f"""
-
-pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
-
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
-    name='{params['window_title'].replace(' ', '_')}',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
-"""
+        if not self.output_var.get():
+            messagebox.showwarning("警告", "请选择输出目录")
+            return
+        
+        try:
+            common = self.collect_params()
+        except ValueError:
+            messagebox.showerror("错误", "窗口尺寸、复制线程数和内联阈值必须为数字")
+            return
+        
+        self.is_packaging = True
+        self.pack_btn.config(state="disabled")
+        self.batch_btn.config(state="disabled")
+        self.progress['value'] = 10
         
-        return spec_content
+        thread = threading.Thread(target=self.batch_thread, args=(common, batch))
+        thread.daemon = True
+        thread.start()
     
-    def convert_to_ico(self, input_path, output_path):
-        """将图片转换为ICO格式"""
+    def batch_thread(self, common, batch):
+        """批量打包线程"""
         try:
-            with Image.open(input_path) as img:
-                # 转换为RGBA模式（如果需要）
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                
-                # 调整尺寸为ICO标准尺寸
-                sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
-                
-                # 创建不同尺寸的图标
-                ico_images = []
-                for size in sizes:
-                    resized_img = img.resize(size, Image.Resampling.LANCZOS)
-                    ico_images.append(resized_img)
-                
-                # 保存为ICO
-                ico_images[0].save(output_path, format='ICO', sizes=[(img.width, img.height) for img in ico_images])
-                
-            self.log(f"图标转换完成: {input_path} -> {output_path}")
+            params_list = []
+            for variant in batch['apps']:
+                params = dict(common)
+                # 入口文件只适用于界面中当前的文件夹，变体未指定时自动查找
+                params['entry_file'] = ''
+                params.update(variant)
+                params_list.append(params)
+            
+            if batch['host']:
+                # 所有应用合并为一个多站点宿主应用
+                self.engine.package_host(params_list, batch['title'])
+            else:
+                self.engine.package_batch(params_list)
+            self.root.after(0, self.packaging_complete)
         except Exception as e:
-            self.log(f"图标转换失败: {str(e)}")
+            error_msg = str(e)
+            self.root.after(0, lambda: self.packaging_error(error_msg))
+    
+    def on_engine_event(self, event):
+        """处理打包引擎的事件（在构建线程中调用，界面更新转到主线程）"""
+        if event['type'] == 'log':
+            self.log(event['message'])
+        elif event['type'] == 'progress':
+            self.root.after(0, lambda: self.progress.configure(value=event['progress']))
+        elif event['type'] == 'built':
+            # 记录用户选择的HTML地址到配置文件
+            self.root.after(0, lambda: self.add_recent_source(event['source'], event['mode']))
     
     def packaging_complete(self):
         """打包完成"""
         self.is_packaging = False
         self.pack_btn.config(state="normal")
+        self.batch_btn.config(state="normal")
         self.progress['value'] = 100  # 设置为100%完成
         self.status_var.set("打包完成")
         
@@ -761,6 +865,7 @@ exe = EXE(
         """打包错误"""
         self.is_packaging = False
         self.pack_btn.config(state="normal")
+        self.batch_btn.config(state="normal")
         self.progress['value'] = 0  # 重置为0，表示打包失败
         self.status_var.set("打包失败")
         
@@ -781,17 +886,37 @@ exe = EXE(
         self.log_text.delete(1.0, tk.END)
         self.status_var.set("准备就绪")
     
-    def load_user_config(self):
-        """加载用户配置，如果没有配置文件则自动生成"""
-        default_config = {
+    def default_user_config(self):
+        """默认用户配置"""
+        return {
             "recent_sources": [],
             "last_mode": "url",
             "last_output_dir": os.path.join(os.path.dirname(__file__), "Pack"),
+            "copy_workers": 0,
+            "ignore_patterns": list(DEFAULT_IGNORE_PATTERNS),
+            "module_profile": "default",
+            "measure_startup": False,
+            "compression": DEFAULT_COMPRESSION,
+            "build_mode": "pyinstaller",
+            "tree_shaking": False,
+            "allow_patterns": [],
+            "inline_single_file": False,
+            "inline_threshold_kb": DEFAULT_INLINE_THRESHOLD_KB,
+            "persistent_storage": False,
+            "precache_manifest": "",
+            "splash_image": "",
+            "resource_limits": dict(DEFAULT_RESOURCE_LIMITS),
+            "build_history": [],
+            "ui_stall_threshold_ms": DEFAULT_STALL_THRESHOLD_MS,
             "window_settings": {
                 "width": 800,
                 "height": 600
             }
         }
+    
+    def load_user_config(self):
+        """加载用户配置，如果没有配置文件则自动生成"""
+        default_config = self.default_user_config()
         
         try:
             if os.path.exists(self.config_file):
@@ -828,12 +953,35 @@ exe = EXE(
     
     def save_user_config(self):
         """保存用户配置到config.json文件"""
+        # 配置文件尚未加载完成时不保存，避免用默认配置覆盖
+        if not self.config_loaded:
+            return
+        
         try:
             # 更新当前配置
             self.user_config["last_mode"] = self.mode_var.get()
             self.user_config["last_output_dir"] = self.output_var.get()
+            try:
+                self.user_config["copy_workers"] = max(0, int(self.copy_workers_var.get()))
+            except ValueError:
+                pass
+            self.user_config["ignore_patterns"] = parse_patterns(self.ignore_var.get())
+            self.user_config["module_profile"] = "lean" if self.lean_var.get() else "default"
+            self.user_config["measure_startup"] = self.measure_var.get()
+            self.user_config["compression"] = self.compression_var.get()
+            self.user_config["build_mode"] = "template" if self.template_var.get() else "pyinstaller"
+            self.user_config["tree_shaking"] = self.shake_var.get()
+            self.user_config["allow_patterns"] = parse_patterns(self.allow_var.get())
+            self.user_config["inline_single_file"] = self.inline_var.get()
+            try:
+                self.user_config["inline_threshold_kb"] = max(0, int(self.inline_threshold_var.get()))
+            except ValueError:
+                pass
+            self.user_config["persistent_storage"] = self.persistent_var.get()
+            self.user_config["precache_manifest"] = self.precache_var.get()
+            self.user_config["splash_image"] = self.splash_var.get()
             
-            # 保存窗口设置
+            # 保存窗口设置（只能在界面线程中读取窗口尺寸）
             self.user_config["window_settings"] = {
                 "width": self.root.winfo_width(),
                 "height": self.root.winfo_height()
@@ -844,16 +992,42 @@ exe = EXE(
                 "recent_sources": self.user_config.get("recent_sources", []),
                 "last_mode": self.user_config.get("last_mode", "url"),
                 "last_output_dir": self.user_config.get("last_output_dir", os.path.join(os.path.dirname(__file__), "Pack")),
+                "copy_workers": self.user_config.get("copy_workers", 0),
+                "ignore_patterns": self.user_config.get("ignore_patterns", list(DEFAULT_IGNORE_PATTERNS)),
+                "module_profile": self.user_config.get("module_profile", "default"),
+                "measure_startup": self.user_config.get("measure_startup", False),
+                "compression": self.user_config.get("compression", DEFAULT_COMPRESSION),
+                "build_mode": self.user_config.get("build_mode", "pyinstaller"),
+                "tree_shaking": self.user_config.get("tree_shaking", False),
+                "allow_patterns": self.user_config.get("allow_patterns", []),
+                "inline_single_file": self.user_config.get("inline_single_file", False),
+                "inline_threshold_kb": self.user_config.get("inline_threshold_kb", DEFAULT_INLINE_THRESHOLD_KB),
+                "persistent_storage": self.user_config.get("persistent_storage", False),
+                "precache_manifest": self.user_config.get("precache_manifest", ""),
+                "splash_image": self.user_config.get("splash_image", ""),
+                "resource_limits": self.user_config.get("resource_limits", dict(DEFAULT_RESOURCE_LIMITS)),
+                "build_history": list(self.user_config.get("build_history", [])),
+                "ui_stall_threshold_ms": self.user_config.get("ui_stall_threshold_ms", DEFAULT_STALL_THRESHOLD_MS),
                 "window_settings": self.user_config.get("window_settings", {"width": 800, "height": 600})
             }
-            
+        except Exception as e:
+            print(f"保存配置文件失败: {e}")
+            self.log(f"保存配置失败: {e}")
+            return
+        
+        # 在界面线程中取得配置快照，写入文件在后台按顺序进行
+        self.io.submit(self.write_user_config, config_to_save, serial=True,
+                       on_done=lambda _: self.log("配置已保存到config.json"),
+                       on_error=lambda e: self.log(f"保存配置失败: {e}"))
+    
+    def write_user_config(self, config_to_save):
+        """写入config.json（在后台线程中调用）"""
+        try:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config_to_save, f, indent=2, ensure_ascii=False)
-                
-            self.log("配置已保存到config.json")
         except Exception as e:
             print(f"保存配置文件失败: {e}")
-            self.log(f"保存配置失败: {e}")
+            raise
     
     def add_recent_source(self, source, mode):
         """添加最近使用的源文件/URL"""
@@ -932,25 +1106,29 @@ exe = EXE(
         self.on_mode_change()
         
         # 如果是文件夹模式，加载文件夹结构
-        if mode == "folder" and os.path.exists(source):
+        if mode == "folder":
             self.load_folder_structure(source)
         
         self.log(f"已加载最近使用的源: {source}")
     
     def run(self):
         """运行应用程序"""
-        # 加载最近使用的源文件
-        self.load_recent_sources()
+        # 最近使用的源文件在主窗口显示后随配置一起加载（见load_startup_config）
         
         # 设置窗口关闭事件
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         self.root.mainloop()
+        
+        # 主循环结束后等待配置写入完成
+        self.io.shutdown()
     
     def on_closing(self):
         """窗口关闭事件处理"""
         # 保存用户配置
         self.save_user_config()
+        self.stop_preview_server()
+        self.watchdog.stop()
         self.root.quit()
 
 if __name__ == "__main__":
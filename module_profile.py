@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 生成应用的模块精简配置与启动测量
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+# 启动探针环境变量：生成的应用检测到该变量后写入启动耗时并立即退出
+STARTUP_PROBE_ENV = "WEBPACKAGER_STARTUP_PROBE"
+
+# pywebview 后端在运行时动态加载、静态分析无法发现的模块
+# （Windows: EdgeChromium/WinForms，Linux: GTK/Qt，macOS: Cocoa，以及CEF）
+BACKEND_KEEP = {
+    'webview', 'bottle', 'proxy_tools', 'typing_extensions',
+    'clr', 'clr_loader', 'pythonnet', 'System',
+    'gi', 'cairo', 'qtpy', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6', 'sip',
+    'objc', 'AppKit', 'Foundation', 'WebKit', 'Quartz', 'PyObjCTools', 'cefpython3',
+    'encodings', 'json', 'ctypes', 'http', 'urllib', 'email',
+}
+
+# 打包环境中常见、但生成的应用不需要的大型模块（精简配置只从这个列表中排除，
+# 不排除其他已安装的包，以免去掉pywebview动态加载的后端）
+HEAVY_CANDIDATES = {
+    'tkinter', '_tkinter', 'turtle', 'turtledemo', 'idlelib',
+    'unittest', 'doctest', 'pydoc', 'pydoc_data', 'pdb', 'lib2to3', 'test',
+    'distutils', 'setuptools', 'pkg_resources', 'pip', 'PyInstaller',
+    'sqlite3', 'xmlrpc', 'curses', 'dbm',
+    'PIL', 'requests', 'urllib3', 'chardet', 'charset_normalizer', 'idna', 'certifi',
+    'numpy', 'pandas', 'scipy', 'matplotlib', 'IPython', 'jupyter', 'notebook',
+    'lxml', 'bs4', 'cryptography', 'yaml',
+}
+
+PROFILES = {
+    'default': "默认（包含打包环境中可发现的全部依赖）",
+    'lean': "精简（仅保留生成应用实际需要的模块）",
+}
+
+
+def find_required_modules(app_file):
+    """静态分析生成的 app.py，返回其（及pywebview后端）需要的顶层模块集合"""
+    import modulefinder
+
+    finder = modulefinder.ModuleFinder(path=[os.path.dirname(os.path.abspath(app_file))] + sys.path)
+    finder.run_script(app_file)
+    return {name.split('.')[0] for name in finder.modules}
+
+
+def compute_lean_profile(app_file):
+    """计算精简配置，返回 {'required': 需要的顶层模块, 'excludes': 排除列表}"""
+    try:
+        required = find_required_modules(app_file)
+    except Exception:
+        # 静态分析失败时只使用保守的候选列表
+        required = set()
+    required |= BACKEND_KEEP
+    required.discard('__main__')
+
+    excludes = sorted(name for name in HEAVY_CANDIDATES if name not in required)
+    return {'required': sorted(required), 'excludes': excludes}
+
+
+def measure_startup(exe_path, timeout=60):
+    """运行生成的应用并通过启动探针测量启动耗时
+
+    返回 {'total_ms': 进程启动到探针写入的总耗时（含解压）, 'import_ms': Python导入耗时}，
+    测量失败时返回 None
+    """
+    fd, probe_file = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    os.remove(probe_file)
+    env = dict(os.environ)
+    env[STARTUP_PROBE_ENV] = probe_file
+
+    try:
+        start = time.perf_counter()
+        subprocess.run([exe_path], env=env, timeout=timeout,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        total_ms = (time.perf_counter() - start) * 1000
+        if not os.path.exists(probe_file):
+            return None
+        with open(probe_file, 'r', encoding='utf-8') as f:
+            probe = json.load(f)
+        probe['total_ms'] = total_ms
+        return probe
+    except Exception:
+        return None
+    finally:
+        if os.path.exists(probe_file):
+            os.remove(probe_file)
+
+
+def probe_code():
+    """生成应用中启动探针的代码（放在导入webview之后）"""
+    return f"""
+    # 启动探针（仅用于打包工具测量启动耗时）
+    _probe_file = os.environ.get({STARTUP_PROBE_ENV!r})
+    if _probe_file:
+        with open(_probe_file, 'w', encoding='utf-8') as _f:
+            json.dump({{'import_ms': (time.perf_counter() - _start_time) * 1000}}, _f)
+        sys.exit(0)
+"""
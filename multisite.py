@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 多站点宿主应用（多个网页在同一进程中以多个窗口运行，资源按内容去重后只打包一份）
+"""
+
+import os
+import sys
+import time
+import hashlib
+import subprocess
+from collections import Counter
+from splash import WINDOW_POLL_INTERVAL, visible_windows
+
+# 宿主应用的默认名称
+DEFAULT_HOST_TITLE = "网页应用合集"
+
+# 打包到宿主应用中的站点配置文件和去重后的资源目录
+HOST_MANIFEST = "host.json"
+BLOB_DIR = "blobs"
+
+# 计算文件摘要时每次读取的大小
+HASH_CHUNK = 1024 * 1024
+
+# 所有窗口出现后等待页面加载完成再测量内存（秒）
+MEMORY_SETTLE_SECONDS = 3
+
+
+def file_digest(path):
+    """文件内容的SHA256摘要"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dedup_assets(site_files):
+    """按内容对所有站点的文件去重
+
+    site_files 为每个站点的 [(相对路径, 源文件路径)] 列表。先按文件大小分组，
+    只有大小相同的文件才计算摘要，内容相同的文件共用一个资源编号。
+    返回 {'sites': [{相对路径: 资源编号}], 'blobs': [(资源编号, 源文件路径)],
+          'total_files', 'total_bytes', 'unique_bytes'}。
+    """
+    by_size = {}
+    for files in site_files:
+        for _, src in files:
+            by_size.setdefault(os.path.getsize(src), set()).add(src)
+
+    # 源文件路径 -> 内容键（大小唯一的文件不需要读取内容）
+    keys = {}
+    for size, paths in by_size.items():
+        for src in paths:
+            keys[src] = (size, file_digest(src)) if len(paths) > 1 else (size, src)
+
+    blob_ids = {}
+    blobs = []
+    sites = []
+    total_files = 0
+    total_bytes = 0
+    unique_bytes = 0
+    for files in site_files:
+        mapping = {}
+        for rel_path, src in files:
+            key = keys[src]
+            blob = blob_ids.get(key)
+            if blob is None:
+                blob = str(len(blobs))
+                blob_ids[key] = blob
+                blobs.append((blob, src))
+                unique_bytes += key[0]
+            mapping[rel_path] = blob
+            total_files += 1
+            total_bytes += key[0]
+        sites.append(mapping)
+
+    return {
+        'sites': sites,
+        'blobs': blobs,
+        'total_files': total_files,
+        'total_bytes': total_bytes,
+        'unique_bytes': unique_bytes
+    }
+
+
+def format_dedup_stats(stats):
+    """格式化资源去重统计"""
+    mb = 1024 * 1024
+    return (f"资源去重: {stats['total_files']} 个文件 {stats['total_bytes'] / mb:.2f} MB -> "
+            f"{len(stats['blobs'])} 个文件 {stats['unique_bytes'] / mb:.2f} MB"
+            f"（节省 {(stats['total_bytes'] - stats['unique_bytes']) / mb:.2f} MB）")
+
+
+def host_server_code():
+    """生成宿主应用中为本地站点提供资源的服务器函数（模块级）
+
+    每个站点使用一个端口（不同端口即不同源，各站点的本地存储互不影响），
+    请求的路径按站点的文件表映射到去重后的资源文件。
+    """
+    return f"""
+def serve_site(resource_path, files):
+    import mimetypes
+    import threading
+    from urllib.parse import urlsplit, unquote
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    # 系统注册表中的类型可能不正确（如 .js 为 text/plain），常用类型固定
+    types = {{'.html': 'text/html', '.htm': 'text/html', '.js': 'text/javascript', '.mjs': 'text/javascript',
+             '.css': 'text/css', '.json': 'application/json', '.svg': 'image/svg+xml', '.wasm': 'application/wasm'}}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_file(True)
+
+        def do_HEAD(self):
+            self.send_file(False)
+
+        def send_file(self, with_body):
+            path = unquote(urlsplit(self.path).path).lstrip('/')
+            blob = files.get(path)
+            if blob is None:
+                blob = files.get(path + 'index.html' if not path or path.endswith('/') else path + '/index.html')
+            if blob is None:
+                self.send_error(404)
+                return
+            with open(os.path.join(resource_path, {BLOB_DIR!r}, blob), 'rb') as f:
+                data = f.read()
+            ext = os.path.splitext(path)[1].lower()
+            self.send_response(200)
+            self.send_header('Content-Type', types.get(ext) or mimetypes.guess_type(path)[0] or 'application/octet-stream')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            if with_body:
+                self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def warm_all(windows, storage_path, sites):
+    # 依次预热各站点的预缓存列表
+    for window, site in zip(windows, sites):
+        warm_cache(window, storage_path, site.get('precache_urls', []))
+"""
+
+
+def _process_memory(pids):
+    """进程及其所有子进程（WebView2的浏览器进程等）的内存占用（RSS合计），未安装psutil时返回None"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    total = 0
+    seen = set()
+    for pid in pids:
+        try:
+            process = psutil.Process(pid)
+            tree = [process] + process.children(recursive=True)
+        except psutil.Error:
+            continue
+        for proc in tree:
+            if proc.pid in seen:
+                continue
+            seen.add(proc.pid)
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+    return total
+
+
+def measure_launch(exe_paths, titles, timeout=60):
+    """同时启动exe_paths中的程序，测量所有窗口（按标题识别）出现的耗时和稳定后的内存占用（仅Windows）
+
+    返回 {'window_ms'（超时为None）, 'memory_bytes'（未安装psutil时为None）, 'processes'}，
+    不支持或失败时返回None。
+    """
+    if not sys.platform.startswith('win'):
+        return None
+
+    existing = set(visible_windows())
+    needed = Counter(titles)
+    start = time.perf_counter()
+    processes = []
+    result = {'window_ms': None, 'memory_bytes': None, 'processes': len(exe_paths)}
+    try:
+        for exe_path in exe_paths:
+            processes.append(subprocess.Popen([exe_path]))
+        while time.perf_counter() - start < timeout:
+            shown = Counter(title for pid, title in visible_windows()
+                            if (pid, title) not in existing and title in needed)
+            if all(shown[title] >= count for title, count in needed.items()):
+                result['window_ms'] = (time.perf_counter() - start) * 1000
+                break
+            if all(process.poll() is not None for process in processes):
+                break
+            time.sleep(WINDOW_POLL_INTERVAL)
+        if result['window_ms'] is not None:
+            time.sleep(MEMORY_SETTLE_SECONDS)
+            result['memory_bytes'] = _process_memory([process.pid for process in processes])
+    except Exception:
+        return None
+    finally:
+        # 单文件应用的实际程序在子进程中运行，需要结束整个进程树
+        for process in processes:
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result
+
+
+def format_launch(launch):
+    """格式化启动测量结果"""
+    window = f"{launch['window_ms']:.0f} ms" if launch['window_ms'] is not None else "未检测到"
+    if launch['memory_bytes'] is not None:
+        memory = f"{launch['memory_bytes'] / (1024 * 1024):.0f} MB"
+    else:
+        memory = "未测量（需要安装psutil）"
+    return f"启动 {launch['processes']} 个程序, 所有窗口出现: {window}, 内存占用: {memory}"
+
+
+def format_launch_comparison(host, separate):
+    """格式化宿主应用与单独运行各应用的对比"""
+    parts = []
+    if host['window_ms'] is not None and separate['window_ms'] is not None:
+        parts.append(f"窗口出现 {host['window_ms'] - separate['window_ms']:+.0f} ms")
+    if host['memory_bytes'] is not None and separate['memory_bytes'] is not None:
+        saved = separate['memory_bytes'] - host['memory_bytes']
+        parts.append(f"内存 {-saved / (1024 * 1024):+.0f} MB"
+                     f"（节省 {saved / max(separate['memory_bytes'], 1) * 100:.0f}%）")
+    return "宿主应用相比单独运行: " + (", ".join(parts) if parts else "无法对比")
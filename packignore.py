@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - .packignore 排除规则（gitignore风格）
+"""
+
+import os
+import re
+
+# 排除规则文件名
+PACKIGNORE_FILE = ".packignore"
+
+# 界面中默认的排除规则
+DEFAULT_IGNORE_PATTERNS = [
+    ".git/",
+    ".svn/",
+    ".hg/",
+    "node_modules/",
+    "__pycache__/",
+    ".cache/",
+    ".idea/",
+    ".vscode/",
+    "*.map",
+    ".DS_Store",
+    "Thumbs.db",
+    PACKIGNORE_FILE,
+]
+
+
+def _translate(pattern):
+    """将gitignore风格的通配符转换为正则表达式"""
+    regex = ''
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern[i:i + 3] == '**/':
+                # "**/" 匹配零个或多个目录
+                regex += '(?:.*/)?'
+                i += 3
+                continue
+            if pattern[i:i + 2] == '**':
+                regex += '.*'
+                i += 2
+                continue
+            regex += '[^/]*'
+        elif c == '?':
+            regex += '[^/]'
+        elif c == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex += re.escape(c)
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex += '[' + body.replace('\\', '\\\\') + ']'
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            regex += re.escape(pattern[i])
+        else:
+            regex += re.escape(c)
+        i += 1
+    return regex
+
+
+class PackIgnore:
+    """gitignore风格的排除规则集合，后面的规则优先"""
+
+    def __init__(self, patterns=None):
+        self.rules = []
+        for pattern in patterns or []:
+            self.add(pattern)
+
+    @classmethod
+    def from_folder(cls, folder, defaults=None):
+        """由默认规则和文件夹根目录下的 .packignore 文件构建规则"""
+        patterns = list(DEFAULT_IGNORE_PATTERNS if defaults is None else defaults)
+        ignore_file = os.path.join(folder, PACKIGNORE_FILE)
+        if os.path.isfile(ignore_file):
+            with open(ignore_file, 'r', encoding='utf-8', errors='replace') as f:
+                patterns.extend(f.read().splitlines())
+        return cls(patterns)
+
+    def add(self, pattern):
+        """添加一条规则（空行和注释会被忽略）"""
+        pattern = pattern.rstrip('\n\r')
+        # 去除未转义的行尾空格
+        while pattern.endswith(' ') and not pattern.endswith('\\ '):
+            pattern = pattern[:-1]
+        if not pattern or pattern.startswith('#'):
+            return
+
+        negate = pattern.startswith('!')
+        if negate:
+            pattern = pattern[1:]
+        elif pattern.startswith('\\'):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        if not pattern:
+            return
+
+        # 包含"/"的规则相对于根目录匹配，否则匹配任意层级的名称
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+        if anchored:
+            regex = '^' + _translate(pattern) + '$'
+        else:
+            regex = '(?:^|.*/)' + _translate(pattern) + '$'
+
+        self.rules.append((re.compile(regex), negate, dir_only))
+
+    def match(self, rel_path, is_dir=False):
+        """判断单个条目是否被排除（不检查上级目录），rel_path 使用"/"分隔"""
+        ignored = False
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                ignored = not negate
+        return ignored
+
+    def is_ignored(self, rel_path, is_dir=False):
+        """判断路径是否被排除（任一上级目录被排除时同样视为排除）"""
+        rel_path = rel_path.replace(os.sep, '/').strip('/')
+        parts = rel_path.split('/')
+        for i in range(1, len(parts)):
+            if self.match('/'.join(parts[:i]), True):
+                return True
+        return self.match(rel_path, is_dir)
+
+
+def scan_folder(folder, ignore=None):
+    """扫描文件夹并应用排除规则，被排除的目录不会被继续遍历
+
+    返回字典：
+        files: 保留的文件相对路径列表（"/"分隔）
+        dirs: 保留的目录相对路径列表
+        bytes: 保留文件的总字节数
+        skipped_files / skipped_bytes: 被单独排除的文件数量和字节数
+        pruned_dirs: 被整体跳过的目录数量（其内容未被遍历）
+    """
+    result = {
+        'files': [],
+        'dirs': [],
+        'bytes': 0,
+        'skipped_files': 0,
+        'skipped_bytes': 0,
+        'pruned_dirs': 0,
+    }
+
+    def walk(path, rel_prefix):
+        try:
+            entries = sorted(os.scandir(path), key=lambda e: e.name)
+        except PermissionError:
+            return
+        for entry in entries:
+            rel_path = rel_prefix + entry.name
+            try:
+                if entry.is_symlink() and entry.is_dir():
+                    # 与os.walk相同，不进入指向目录的符号链接（循环链接会无限重复打包）
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=False)
+                size = 0 if is_dir else entry.stat().st_size
+            except OSError:
+                # 损坏的符号链接等无法读取的条目
+                continue
+            if ignore is not None and ignore.match(rel_path, is_dir):
+                if is_dir:
+                    result['pruned_dirs'] += 1
+                else:
+                    result['skipped_files'] += 1
+                    result['skipped_bytes'] += size
+                continue
+            if is_dir:
+                result['dirs'].append(rel_path)
+                walk(entry.path, rel_path + '/')
+            else:
+                result['files'].append(rel_path)
+                result['bytes'] += size
+
+    walk(folder, '')
+    return result
+
+
+def format_scan_stats(scan):
+    """格式化扫描统计信息"""
+    return (f"保留 {len(scan['files'])} 个文件 ({scan['bytes'] / (1024 * 1024):.2f} MB), "
+            f"排除 {scan['skipped_files']} 个文件 ({scan['skipped_bytes'] / (1024 * 1024):.2f} MB), "
+            f"跳过 {scan['pruned_dirs']} 个目录")
+
+
+def parse_patterns(text):
+    """解析界面中以逗号分隔的排除规则"""
+    return [p.strip() for p in text.split(',') if p.strip()]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 文件路径的内存索引（按文件名、路径片段或通配符快速查找文件）
+"""
+
+import re
+from bisect import bisect_left
+from packignore import PackIgnore
+
+# 三元组索引的长度，更短的查询使用文件名前缀索引
+GRAM_SIZE = 3
+
+# 通配符字符，包含这些字符的查询按gitignore风格的通配符匹配
+GLOB_CHARS = ('*', '?', '[')
+
+# 默认返回的最多匹配数
+SEARCH_LIMIT = 200
+
+
+class PathIndex:
+    """文件相对路径的索引（不区分大小写）
+
+    - 查询不含"/"和通配符：匹配文件名中的子串（少于3个字符时匹配文件名前缀）
+    - 查询含"/"：匹配完整相对路径中的子串（逐个比较）
+    - 查询含通配符：与 .packignore 规则相同的匹配方式（如 *.html、pages/**/index.htm?）
+
+    文件名的三元组索引先筛选出候选文件，再逐个验证，结果按原始路径顺序排列，
+    文件名以查询开头的排在前面。
+    """
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._lower = [path.lower() for path in self.paths]
+        self._names = [path.rsplit('/', 1)[-1] for path in self._lower]
+
+        # 有序的文件名前缀索引
+        prefix = sorted((name, i) for i, name in enumerate(self._names))
+        self._prefix_names = [name for name, _ in prefix]
+        self._prefix_ids = [i for _, i in prefix]
+
+        # 文件名三元组 -> 文件编号列表（编号递增）
+        grams = {}
+        for i, name in enumerate(self._names):
+            for gram in {name[j:j + GRAM_SIZE] for j in range(len(name) - GRAM_SIZE + 1)}:
+                postings = grams.get(gram)
+                if postings is None:
+                    grams[gram] = [i]
+                else:
+                    postings.append(i)
+        self._grams = grams
+
+    def __len__(self):
+        return len(self.paths)
+
+    def _candidates(self, literals):
+        """文件名包含所有片段的候选编号集合（片段都短于3个字符时返回None，表示不筛选）"""
+        result = None
+        for literal in literals:
+            for j in range(len(literal) - GRAM_SIZE + 1):
+                postings = self._grams.get(literal[j:j + GRAM_SIZE])
+                if postings is None:
+                    return set()
+                if result is None:
+                    result = set(postings)
+                else:
+                    result.intersection_update(postings)
+                if not result:
+                    return result
+        return result
+
+    def _filter(self, candidates, predicate):
+        """在候选编号（None表示全部）中筛选满足条件的编号，按路径顺序返回"""
+        ids = range(len(self.paths)) if candidates is None else sorted(candidates)
+        return [i for i in ids if predicate(i)]
+
+    def _by_prefix(self, prefix):
+        """文件名以prefix开头的编号"""
+        low = bisect_left(self._prefix_names, prefix)
+        high = bisect_left(self._prefix_names, prefix + '\uffff', low)
+        return sorted(self._prefix_ids[low:high])
+
+    def _by_glob(self, pattern):
+        """按通配符匹配的编号"""
+        pattern = pattern.rstrip('/')
+        ignore = PackIgnore([pattern])
+        if not ignore.rules:
+            return []
+        regex = ignore.rules[0][0]
+
+        # 最后一段（不含"**"时）对应文件名，其中的普通字符片段用于筛选候选
+        last = pattern.rsplit('/', 1)[-1]
+        literals = []
+        if '**' not in last:
+            literals = re.split(r'[*?]', re.sub(r'\[[^\]]*\]', '*', last))
+        return self._filter(self._candidates(literals), lambda i: regex.match(self._lower[i]) is not None)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """查找文件，返回 (匹配的相对路径列表（最多limit个）, 匹配总数)"""
+        query = query.strip().lower().replace('\\', '/')
+        if not query:
+            return [], 0
+
+        if any(c in query for c in GLOB_CHARS):
+            ids = self._by_glob(query)
+        elif '/' in query:
+            # 片段可能跨越目录名，无法用文件名索引筛选
+            ids = self._filter(None, lambda i: query in self._lower[i])
+        elif len(query) < GRAM_SIZE:
+            ids = self._by_prefix(query)
+        else:
+            ids = self._filter(self._candidates([query]), lambda i: query in self._names[i])
+            # 文件名以查询开头的排在前面
+            ids.sort(key=lambda i: not self._names[i].startswith(query))
+
+        return [self.paths[i] for i in ids[:limit]], len(ids)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 试运行的构建耗时和exe体积估算（根据构建历史）
+"""
+
+import math
+import statistics
+from compression import DEFAULT_COMPRESSION
+
+# 参考的历史构建数量
+ESTIMATE_SAMPLES = 5
+
+# 同一应用参考最近几次构建
+SAME_APP_SAMPLES = 3
+
+# 估算依据
+ESTIMATE_BASIS = {
+    'same_app': "同一应用之前的构建",
+    'similar_size': "内容大小相近的构建",
+    'same_config': "相同打包配置的构建",
+}
+
+
+def estimate_build(history, features):
+    """根据构建历史估算构建耗时和exe体积
+
+    features 包含 mode、source、build_mode、compression、module_profile、content_bytes。
+    只参考打包方式、压缩方式和模块精简配置都相同的构建，优先使用同一应用之前的构建，
+    其次是网页内容大小最接近的构建。
+    返回 {'build_seconds', 'exe_size', 'samples', 'basis'}，没有可参考的构建时数值为None。
+    """
+    same_config = [
+        entry for entry in history
+        if entry.get('build_mode', 'pyinstaller') == features['build_mode']
+        and entry.get('compression', DEFAULT_COMPRESSION) == features['compression']
+        and entry.get('module_profile', 'default') == features['module_profile']
+        and 'exe_size' in entry and 'build_seconds' in entry
+    ]
+    same_app = [entry for entry in same_config
+                if entry.get('source') == features['source'] and entry.get('mode') == features['mode']]
+    sized = [entry for entry in same_config if 'content_bytes' in entry]
+
+    if same_app:
+        samples, basis = same_app[:SAME_APP_SAMPLES], 'same_app'
+    elif sized:
+        target = math.log1p(features['content_bytes'])
+        sized.sort(key=lambda entry: abs(math.log1p(entry['content_bytes']) - target))
+        samples, basis = sized[:ESTIMATE_SAMPLES], 'similar_size'
+    elif same_config:
+        samples, basis = same_config[:ESTIMATE_SAMPLES], 'same_config'
+    else:
+        return {'build_seconds': None, 'exe_size': None, 'samples': 0, 'basis': None}
+
+    # exe体积按网页内容的大小差异调整（内容的压缩率未知，按原始大小计算）
+    sizes = [entry['exe_size'] + features['content_bytes'] - entry.get('content_bytes', features['content_bytes'])
+             for entry in samples]
+    return {
+        'build_seconds': statistics.median(entry['build_seconds'] for entry in samples),
+        'exe_size': max(0, int(statistics.median(sizes))),
+        'samples': len(samples),
+        'basis': basis
+    }
+
+
+def plan_cost(plan):
+    """计划的预计构建耗时（无法估算或试运行失败时为0），用于排序"""
+    if not isinstance(plan, dict):
+        return 0
+    return plan['estimate']['build_seconds'] or 0
+
+
+def sort_by_cost(plans, longest_first=True):
+    """按预计构建耗时排序计划（默认耗时最长的在前，并发构建时总耗时最短）
+
+    plans 中可以包含试运行失败的异常对象（plan_many的结果），按耗时0排序。
+    """
+    return sorted(plans, key=plan_cost, reverse=longest_first)
+
+
+def format_plan(plan):
+    """格式化打包计划"""
+    lines = [f"试运行计划（用时 {plan['seconds'] * 1000:.0f} ms）:"]
+    lines.append(f"  打包内容: {plan['file_count']} 个文件, {plan['content_bytes'] / (1024 * 1024):.2f} MB")
+    lines.append(f"  输出位置: {plan['exe_path']}")
+    if plan['command']:
+        lines.append(f"  构建命令: {' '.join(plan['command'])}")
+    estimate = plan['estimate']
+    if estimate['basis']:
+        lines.append(f"  预计构建耗时 {estimate['build_seconds']:.1f} 秒, exe体积 {estimate['exe_size'] / (1024 * 1024):.2f} MB"
+                     f"（参考 {estimate['samples']} 次{ESTIMATE_BASIS[estimate['basis']]}）")
+    else:
+        lines.append("  没有相同打包配置的构建记录，无法估算耗时和体积")
+    for note in plan['notes']:
+        lines.append(f"  注意: {note}")
+    return "\n".join(lines)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 本地预览服务器（内存缓存、文件变化时自动刷新页面）
+"""
+
+import os
+import posixpath
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote, urlsplit, parse_qs
+
+from inliner import mime_type
+
+# 内存缓存的默认容量
+DEFAULT_CACHE_MB = 64
+
+# 检查文件变化的间隔（秒）
+WATCH_INTERVAL = 0.5
+
+# 自动刷新的长轮询超时（秒）
+RELOAD_POLL_TIMEOUT = 25
+
+RELOAD_PATH = "/__preview__/reload"
+
+# 注入到HTML页面中的自动刷新脚本：长轮询版本号，变化时刷新页面
+RELOAD_SCRIPT = """<script>
+(function () {
+    var version = %d;
+    function poll() {
+        fetch('%s?version=' + version, {cache: 'no-store'})
+            .then(function (r) { return r.text(); })
+            .then(function (v) {
+                if (parseInt(v, 10) !== version) { location.reload(); } else { poll(); }
+            })
+            .catch(function () { setTimeout(poll, 1000); });
+    }
+    poll();
+})();
+</script>
+"""
+
+
+class LRUCache:
+    """按字节数限制容量的文件内容缓存，以mtime和大小判断是否失效"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """返回文件内容，文件已修改或不在缓存中时重新读取"""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            cached = self.entries.get(path)
+            if cached and cached[0] == key:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old:
+                self.size -= len(old[1])
+            if len(data) <= self.max_bytes:
+                self.entries[path] = (key, data)
+                self.size += len(data)
+                while self.size > self.max_bytes:
+                    _, (_, evicted) = self.entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return data
+
+    def stats(self):
+        """缓存统计信息"""
+        with self.lock:
+            return {'entries': len(self.entries), 'bytes': self.size, 'hits': self.hits, 'misses': self.misses}
+
+
+class _PreviewHandler(BaseHTTPRequestHandler):
+    """预览请求处理：只提供打包文件集合中、真实路径位于根目录内的文件"""
+
+    server_version = "WebPackagerPreview"
+
+    def log_message(self, format, *args):
+        # 不向控制台输出访问日志
+        pass
+
+    def do_GET(self):
+        preview = self.server.preview
+        url = urlsplit(self.path)
+
+        if url.path == RELOAD_PATH:
+            try:
+                version = int(parse_qs(url.query).get('version', ['0'])[0])
+            except ValueError:
+                version = 0
+            self._send(200, str(preview.wait_for_change(version)).encode('ascii'), 'text/plain')
+            return
+
+        rel_path = posixpath.normpath(unquote(url.path).lstrip('/'))
+        if rel_path == '.':
+            rel_path = preview.entry
+        elif not rel_path.startswith('..') and not preview.is_served(rel_path):
+            rel_path = posixpath.join(rel_path, 'index.html')
+        if rel_path.startswith('..') or not preview.is_served(rel_path):
+            self._send(404, b"Not Found", 'text/plain')
+            return
+
+        path = preview.resolve(rel_path)
+        if path is None:
+            self._send(404, b"Not Found", 'text/plain')
+            return
+        try:
+            data = preview.cache.get(path)
+        except OSError:
+            self._send(404, b"Not Found", 'text/plain')
+            return
+
+        content_type = mime_type(rel_path)
+        if content_type == 'text/html' and preview.auto_reload:
+            data = preview.inject_reload(data)
+        self._send(200, data, content_type)
+
+    def _send(self, status, data, content_type):
+        self.send_response(status)
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class PreviewServer:
+    """本地预览服务器
+
+    root_dir 为网页根目录，entry 为入口页面的相对路径。
+    files 为打包时会包含的文件相对路径列表（应用排除规则和引用分析后），只服务和监视这些文件，
+    使预览与打包结果一致，也不会暴露根目录中的其他文件。
+    """
+
+    def __init__(self, root_dir, entry, files, cache_mb=DEFAULT_CACHE_MB, auto_reload=True, port=0):
+        self.root_dir = os.path.realpath(root_dir)
+        self.entry = entry.replace(os.sep, '/')
+        self.files = set(files)
+        self.cache = LRUCache(cache_mb * 1024 * 1024)
+        self.auto_reload = auto_reload
+        self.version = 0
+        self.changed = threading.Condition()
+        self.stopped = threading.Event()
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), _PreviewHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.preview = self
+        self.threads = []
+
+    @property
+    def url(self):
+        """入口页面地址"""
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/{self.entry}"
+
+    def is_served(self, rel_path):
+        return rel_path in self.files
+
+    def resolve(self, rel_path):
+        """文件的真实路径，不在根目录内（符号链接指向外部等）时返回None"""
+        real = os.path.realpath(os.path.join(self.root_dir, rel_path))
+        if os.path.commonpath([real, self.root_dir]) != self.root_dir:
+            return None
+        return real
+
+    def inject_reload(self, data):
+        """在HTML的</body>前（没有时在末尾）插入自动刷新脚本"""
+        script = (RELOAD_SCRIPT % (self.version, RELOAD_PATH)).encode('utf-8')
+        index = data.lower().rfind(b'</body>')
+        if index < 0:
+            return data + script
+        return data[:index] + script + data[index:]
+
+    def wait_for_change(self, version):
+        """等待版本号变化（长轮询），返回当前版本号"""
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version or self.stopped.is_set(), RELOAD_POLL_TIMEOUT)
+            return self.version
+
+    def _snapshot(self):
+        """当前文件的mtime和大小"""
+        snapshot = {}
+        for rel_path in self.files:
+            try:
+                stat = os.stat(os.path.join(self.root_dir, rel_path))
+                snapshot[rel_path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                snapshot[rel_path] = None
+        return snapshot
+
+    def _watch(self):
+        previous = self._snapshot()
+        while not self.stopped.wait(WATCH_INTERVAL):
+            current = self._snapshot()
+            if current != previous:
+                previous = current
+                with self.changed:
+                    self.version += 1
+                    self.changed.notify_all()
+
+    def start(self):
+        """在后台线程中启动服务器和文件监视"""
+        targets = [self.httpd.serve_forever]
+        if self.auto_reload:
+            targets.append(self._watch)
+        for target in targets:
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        """停止服务器，并唤醒等待中的长轮询请求"""
+        self.stopped.set()
+        with self.changed:
+            self.changed.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 单文件应用的启动画面（PyInstaller Splash）及窗口出现耗时测量
+"""
+
+import os
+import sys
+import time
+import shutil
+import subprocess
+
+SPLASH_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+# 测量时轮询窗口的间隔（秒）
+WINDOW_POLL_INTERVAL = 0.01
+
+
+def prepare_splash(image_path, temp_dir):
+    """复制启动画面图片到临时目录，返回复制后的路径（没有或不存在时返回None）"""
+    if not image_path or not os.path.exists(image_path):
+        return None
+    ext = os.path.splitext(image_path)[1].lower()
+    if ext not in SPLASH_EXTENSIONS:
+        raise Exception(f"不支持的启动画面格式: {ext}（支持 {', '.join(SPLASH_EXTENSIONS)}）")
+    splash_file = os.path.join(temp_dir, "splash" + ext)
+    shutil.copy2(image_path, splash_file)
+    return splash_file
+
+
+def spec_splash_block(splash_var, image, datas_expr='a.datas'):
+    """生成spec文件中的Splash部分（启动画面由引导程序在解压之前显示）"""
+    return f"""
+{splash_var} = Splash(
+    {image!r},
+    binaries=a.binaries,
+    datas={datas_expr},
+    text_pos=None,
+    minify_script=True,
+    always_on_top=True,
+)
+"""
+
+
+def splash_close_code(indent="    "):
+    """生成应用中关闭启动画面的代码（需要已定义变量 window），在页面加载完成时关闭"""
+    return f"""
+{indent}# 页面加载完成后关闭启动画面（没有启动画面时pyi_splash不存在）
+{indent}def close_splash():
+{indent}    try:
+{indent}        import pyi_splash
+{indent}        pyi_splash.close()
+{indent}    except Exception:
+{indent}        pass
+{indent}window.events.loaded += close_splash
+{indent}window.events.closing += close_splash
+"""
+
+
+def visible_windows():
+    """Windows: 返回当前所有可见顶层窗口 [(进程ID, 标题)]"""
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    windows = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def callback(hwnd, lparam):
+        if user32.IsWindowVisible(hwnd):
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            length = user32.GetWindowTextLengthW(hwnd)
+            buffer = ctypes.create_unicode_buffer(length + 1)
+            user32.GetWindowTextW(hwnd, buffer, length + 1)
+            windows.append((pid.value, buffer.value))
+        return True
+
+    user32.EnumWindows(callback, 0)
+    return windows
+
+
+def measure_window_times(exe_path, title, timeout=60):
+    """启动应用并轮询窗口，测量启动画面和应用窗口出现的耗时（仅Windows）
+
+    启动画面由单文件引导程序（启动的进程本身）显示，应用窗口由解压后的子进程按窗口标题识别。
+    返回 {'splash_ms', 'window_ms'}（未出现的项为None），不支持或失败时返回None。
+    """
+    if not sys.platform.startswith('win'):
+        return None
+
+    existing = set(visible_windows())
+    start = time.perf_counter()
+    process = subprocess.Popen([exe_path])
+    result = {'splash_ms': None, 'window_ms': None}
+    try:
+        while time.perf_counter() - start < timeout:
+            for pid, window_title in visible_windows():
+                if (pid, window_title) in existing:
+                    continue
+                elapsed = (time.perf_counter() - start) * 1000
+                if result['splash_ms'] is None and pid == process.pid and window_title != title:
+                    result['splash_ms'] = elapsed
+                if result['window_ms'] is None and window_title == title:
+                    result['window_ms'] = elapsed
+            if result['window_ms'] is not None or process.poll() is not None:
+                break
+            time.sleep(WINDOW_POLL_INTERVAL)
+    except Exception:
+        return None
+    finally:
+        # 单文件应用的实际程序在子进程中运行，需要结束整个进程树
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result
+
+
+def format_window_times(times):
+    """格式化窗口出现耗时"""
+    splash = f"{times['splash_ms']:.0f} ms" if times['splash_ms'] is not None else "未检测到"
+    window = f"{times['window_ms']:.0f} ms" if times['window_ms'] is not None else "未检测到"
+    return f"启动画面出现: {splash}, 应用窗口出现: {window}"
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 持久化存储与预缓存测试
+"""
+
+from app_cache import app_storage_id, load_precache_urls
+
+
+def test_storage_id_uses_original_source():
+    typed = {'mode': 'url', 'source': 'example.com', 'window_title': 'App'}
+    preflighted = dict(typed, source='https://www.example.com/', original_source='example.com')
+    assert app_storage_id(typed) == app_storage_id(preflighted)
+    assert app_storage_id(typed) != app_storage_id(dict(typed, window_title='Other'))
+    assert len(app_storage_id(typed)) == 16
+
+
+def test_load_precache_urls(tmp_path):
+    manifest = tmp_path / "precache.txt"
+    manifest.write_text("# 注释\n/app.js\n\nimg/logo.png\nhttps://cdn.example.com/lib.js\n/app.js\n", encoding='utf-8')
+    assert load_precache_urls(str(manifest), 'https://example.com/app/') == [
+        'https://example.com/app.js',
+        'https://example.com/app/img/logo.png',
+        'https://cdn.example.com/lib.js',
+    ]
+    assert load_precache_urls(str(manifest))[0] == '/app.js'
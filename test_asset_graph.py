@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 资源引用分析测试
+"""
+
+import os
+
+import pytest
+
+from asset_graph import FolderFiles, css_references, find_reachable, js_references, resolve_reference
+from packignore import PackIgnore, scan_folder
+
+SITE = {
+    'index.html': '<link rel="stylesheet" href="css/style.css"><script src="js/app.js"></script>'
+                  '<img srcset="img/a.png 1x, img/b.png 2x"><a href="about/">about</a>'
+                  '<a href="https://example.com/x.js">external</a><img src="missing.png">'
+                  "<script>fetch('data/items.json');</script>",
+    'css/style.css': '@import "base.css"; body { background: url("../img/bg.png?v=2#x"); }',
+    'css/base.css': 'p { color: red; }',
+    'js/app.js': "import { f } from './util';",
+    'js/util.js': 'export const f = 1;',
+    'data/items.json': '[]',
+    'img/a.png': 'a',
+    'img/b.png': 'b',
+    'img/bg.png': 'bg',
+    'about/index.html': '<img src="/img/a.png">',
+    'unused/old.html': '<img src="../img/a.png">',
+    'notes.txt': 'not referenced',
+}
+
+
+def test_css_and_js_references():
+    assert css_references('@import "a.css"; x { background: url(b.png) }') == ['b.png', 'a.css']
+    assert js_references("import x from './x.js'; new Worker('w.js'); require(\"r\")") == ['./x.js', 'r', 'w.js']
+
+
+@pytest.mark.parametrize('ref, from_rel, expected', [
+    ('img/a.png', 'index.html', 'img/a.png'),
+    ('../img/a.png?v=1#top', 'css/style.css', 'img/a.png'),
+    ('/img/a.png', 'about/index.html', 'img/a.png'),
+    ('./util', 'js/app.js', 'js/util.js'),
+    ('about/', 'index.html', 'about/index.html'),
+    ('%20space.png', 'index.html', ' space.png'),
+    ('../../outside.png', 'css/style.css', None),
+    ('https://example.com/a.png', 'index.html', None),
+    ('data:image/png;base64,AAAA', 'index.html', None),
+    ('#anchor', 'index.html', None),
+])
+def test_resolve_reference(ref, from_rel, expected):
+    files = {'img/a.png', 'js/util.js', 'about/index.html', 'index.html'}
+    assert resolve_reference(ref, from_rel, files) == expected
+
+
+def test_find_reachable_follows_html_css_and_js(make_site):
+    folder = make_site(SITE)
+    files = scan_folder(folder)['files']
+    reach = find_reachable(folder, 'index.html', files)
+    assert reach['files'] == sorted(set(SITE) - {'unused/old.html', 'notes.txt'})
+    assert reach['dirs'] == ['about', 'css', 'data', 'img', 'js']
+    assert sorted(reach['dropped']) == ['notes.txt', 'unused/old.html']
+    assert reach['dropped_bytes'] == len(SITE['notes.txt']) + len(SITE['unused/old.html'])
+    assert reach['missing'] == ['missing.png']
+
+
+def test_find_reachable_allow_patterns(make_site):
+    folder = make_site(SITE)
+    reach = find_reachable(folder, 'index.html', scan_folder(folder)['files'], ['*.txt'])
+    assert 'notes.txt' in reach['files']
+    assert 'unused/old.html' not in reach['files']
+
+
+def test_folder_files_checks_on_demand(make_site):
+    folder = make_site(dict(SITE, **{'secret.map': 'x'}))
+    files = FolderFiles(folder, PackIgnore(['*.map', 'unused/']))
+    assert 'img/a.png' in files
+    assert 'secret.map' not in files
+    assert 'unused/old.html' not in files
+    assert 'img' not in files
+    assert '../site/index.html' not in files
+    reach = find_reachable(folder, 'index.html', files)
+    assert 'css/base.css' in reach['files']
+    assert reach['dropped'] == []
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink') or os.name == 'nt', reason="需要符号链接")
+def test_folder_files_rejects_links_outside_folder(make_site, tmp_path):
+    folder = make_site({'index.html': '<img src="leak.txt">'})
+    (tmp_path / "secret.txt").write_text("secret", encoding='utf-8')
+    os.symlink(str(tmp_path / "secret.txt"), os.path.join(folder, 'leak.txt'))
+    assert 'leak.txt' not in FolderFiles(folder)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 压缩配置测试
+"""
+
+import compression
+from compression import COMPRESSION_PROFILES, DEFAULT_COMPRESSION, pyinstaller_args, resolve_profile, spec_exe_options
+
+
+def test_unknown_profile_falls_back_to_default():
+    profile, warning = resolve_profile('no-such-profile')
+    assert profile['name'] == DEFAULT_COMPRESSION
+    assert 'no-such-profile' in warning
+
+
+def test_upx_profile_falls_back_without_upx(monkeypatch):
+    monkeypatch.setattr(compression, 'find_upx', lambda upx_dir=None: None)
+    for name, options in COMPRESSION_PROFILES.items():
+        profile, warning = resolve_profile(name)
+        if options['upx']:
+            assert profile['name'] == DEFAULT_COMPRESSION and warning
+        else:
+            assert profile['name'] == name and warning is None
+        assert pyinstaller_args(profile) == []
+
+
+def test_spec_options_disable_archive_compression_only_for_none():
+    for name, options in COMPRESSION_PROFILES.items():
+        profile = dict(options, name=name, upx_dir=None)
+        assert ('cdict=' in spec_exe_options(profile)) is (not options['compress_archive'])
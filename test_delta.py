@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 构建差异包测试
+"""
+
+import os
+import random
+
+import pytest
+
+from delta import (APPLIER_NAME, apply_delta, apply_delta_file, copy_applier, create_delta_file, make_delta)
+
+
+def random_bytes(size, seed):
+    return random.Random(seed).randbytes(size)
+
+
+@pytest.mark.parametrize('edit', ['same', 'insert', 'delete', 'replace', 'append', 'empty_old'])
+def test_round_trip(edit):
+    old = random_bytes(300 * 1024, 1)
+    new = {
+        'same': old,
+        'insert': old[:100000] + b'inserted' * 500 + old[100000:],
+        'delete': old[:50000] + old[90000:],
+        'replace': old[:200000] + random_bytes(1000, 2) + old[201000:],
+        'append': old + random_bytes(5000, 3),
+        'empty_old': old,
+    }[edit]
+    if edit == 'empty_old':
+        old = b''
+    delta = make_delta(old, new)
+    assert apply_delta(old, delta) == new
+    if edit in ('same', 'insert', 'delete', 'replace'):
+        # 未改变的部分只记录为复制操作
+        assert len(delta) < len(new) // 10
+
+
+def test_apply_rejects_wrong_old_file():
+    old = random_bytes(100 * 1024, 4)
+    delta = make_delta(old, old + b'x')
+    with pytest.raises(ValueError):
+        apply_delta(old[:-1] + b'\0', delta)
+    with pytest.raises(ValueError):
+        apply_delta(old, b'NOTDELTA' + delta[8:])
+
+
+def test_delta_files_and_applier(tmp_path):
+    old_path, new_path = tmp_path / "old.exe", tmp_path / "new.exe"
+    old_path.write_bytes(random_bytes(200 * 1024, 5))
+    new_path.write_bytes(old_path.read_bytes()[:150000] + b'changed')
+    stats = create_delta_file(str(old_path), str(new_path), str(tmp_path / "app.delta"))
+    assert stats['new_bytes'] == os.path.getsize(new_path)
+
+    output = tmp_path / "rebuilt.exe"
+    assert apply_delta_file(str(old_path), str(tmp_path / "app.delta"), str(output)) == stats['new_bytes']
+    assert output.read_bytes() == new_path.read_bytes()
+
+    applier = copy_applier(str(tmp_path))
+    assert applier == os.path.join(str(tmp_path), APPLIER_NAME)
+    assert os.path.getsize(applier) > 0
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 打包引擎测试
+"""
+
+import os
+import asyncio
+
+from engine import PackagingEngine
+
+
+def test_inline_source_keeps_files_used_by_other_pages(make_site, tmp_path):
+    source = make_site({
+        'index.html': '<link rel="stylesheet" href="css/style.css"><script src="js/app.js"></script>'
+                      '<a href="other.html">other</a>',
+        'other.html': '<link rel="stylesheet" href="css/style.css"><script src="js/app.js"></script>',
+        'css/style.css': 'body { color: red; }',
+        'js/app.js': 'console.log(1);',
+    })
+    params = {'mode': 'folder', 'source': source, 'inline_single_file': True}
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+
+    params = PackagingEngine().inline_source(params, str(temp_dir))
+
+    assert params['mode'] == 'folder'
+    packed = params['source']
+    for rel_path in ('other.html', 'css/style.css', 'js/app.js'):
+        assert os.path.isfile(os.path.join(packed, rel_path))
+    with open(os.path.join(packed, 'index.html'), encoding='utf-8') as f:
+        assert 'color: red' in f.read()
+
+
+def test_inline_source_drops_files_only_used_by_entry(make_site, tmp_path):
+    source = make_site({
+        'index.html': '<link rel="stylesheet" href="style.css"><img src="big.png">',
+        'style.css': 'body { color: red; }',
+        'big.png': b'\0' * 2048,
+    })
+    params = {'mode': 'folder', 'source': source, 'inline_single_file': True, 'inline_threshold_kb': 1}
+    temp_dir = tmp_path / "temp"
+    temp_dir.mkdir()
+
+    params = PackagingEngine().inline_source(params, str(temp_dir))
+
+    assert sorted(os.listdir(params['source'])) == ['big.png', 'index.html']
+
+
+def test_package_many_async_starts_longest_builds_first(monkeypatch):
+    engine = PackagingEngine()
+    costs = {'a': 10, 'b': 90, 'c': None}
+    started = []
+
+    def plan_many(params_list):
+        return [{'estimate': {'build_seconds': costs[params['source']]}} for params in params_list]
+
+    async def package_async(params, on_event=None):
+        started.append(params['source'])
+        return params['source']
+
+    monkeypatch.setattr(engine, 'plan_many', plan_many)
+    monkeypatch.setattr(engine, 'package_async', package_async)
+    params_list = [{'source': source} for source in 'abc']
+    results = asyncio.run(engine.package_many_async(params_list, max_concurrent=1, longest_first=True))
+
+    assert started == ['b', 'a', 'c']
+    assert results == ['a', 'b', 'c']
+
+
+def test_failing_event_callback_is_logged(caplog):
+    engine = PackagingEngine()
+    received = []
+
+    def broken(event):
+        raise RuntimeError("界面已关闭")
+
+    engine.subscribe(broken)
+    engine.subscribe(received.append)
+    engine.log("hello")
+
+    assert [event['message'] for event in received] == ['hello']
+    assert "事件回调失败" in caplog.text
+    assert "界面已关闭" in caplog.text
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 并行复制测试
+"""
+
+import os
+
+import pytest
+
+from fastcopy import copy_selected, copy_tree, fast_copy_file, format_copy_stats
+
+
+def test_fast_copy_file_large_and_empty(tmp_path):
+    src = tmp_path / "big.bin"
+    src.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    assert fast_copy_file(str(src), str(tmp_path / "copy.bin"), buffer_size=1024 * 1024) == src.stat().st_size
+    assert (tmp_path / "copy.bin").read_bytes() == src.read_bytes()
+
+    (tmp_path / "empty").write_bytes(b'')
+    assert fast_copy_file(str(tmp_path / "empty"), str(tmp_path / "empty_copy")) == 0
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_copy_tree_keeps_structure_and_empty_dirs(make_site, tmp_path, workers):
+    src = make_site({'index.html': 'x', 'css/a.css': 'yy', 'js/lib/b.js': 'zzz'})
+    os.makedirs(os.path.join(src, 'empty'))
+    dst = tmp_path / "out"
+    stats = copy_tree(src, str(dst), workers)
+    assert (stats['files'], stats['bytes']) == (3, 6)
+    assert (dst / "js" / "lib" / "b.js").read_text(encoding='utf-8') == 'zzz'
+    assert (dst / "empty").is_dir()
+    assert "3 个文件" in format_copy_stats(stats)
+
+
+def test_copy_selected_only_copies_listed_files(make_site, tmp_path):
+    src = make_site({'index.html': 'x', 'a/keep.js': 'k', 'a/skip.map': 's'})
+    dst = tmp_path / "out"
+    copy_selected(src, str(dst), ['index.html', 'a/keep.js'], workers=2, rel_dirs=['b'])
+    assert sorted(os.listdir(dst / "a")) == ['keep.js']
+    assert (dst / "b").is_dir()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 构建资源限制测试
+"""
+
+import shutil
+from collections import namedtuple
+
+import pytest
+
+import governor
+from governor import BuildGovernor, ResourceLimitError
+
+Usage = namedtuple('Usage', 'total used free')
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def free_space(monkeypatch):
+    """模拟临时目录所在磁盘只有100 MB可用空间"""
+    monkeypatch.setattr(shutil, 'disk_usage', lambda path: Usage(1000 * MB, 900 * MB, 100 * MB))
+
+
+def test_default_limits_only_require_build_size(free_space, tmp_path):
+    gov = BuildGovernor(log=lambda message: None)
+    assert gov.describe() == "不限制"
+    assert gov.check_temp_space(str(tmp_path)) == 100 * MB
+    gov.check_temp_space(str(tmp_path), 90 * MB)
+    with pytest.raises(ResourceLimitError) as error:
+        gov.check_temp_space(str(tmp_path), 150 * MB)
+    assert error.value.reason == "disk"
+
+
+def test_min_free_temp_is_added_to_required_bytes(free_space, tmp_path):
+    gov = BuildGovernor({"min_free_temp_mb": 50}, log=lambda message: None)
+    gov.check_temp_space(str(tmp_path), 40 * MB)
+    with pytest.raises(ResourceLimitError):
+        gov.check_temp_space(str(tmp_path), 60 * MB)
+    assert "50 MB" in gov.describe()
+
+
+def test_default_limits_are_off():
+    assert all(value == 0 for key, value in governor.DEFAULT_RESOURCE_LIMITS.items() if key != "ionice_level")
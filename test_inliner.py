@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 单文件内联测试
+"""
+
+import os
+
+from inliner import Inliner, inline_to_file
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\0' * 16
+
+
+def inline(folder, entry='index.html', threshold_kb=256):
+    inliner = Inliner(folder, entry, threshold_kb)
+    return inliner.inline_html(), inliner
+
+
+def test_inlines_stylesheet_script_and_image(make_site):
+    folder = make_site({
+        'index.html': '<link rel="stylesheet" href="style.css"><script src="app.js"></script><img src="a.png">',
+        'style.css': 'body { color: red; }',
+        'app.js': 'console.log(1);',
+        'a.png': PNG,
+    })
+    html, inliner = inline(folder)
+    assert '<style>' in html and 'color: red' in html
+    assert 'console.log(1);' in html
+    assert 'src="data:image/png;base64,' in html
+    assert inliner.inlined == {'style.css', 'app.js', 'a.png'}
+
+
+def test_data_attributes_are_not_treated_as_src(make_site):
+    folder = make_site({
+        'index.html': '<img data-src="a.png" src="b.png"><script data-src="app.js"></script>',
+        'a.png': PNG,
+        'b.png': PNG,
+        'app.js': 'console.log(1);',
+    })
+    html, inliner = inline(folder)
+    assert 'data-src="a.png"' in html
+    assert '<script data-src="app.js"></script>' in html
+    assert inliner.inlined == {'b.png'}
+
+
+def test_strings_inside_scripts_are_not_rewritten(make_site):
+    folder = make_site({
+        'index.html': '<script>var t = \'<img src="a.png" style="background: url(a.png)">\';</script>'
+                      '<script src="app.js"></script>',
+        'app.js': 'el.innerHTML = \'<img src="a.png">\';',
+        'a.png': PNG,
+    })
+    html, inliner = inline(folder)
+    assert 'data:' not in html
+    assert 'el.innerHTML' in html
+    assert inliner.inlined == {'app.js'}
+
+
+def test_css_urls_not_inlined_are_rebased_onto_entry(make_site):
+    folder = make_site({
+        'index.html': '<link rel="stylesheet" href="css/style.css">',
+        'css/style.css': 'a { background: url(../img/big.png?v=1#a); } @import "missing.css";'
+                         ' b { background: url(https://example.com/x.png); }',
+        'img/big.png': PNG * 100,
+    })
+    html, _ = inline(folder, threshold_kb=1)
+    assert 'url("img/big.png?v=1#a")' in html
+    assert '"css/missing.css"' in html
+    assert 'url(https://example.com/x.png)' in html
+
+
+def test_defer_and_async_scripts_stay_separate(make_site):
+    folder = make_site({
+        'index.html': '<script defer src="a.js"></script><script async src="b.js"></script>'
+                      '<script type="module" async src="c.js"></script>',
+        'a.js': 'a();',
+        'b.js': 'b();',
+        'c.js': 'c();',
+    })
+    html, inliner = inline(folder)
+    assert inliner.inlined == {'c.js'}
+    assert set(inliner.skipped) == {'a.js', 'b.js'}
+    assert 'src="a.js"' in html and 'src="b.js"' in html
+
+
+def test_inline_to_file_report(make_site, tmp_path):
+    folder = make_site({
+        'index.html': '<link rel="stylesheet" href="style.css">',
+        'style.css': 'body { color: red; }',
+    })
+    output = tmp_path / "out.html"
+    report = inline_to_file(folder, 'index.html', str(output))
+    assert report['inlined'] == ['style.css']
+    assert report['output_bytes'] == os.path.getsize(output)
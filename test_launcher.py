@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 模板启动器测试
+"""
+
+import io
+import sys
+import types
+import zipfile
+
+from launcher import LAUNCHER_CODE, build_assets_archive, create_from_launcher
+
+
+def launcher_namespace(monkeypatch):
+    """执行生成的启动器代码（不运行入口），返回其中定义的函数"""
+    monkeypatch.setitem(sys.modules, 'webview', types.ModuleType('webview'))
+    namespace = {'__name__': 'launcher_under_test'}
+    exec(compile(LAUNCHER_CODE, 'launcher.py', 'exec'), namespace)
+    return namespace
+
+
+def test_payload_round_trip(make_site, tmp_path, monkeypatch):
+    site = make_site({'index.html': '<h1>hi</h1>', 'css/a.css': 'body {}'})
+    assets = build_assets_archive(site, ['index.html', 'css/a.css'])
+    launcher_path = tmp_path / "launcher.exe"
+    launcher_path.write_bytes(b'MZ launcher stub')
+    output = tmp_path / "app.exe"
+    config = {'app_id': 'abc', 'mode': 'folder', 'title': '应用'}
+
+    create_from_launcher(str(launcher_path), str(output), config, icon=b'ICON', assets=assets)
+
+    launcher = launcher_namespace(monkeypatch)
+    read, icon, packed = launcher['read_payload'](str(output))
+    assert read['title'] == '应用' and read['app_id'] == 'abc' and len(read['assets_hash']) == 16
+    assert launcher['read_range'](str(output), icon) == b'ICON'
+    with zipfile.ZipFile(io.BytesIO(launcher['read_range'](str(output), packed))) as archive:
+        assert sorted(archive.namelist()) == ['css/a.css', 'index.html']
+    assert output.read_bytes().startswith(b'MZ launcher stub')
+
+
+def test_read_payload_without_payload(tmp_path, monkeypatch):
+    path = tmp_path / "plain.exe"
+    path.write_bytes(b'\0' * 100)
+    assert launcher_namespace(monkeypatch)['read_payload'](str(path))[0] is None
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 模块精简配置测试
+"""
+
+from module_profile import BACKEND_KEEP, HEAVY_CANDIDATES, compute_lean_profile
+
+
+def test_lean_profile_only_excludes_heavy_candidates(tmp_path):
+    app_file = tmp_path / "app.py"
+    app_file.write_text("import os\nimport json\n", encoding='utf-8')
+    profile = compute_lean_profile(str(app_file))
+    assert 'PIL' in profile['excludes']
+    assert set(profile['excludes']) <= HEAVY_CANDIDATES
+    # 打包环境中已安装、但不在候选列表中的包不会被排除
+    assert 'pytest' not in profile['excludes']
+
+
+def test_lean_profile_keeps_pywebview_backends(tmp_path):
+    app_file = tmp_path / "app.py"
+    app_file.write_text("import os\n", encoding='utf-8')
+    profile = compute_lean_profile(str(app_file))
+    for backend in ('gi', 'qtpy', 'PyQt5', 'PyQt6', 'PySide6', 'objc', 'cefpython3', 'clr'):
+        assert backend in BACKEND_KEEP
+        assert backend not in profile['excludes']
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 多站点宿主应用测试
+"""
+
+from multisite import dedup_assets, file_digest, format_dedup_stats
+
+
+def test_dedup_assets_shares_identical_content(make_site):
+    a = make_site({'index.html': 'A', 'lib.js': 'shared library', 'logo.png': 'logo-a'}, name="a")
+    b = make_site({'index.html': 'B', 'js/lib.js': 'shared library', 'logo.png': 'logo-b'}, name="b")
+    site_files = [
+        [(rel, f"{a}/{rel}") for rel in ('index.html', 'lib.js', 'logo.png')],
+        [(rel, f"{b}/{rel}") for rel in ('index.html', 'js/lib.js', 'logo.png')],
+    ]
+
+    stats = dedup_assets(site_files)
+
+    assert stats['sites'][0]['lib.js'] == stats['sites'][1]['js/lib.js']
+    assert stats['sites'][0]['index.html'] != stats['sites'][1]['index.html']
+    assert stats['sites'][0]['logo.png'] != stats['sites'][1]['logo.png']
+    assert len(stats['blobs']) == 5
+    assert stats['total_files'] == 6
+    assert stats['total_bytes'] - stats['unique_bytes'] == len('shared library')
+    assert "节省" in format_dedup_stats(stats)
+
+
+def test_file_digest(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b'abc')
+    assert file_digest(str(path)) == 'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad'
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - .packignore 排除规则测试
+"""
+
+import os
+
+import pytest
+
+from packignore import PACKIGNORE_FILE, PackIgnore, parse_patterns, scan_folder
+
+
+@pytest.mark.parametrize('patterns, path, is_dir, expected', [
+    (['*.map'], 'js/app.js.map', False, True),
+    (['*.map'], 'js/app.js', False, False),
+    (['node_modules/'], 'node_modules', True, True),
+    (['node_modules/'], 'node_modules', False, False),
+    (['/build'], 'build', True, True),
+    (['/build'], 'src/build', True, False),
+    (['docs/**/*.md'], 'docs/a/b/readme.md', False, True),
+    (['docs/**/*.md'], 'docs/readme.md', False, True),
+    (['*.log', '!keep.log'], 'keep.log', False, False),
+    (['*.log', '!keep.log'], 'other.log', False, True),
+    (['file[0-9].txt'], 'file5.txt', False, True),
+    (['file[!0-9].txt'], 'file5.txt', False, False),
+    (['# comment', ''], 'comment', False, False),
+    (['\\#name'], '#name', False, True),
+])
+def test_match(patterns, path, is_dir, expected):
+    assert PackIgnore(patterns).match(path, is_dir) is expected
+
+
+def test_is_ignored_checks_parent_directories():
+    ignore = PackIgnore(['cache/'])
+    assert ignore.is_ignored('a/cache/b/file.txt')
+    assert not ignore.is_ignored('a/cached.txt')
+
+
+def test_from_folder_adds_packignore_file(make_site):
+    folder = make_site({PACKIGNORE_FILE: '*.psd\n', 'index.html': ''})
+    ignore = PackIgnore.from_folder(folder, ['*.map'])
+    assert ignore.is_ignored('art/logo.psd')
+    assert ignore.is_ignored('app.js.map')
+    assert not ignore.is_ignored('index.html')
+
+
+def test_parse_patterns():
+    assert parse_patterns(' *.map, node_modules/ ,,') == ['*.map', 'node_modules/']
+
+
+def test_scan_folder_prunes_ignored_directories(make_site):
+    folder = make_site({
+        'index.html': 'x',
+        'js/app.js': 'yy',
+        'js/app.js.map': 'zzz',
+        'node_modules/lib/index.js': 'w',
+    })
+    scan = scan_folder(folder, PackIgnore(['*.map', 'node_modules/']))
+    assert scan['files'] == ['index.html', 'js/app.js']
+    assert scan['dirs'] == ['js']
+    assert scan['bytes'] == 3
+    assert (scan['skipped_files'], scan['skipped_bytes'], scan['pruned_dirs']) == (1, 3, 1)
+
+
+@pytest.mark.skipif(not hasattr(os, 'symlink') or os.name == 'nt', reason="需要符号链接")
+def test_scan_folder_does_not_follow_directory_symlinks(make_site):
+    folder = make_site({'index.html': 'x', 'a/file.txt': 'y'})
+    os.symlink('..', os.path.join(folder, 'a', 'loop'))
+    os.symlink('missing.txt', os.path.join(folder, 'broken.txt'))
+    os.symlink('index.html', os.path.join(folder, 'alias.html'))
+    scan = scan_folder(folder)
+    assert scan['files'] == ['a/file.txt', 'alias.html', 'index.html']
+    assert scan['dirs'] == ['a']
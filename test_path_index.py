@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 文件路径索引测试
+"""
+
+from path_index import PathIndex
+
+PATHS = [
+    'index.html',
+    'about/index.html',
+    'css/Main.css',
+    'js/app.js',
+    'js/vendor/jquery.min.js',
+    'pages/blog/post.htm',
+    'img/app-icon.png',
+]
+
+
+def test_name_substring_prefers_names_starting_with_query():
+    index = PathIndex(PATHS)
+    assert index.search('app') == (['js/app.js', 'img/app-icon.png'], 2)
+    assert index.search('icon') == (['img/app-icon.png'], 1)
+
+
+def test_short_query_matches_name_prefix_case_insensitively():
+    index = PathIndex(PATHS)
+    assert index.search('ma') == (['css/Main.css'], 1)
+    assert index.search('x') == ([], 0)
+
+
+def test_query_with_slash_matches_full_path():
+    index = PathIndex(PATHS)
+    assert index.search('js/v') == (['js/vendor/jquery.min.js'], 1)
+    assert index.search('about\\index') == (['about/index.html'], 1)
+
+
+def test_glob_query_uses_packignore_rules():
+    index = PathIndex(PATHS)
+    assert index.search('*.html') == (['index.html', 'about/index.html'], 2)
+    assert index.search('pages/**/*.htm?') == ([], 0)
+    assert index.search('pages/**/*.ht?') == (['pages/blog/post.htm'], 1)
+    assert index.search('*.[cj]ss') == (['css/Main.css'], 1)
+    assert index.search('*.[!c]s') == (['js/app.js', 'js/vendor/jquery.min.js'], 2)
+
+
+def test_limit_and_empty_query():
+    index = PathIndex(PATHS)
+    assert len(index) == len(PATHS)
+    assert index.search('index', limit=1) == (['index.html'], 2)
+    assert index.search('  ') == ([], 0)
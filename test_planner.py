@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 构建耗时估算测试
+"""
+
+from planner import estimate_build, plan_cost, sort_by_cost
+
+FEATURES = {'mode': 'url', 'source': 'https://example.com', 'build_mode': 'pyinstaller',
+            'compression': 'zlib', 'module_profile': 'default', 'content_bytes': 0}
+
+
+def entry(source, build_seconds, exe_size, content_bytes=0, **extra):
+    return dict({'mode': 'url', 'source': source, 'build_mode': 'pyinstaller', 'compression': 'zlib',
+                 'module_profile': 'default', 'build_seconds': build_seconds, 'exe_size': exe_size,
+                 'content_bytes': content_bytes}, **extra)
+
+
+def test_estimate_without_history():
+    assert estimate_build([], FEATURES) == {'build_seconds': None, 'exe_size': None, 'samples': 0, 'basis': None}
+
+
+def test_estimate_prefers_same_app():
+    history = [entry('https://other.com', 100, 10), entry('https://example.com', 20, 30),
+               entry('https://example.com', 40, 50)]
+    estimate = estimate_build(history, FEATURES)
+    assert estimate['basis'] == 'same_app'
+    assert estimate['build_seconds'] == 30
+    assert estimate['exe_size'] == 40
+
+
+def test_estimate_ignores_other_configs_and_adjusts_size():
+    history = [entry('https://a.com', 10, 1000, content_bytes=100),
+               entry('https://b.com', 99, 1, compression='upx')]
+    estimate = estimate_build(history, dict(FEATURES, content_bytes=300))
+    assert estimate['basis'] == 'similar_size'
+    assert estimate['samples'] == 1
+    assert estimate['exe_size'] == 1200
+
+
+def test_sort_by_cost_handles_failed_plans():
+    slow = {'estimate': {'build_seconds': 90}}
+    fast = {'estimate': {'build_seconds': 10}}
+    unknown = {'estimate': {'build_seconds': None}}
+    failed = ValueError("参数无效")
+    assert plan_cost(failed) == 0
+    assert sort_by_cost([fast, failed, slow, unknown]) == [slow, fast, failed, unknown]
+    assert sort_by_cost([fast, slow], longest_first=False) == [fast, slow]
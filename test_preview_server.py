@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 本地预览服务器测试
+"""
+
+import os
+import time
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from preview_server import LRUCache, PreviewServer
+
+
+@pytest.fixture
+def preview(make_site, tmp_path):
+    folder = make_site({
+        'index.html': '<html><body>home</body></html>',
+        'css/a.css': 'body {}',
+        'other/index.html': 'other',
+        'junk.txt': 'not served',
+    })
+    (tmp_path / "secret.txt").write_text("secret", encoding='utf-8')
+    server = PreviewServer(folder, 'index.html', ['index.html', 'css/a.css', 'other/index.html']).start()
+    yield server
+    server.stop()
+
+
+def fetch(server, path):
+    base = server.url.rsplit('/', 1)[0]
+    try:
+        with urlopen(base + path, timeout=5) as response:
+            return response.status, response.read()
+    except HTTPError as e:
+        return e.code, b''
+
+
+def test_serves_only_the_file_set(preview):
+    status, body = fetch(preview, '/')
+    assert status == 200 and b'home' in body and b'__preview__' in body
+    assert fetch(preview, '/css/a.css') == (200, b'body {}')
+    assert fetch(preview, '/other/')[0] == 200
+    for path in ('/junk.txt', '/../secret.txt', '/%2e%2e/secret.txt', '/css/..%5C..%5Csecret.txt'):
+        assert fetch(preview, path)[0] == 404
+
+
+def test_reload_version_changes_when_served_file_changes(preview):
+    version = preview.version
+    time.sleep(0.05)
+    path = os.path.join(preview.root_dir, 'css', 'a.css')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('body { color: red; }')
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+    assert preview.wait_for_change(version) == version + 1
+
+
+def test_lru_cache_revalidates_and_evicts(tmp_path):
+    a, b = tmp_path / "a", tmp_path / "b"
+    a.write_bytes(b'1' * 6)
+    b.write_bytes(b'2' * 6)
+    cache = LRUCache(max_bytes=10)
+    assert cache.get(str(a)) == b'1' * 6
+    assert cache.get(str(a)) == b'1' * 6
+    cache.get(str(b))
+    assert cache.stats() == {'entries': 1, 'bytes': 6, 'hits': 1, 'misses': 2}
+
+    b.write_bytes(b'3' * 5)
+    assert cache.get(str(b)) == b'3' * 5
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 网页URL预检测试
+"""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import url_preflight
+from url_preflight import URLPreflight, format_preflight, normalize_url, shared_preflight
+
+
+def test_normalize_url():
+    assert normalize_url(' example.com ') == 'http://example.com'
+    assert normalize_url('https://example.com') == 'https://example.com'
+
+
+def test_check_caches_results(monkeypatch):
+    preflight = URLPreflight()
+    calls = []
+
+    def fake_request(url):
+        calls.append(url)
+        return {'ok': True, 'url': url, 'final_url': url, 'permanent': False, 'redirects': 0, 'status': 200,
+                'content_type': 'text/html', 'tls': False, 'elapsed_ms': 1.0, 'error': '', 'warning': ''}
+
+    monkeypatch.setattr(preflight, '_request', fake_request)
+    assert preflight.check('example.com')['cached'] is False
+    assert preflight.check('http://example.com')['cached'] is True
+    results = preflight.check_many(['a.com', 'b.com', 'a.com'])
+    assert sorted(results) == ['a.com', 'b.com']
+    assert calls[0] == 'http://example.com'
+    assert sorted(calls[1:]) == ['http://a.com', 'http://b.com']
+    assert 'HTTP 200' in format_preflight(results['a.com'])
+
+
+def test_stalled_server_fails_quickly():
+    # 接受连接但从不响应的服务器
+    server = socket.socket()
+    server.bind(('127.0.0.1', 0))
+    server.listen()
+    port = server.getsockname()[1]
+    try:
+        start = time.monotonic()
+        result = URLPreflight().check(f'http://127.0.0.1:{port}/', use_cache=False)
+        elapsed = time.monotonic() - start
+    finally:
+        server.close()
+    assert not result['ok']
+    assert elapsed < 3
+
+
+def test_session_and_shared_instance_created_once(monkeypatch):
+    monkeypatch.setattr(url_preflight, '_shared_preflight', None)
+    barrier = threading.Barrier(8)
+
+    def get_both(_):
+        barrier.wait()
+        preflight = shared_preflight()
+        return preflight, preflight.session
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(get_both, range(8)))
+    assert len({id(preflight) for preflight, _ in results}) == 1
+    assert len({id(session) for _, session in results}) == 1
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 界面的后台I/O任务与事件循环卡顿监测
+"""
+
+import os
+import sys
+import time
+import threading
+import traceback
+import tkinter as tk
+
+# 后台读取（扫描文件夹、读取配置等）的线程数
+IO_WORKERS = 2
+
+# 事件循环心跳间隔（毫秒）
+HEARTBEAT_INTERVAL_MS = 100
+
+# 默认的卡顿报告阈值（毫秒），0表示不监测
+DEFAULT_STALL_THRESHOLD_MS = 200
+
+# 报告卡顿时显示的调用栈层数
+STACK_DEPTH = 3
+
+
+class BackgroundIO:
+    """在后台线程执行阻塞的文件和目录操作，结果通过 root.after 交回界面线程
+
+    写入类任务（serial=True）在单独的单线程中按提交顺序执行，后提交的配置不会被先提交的覆盖。
+    """
+
+    def __init__(self, root, workers=IO_WORKERS):
+        # 启动时才加载线程池模块，不增加界面模块的导入时间
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="webpackager-io")
+        self._serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webpackager-write")
+        self._closed = False
+
+    def submit(self, func, *args, on_done=None, on_error=None, serial=False):
+        """提交任务，完成后在界面线程中调用 on_done(结果) 或 on_error(异常)"""
+        executor = self._serial if serial else self._pool
+        future = executor.submit(func, *args)
+        future.add_done_callback(lambda f: self._deliver(f, on_done, on_error))
+        return future
+
+    def _deliver(self, future, on_done, on_error):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                self._call_soon(on_error, error)
+            else:
+                print(f"后台任务失败: {error}")
+        elif on_done is not None:
+            self._call_soon(on_done, future.result())
+
+    def _call_soon(self, callback, value):
+        if self._closed:
+            return
+        try:
+            self.root.after(0, lambda: callback(value))
+        except (RuntimeError, tk.TclError):
+            # 主窗口已关闭
+            pass
+
+    def shutdown(self):
+        """取消尚未开始的读取任务，等待写入任务完成（在主循环结束后调用，之后不再回调界面）"""
+        self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._serial.shutdown(wait=True)
+
+
+def describe_stack(frame, depth=STACK_DEPTH):
+    """最内层的几层调用（函数名 文件:行号），由内向外"""
+    frames = traceback.extract_stack(frame)[-depth:]
+    return " <- ".join(f"{f.name} ({os.path.basename(f.filename)}:{f.lineno})" for f in reversed(frames))
+
+
+class LoopWatchdog:
+    """监测Tk事件循环的延迟，超过阈值时记录卡顿时长和卡顿位置
+
+    事件循环每隔 interval_ms 发出一次心跳，心跳实际到达的延迟即为卡顿时长。
+    卡顿期间事件循环无法运行，由监视线程采样主线程的调用栈，恢复后一并报告。
+    必须在界面线程中创建。
+    """
+
+    def __init__(self, root, threshold_ms=DEFAULT_STALL_THRESHOLD_MS, interval_ms=HEARTBEAT_INTERVAL_MS, log=print):
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.log = log
+        self.stalls = 0
+        self.max_lag_ms = 0.0
+        self._ui_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._last_beat = time.perf_counter()
+        self._expected = self._last_beat
+        self._stack = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """开始监测（阈值为0时不监测）"""
+        if not self.threshold_ms:
+            return self
+        self._last_beat = time.perf_counter()
+        self._expected = self._last_beat + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._beat)
+        threading.Thread(target=self._watch, name="webpackager-watchdog", daemon=True).start()
+        return self
+
+    def stop(self):
+        """停止监测"""
+        self._stop.set()
+
+    def _beat(self):
+        if self._stop.is_set():
+            return
+        now = time.perf_counter()
+        lag_ms = (now - self._expected) * 1000
+        with self._lock:
+            self._last_beat = now
+            stack, self._stack = self._stack, None
+        if lag_ms > self.threshold_ms:
+            self.stalls += 1
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            self.log(f"界面卡顿 {lag_ms:.0f} ms" + (f"，位于 {stack}" if stack else ""))
+        self._expected = now + self.interval_ms / 1000
+        self.root.after(self.interval_ms, self._beat)
+
+    def _watch(self):
+        """心跳超时时采样一次主线程调用栈"""
+        while not self._stop.wait(self.interval_ms / 1000):
+            with self._lock:
+                waiting_ms = (time.perf_counter() - self._last_beat) * 1000
+                sampled = self._stack is not None
+            if sampled or waiting_ms < self.interval_ms + self.threshold_ms:
+                continue
+            frame = sys._current_frames().get(self._ui_thread)
+            if frame is not None:
+                stack = describe_stack(frame)
+                with self._lock:
+                    self._stack = stack
+
+    def stats(self):
+        """卡顿统计"""
+        return {'stalls': self.stalls, 'max_lag_ms': self.max_lag_ms}
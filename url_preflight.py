@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+网页打包工具 - 网页URL预检（打包前检查可访问性、重定向、TLS和内容类型）
+"""
+
+import time
+import threading
+
+# 连接超时和读取超时（秒），无法访问或没有响应的地址在约1秒内判定失败
+PREFLIGHT_TIMEOUT = (1, 1)
+
+# 预检结果的缓存时间（秒）
+PREFLIGHT_TTL = 300
+
+# 并发预检的最大线程数
+PREFLIGHT_WORKERS = 8
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+USER_AGENT = "WebPackager-Preflight/1.0"
+
+
+def normalize_url(url):
+    """补全协议（没有协议时使用http://，由服务器重定向到https）"""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = 'http://' + url
+    return url
+
+
+class URLPreflight:
+    """共用连接池的URL预检，结果按TTL缓存，线程安全"""
+
+    def __init__(self, timeout=PREFLIGHT_TIMEOUT, ttl=PREFLIGHT_TTL, pool_size=PREFLIGHT_WORKERS):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.pool_size = pool_size
+        self._session = None
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """延迟创建requests会话（延迟导入requests，避免拖慢打包工具启动）
+
+        check_many在多个线程中同时访问，创建会话时加锁，保证只创建一个会话和连接池。
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    session.headers['User-Agent'] = USER_AGENT
+                    self._session = session
+        return self._session
+
+    def check(self, url, use_cache=True):
+        """预检单个URL，返回结果字典
+
+        ok（是否可用）、url、final_url（重定向后的地址）、permanent（是否只经过永久重定向）、
+        redirects、status、content_type、tls（最终地址是否为https）、elapsed_ms、error、warning、cached
+        """
+        url = normalize_url(url)
+        now = time.monotonic()
+        if use_cache:
+            with self._lock:
+                cached = self._cache.get(url)
+            if cached and now - cached[0] < self.ttl:
+                return dict(cached[1], cached=True)
+
+        result = self._request(url)
+        with self._lock:
+            self._cache[url] = (now, result)
+        return dict(result, cached=False)
+
+    def _request(self, url):
+        import requests
+
+        result = {
+            'ok': False, 'url': url, 'final_url': url, 'permanent': False, 'redirects': 0,
+            'status': None, 'content_type': '', 'tls': url.startswith('https://'),
+            'elapsed_ms': 0.0, 'error': '', 'warning': ''
+        }
+        start = time.perf_counter()
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            if response.status_code in (403, 405, 501) or not response.headers.get('Content-Type'):
+                # 部分服务器不支持HEAD，改用GET（只读取响应头）
+                response.close()
+                response = self.session.get(url, allow_redirects=True, timeout=self.timeout, stream=True)
+            response.close()
+        except requests.exceptions.SSLError as e:
+            result['error'] = f"TLS证书校验失败: {e}"
+        except requests.exceptions.ConnectTimeout:
+            result['error'] = f"连接超时（{self.timeout[0]} 秒）"
+        except requests.exceptions.ReadTimeout:
+            result['error'] = f"响应超时（{self.timeout[1]} 秒）"
+        except requests.exceptions.TooManyRedirects:
+            result['error'] = "重定向次数过多"
+        except requests.exceptions.ConnectionError as e:
+            result['error'] = f"无法连接: {e}"
+        except requests.exceptions.RequestException as e:
+            result['error'] = f"请求失败: {e}"
+        else:
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            result.update({
+                'final_url': response.url,
+                'permanent': bool(response.history) and all(r.status_code in (301, 308) for r in response.history),
+                'redirects': len(response.history),
+                'status': response.status_code,
+                'content_type': content_type,
+                'tls': response.url.startswith('https://'),
+            })
+            if response.status_code >= 400:
+                result['error'] = f"HTTP {response.status_code} {response.reason}"
+            else:
+                result['ok'] = True
+                if content_type and content_type not in HTML_CONTENT_TYPES:
+                    result['warning'] = f"内容类型不是网页: {content_type}"
+                elif not result['tls']:
+                    result['warning'] = "未使用HTTPS"
+        result['elapsed_ms'] = (time.perf_counter() - start) * 1000
+        return result
+
+    def check_many(self, urls, workers=PREFLIGHT_WORKERS):
+        """并发预检多个URL（相同地址只请求一次），返回 {url: 结果}"""
+        unique = list(dict.fromkeys(urls))
+        if len(unique) <= 1:
+            return {url: self.check(url) for url in unique}
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as executor:
+            results = list(executor.map(self.check, unique))
+        return dict(zip(unique, results))
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+
+
+_shared_preflight = None
+_shared_lock = threading.Lock()
+
+
+def shared_preflight():
+    """进程内共用的预检实例（共用连接池和结果缓存），可在多个构建线程中调用"""
+    global _shared_preflight
+    if _shared_preflight is None:
+        with _shared_lock:
+            if _shared_preflight is None:
+                _shared_preflight = URLPreflight()
+    return _shared_preflight
+
+
+def format_preflight(result):
+    """格式化预检结果"""
+    if not result['ok']:
+        return f"URL预检失败: {result['url']} - {result['error']} ({result['elapsed_ms']:.0f} ms)"
+    message = f"URL预检通过: HTTP {result['status']}, {result['content_type'] or '未知类型'}"
+    if result['redirects']:
+        message += f", 重定向 {result['redirects']} 次到 {result['final_url']}"
+    message += f", {result['elapsed_ms']:.0f} ms"
+    if result['cached']:
+        message += "（缓存）"
+    if result['warning']:
+        message += f"；注意: {result['warning']}"
+    return message